@@ -0,0 +1,5 @@
+"""
+재현 가능한 성능 벤치마크
+    python -m benchmarks.run            # 함수 단위 마이크로 벤치마크
+    python -m benchmarks.load           # ASGI 엔드포인트 부하 테스트 (p50/p99/RPS)
+"""
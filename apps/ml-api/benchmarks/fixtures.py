@@ -0,0 +1,56 @@
+"""
+벤치마크용 합성 데이터
+서울교통공사 시간대별 승하차 CSV와 같은 컬럼 구성의 cp949 파일 생성
+"""
+import csv
+import importlib.util
+from pathlib import Path
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+PARSER_PATH = REPO_ROOT / "scripts" / "parse_voter_data.py"
+
+RIDERSHIP_HOUR_COLUMNS = (
+    "06시 이전", "06시-07시", "07시-08시", "08시-09시", "09시-10시",
+    "10시-11시", "11시-12시", "12시-13시", "13시-14시", "14시-15시",
+    "15시-16시", "16시-17시", "17시-18시", "18시-19시", "19시-20시",
+    "20시-21시", "21시-22시", "22시-23시", "23시-24시", "24시 이후",
+)
+
+# 약 24MB: 275개 역 × 366일 × 승차/하차
+N_STATIONS = 275
+N_DAYS = 366
+
+
+def write_ridership_csv(path: Path, n_stations: int = N_STATIONS, n_days: int = N_DAYS, seed: int = 42) -> Path:
+    """parse_ridership 입력 형식의 합성 CSV 작성 (cp949)"""
+    rng = np.random.default_rng(seed)
+    dates = np.datetime64("2024-01-01") + np.arange(n_days)
+    hours = list(RIDERSHIP_HOUR_COLUMNS)
+
+    # 역별 규모 × 시간대 패턴 (출퇴근 피크)
+    peak = np.array([0.2, 0.5, 1.6, 2.0, 1.0, 0.7, 0.7, 0.8, 0.7, 0.7, 0.8, 0.9, 1.2, 1.8, 1.4, 0.9, 0.7, 0.6, 0.4, 0.1])
+    scale = rng.lognormal(6.5, 0.8, n_stations)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="cp949", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["연번", "수송일자", "호선", "역번호", "역명", "구분", *hours])
+        row_id = 1
+        for day in dates:
+            counts = rng.poisson(scale[:, np.newaxis, np.newaxis] * peak, (n_stations, 2, len(hours)))
+            for s in range(n_stations):
+                station_id = 150 + s
+                for k, kind in enumerate(("승차", "하차")):
+                    writer.writerow([row_id, str(day), s % 8 + 1, station_id, f"역{station_id}", kind, *counts[s, k]])
+                    row_id += 1
+    return path
+
+
+def load_parser():
+    """scripts/parse_voter_data.py 모듈 로드 (pandas 필요)"""
+    spec = importlib.util.spec_from_file_location("parse_voter_data", PARSER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,114 @@
+"""
+엔드포인트 부하 테스트 (httpx)
+
+    python -m benchmarks.load                              # 인프로세스 ASGI 앱 대상
+    python -m benchmarks.load --url http://localhost:8080  # 실행 중인 서버 대상
+    python -m benchmarks.load -c 32 -n 500 -k voter-reach
+
+엔드포인트별 p50/p99 지연시간(ms)과 초당 요청 수를 출력하고 JSON으로 저장
+"""
+import argparse
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import List, Optional
+
+import httpx
+import numpy as np
+
+from benchmarks.run import RESULTS_DIR, git_revision
+
+# (이름, 메서드, 경로, JSON 본문)
+ENDPOINTS = [
+    ("health", "GET", "/health", None),
+    ("voter-reach/stations", "GET", "/api/voter-reach/stations", None),
+    ("voter-reach/ridership", "GET", "/api/voter-reach/ridership", None),
+    ("voter-reach/ridership?hour=8", "GET", "/api/voter-reach/ridership?hour=8", None),
+    ("voter-reach/heatmap", "GET", "/api/voter-reach/heatmap?hour=8", None),
+    ("voter-reach/boundaries", "GET", "/api/voter-reach/boundaries?zoom=11", None),
+    ("voter-reach/optimize", "POST", "/api/voter-reach/optimize", {"target_hour": 8, "top_n": 10}),
+    ("analysis/shap", "POST", "/analysis/shap", {}),
+    ("analysis/monte-carlo", "POST", "/analysis/monte-carlo?n_simulations=1000", {}),
+    ("analysis/generations", "POST", "/analysis/generations", {}),
+]
+
+
+async def run_endpoint(
+    client: httpx.AsyncClient,
+    method: str,
+    path: str,
+    body: Optional[dict],
+    n_requests: int,
+    concurrency: int,
+) -> dict:
+    """n_requests개 요청을 concurrency개 동시 작업으로 전송"""
+    latencies: List[float] = []
+    errors = 0
+    remaining = iter(range(n_requests))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            start = time.perf_counter()
+            response = await client.request(method, path, json=body)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    samples = np.array(latencies)
+    return {
+        "requests": n_requests,
+        "concurrency": concurrency,
+        "errors": errors,
+        "p50_ms": round(float(np.percentile(samples, 50)), 3),
+        "p99_ms": round(float(np.percentile(samples, 99)), 3),
+        "rps": round(n_requests / elapsed, 1),
+    }
+
+
+async def run_load(url: Optional[str], n_requests: int, concurrency: int, name_filter: str) -> dict:
+    if url:
+        client = httpx.AsyncClient(base_url=url, timeout=120)
+    else:
+        from main import app
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=120)
+
+    results = {}
+    async with client:
+        for name, method, path, body in ENDPOINTS:
+            if name_filter not in name:
+                continue
+            # 워밍업 (모델 로드, 파일 캐시)
+            await client.request(method, path, json=body)
+            stats = await run_endpoint(client, method, path, body, n_requests, concurrency)
+            results[name] = stats
+            print(f"{name:<32}{stats['p50_ms']:>10.2f}{stats['p99_ms']:>10.2f}{stats['rps']:>10.1f}{stats['errors']:>8}")
+    return results
+
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description="NPFS ML API load harness")
+    parser.add_argument("--url", help="대상 서버 URL (없으면 인프로세스 ASGI)")
+    parser.add_argument("-n", "--requests", type=int, default=200, help="엔드포인트당 요청 수")
+    parser.add_argument("-c", "--concurrency", type=int, default=8, help="동시 요청 수")
+    parser.add_argument("-k", "--filter", default="", help="이름에 포함된 엔드포인트만 실행")
+    parser.add_argument("--output", type=Path, help="결과 JSON 경로 (기본: results/load-<commit>.json)")
+    args = parser.parse_args(argv)
+
+    print(f"{'endpoint':<32}{'p50 ms':>10}{'p99 ms':>10}{'rps':>10}{'errors':>8}")
+    results = asyncio.run(run_load(args.url, args.requests, args.concurrency, args.filter))
+
+    revision = git_revision()
+    output = args.output or RESULTS_DIR / f"load-{revision}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({"revision": revision, "target": args.url or "asgi", "endpoints": results}, indent=2))
+    print(f"\nSaved: {output}")
+
+
+if __name__ == "__main__":
+    main()
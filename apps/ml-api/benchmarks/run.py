@@ -0,0 +1,192 @@
+"""
+함수 단위 마이크로 벤치마크
+
+    python -m benchmarks.run                          # 전체 실행, results/<commit>.json 저장
+    python -m benchmarks.run -k monte_carlo           # 이름 필터
+    python -m benchmarks.run --compare results/a.json # 기준 결과 대비 변화율 (회귀 표시)
+
+apps/ml-api 디렉터리에서 실행
+"""
+import argparse
+import asyncio
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+# 회귀로 표시할 중앙값 증가율
+REGRESSION_THRESHOLD = 0.10
+
+
+_LOOP = asyncio.new_event_loop()
+
+
+def _run(coro):
+    """async 엔드포인트 함수를 같은 이벤트 루프에서 실행"""
+    return _LOOP.run_until_complete(coro)
+
+
+def _dummy_request():
+    from starlette.requests import Request
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": [], "query_string": b""})
+
+
+def build_cases(name_filter: str = "") -> Dict[str, Tuple[Callable[[], object], int]]:
+    """
+    벤치마크 케이스: 이름 -> (실행 함수, 반복 횟수)
+    선택 의존성(numpy/sklearn/pandas)이 없으면 해당 케이스는 제외
+    """
+    from core.schemas import SimulationParams
+    from core.simulation import run_simulation, run_simulation_simple
+
+    params = SimulationParams()
+    cases: Dict[str, Tuple[Callable[[], object], int]] = {
+        "run_simulation": (lambda: run_simulation(params), 50),
+        "run_simulation_simple": (lambda: run_simulation_simple(), 50),
+    }
+
+    try:
+        from core.sampling import resolve_return_model
+        from core.monte_carlo import monte_carlo_summary
+        model = resolve_return_model(params, None, use_regime_switching=True)
+        cases["run_monte_carlo_1k"] = (lambda: monte_carlo_summary(params, 1000, model), 20)
+        cases["run_monte_carlo_10k"] = (lambda: monte_carlo_summary(params, 10000, model), 5)
+    except ImportError as e:
+        print(f"skip monte_carlo: {e}", file=sys.stderr)
+
+    try:
+        from routers.shap_analysis import compute_feature_effects
+        cases["compute_feature_effects"] = (lambda: compute_feature_effects(params), 20)
+    except ImportError as e:
+        print(f"skip shap: {e}", file=sys.stderr)
+
+    try:
+        from core.schemas import SobolRequest
+        from routers.sensitivity import fund_gradients, run_sobol_analysis
+        sobol_request = SobolRequest(n_samples=4096, seed=0)
+        cases["sobol_4k"] = (lambda: run_sobol_analysis(sobol_request), 5)
+        cases["fund_gradients"] = (lambda: fund_gradients(params), 100)
+    except ImportError as e:
+        print(f"skip sobol: {e}", file=sys.stderr)
+
+    try:
+        from routers.generation import analyze_generations, stochastic_generation_summary
+        from core.sampling import resolve_return_model
+        cases["analyze_generations"] = (lambda: _run(analyze_generations(params)), 10)
+        generation_model = resolve_return_model(params, None, use_regime_switching=True)
+        cases["stochastic_generations_1k"] = (lambda: stochastic_generation_summary(params, 1000, generation_model), 20)
+    except ImportError as e:
+        print(f"skip generation: {e}", file=sys.stderr)
+
+    from core.partitions import DEFAULT_REGION
+    from routers.voter_reach import DaySelection, OptimizeRequest, get_heatmap, optimize_stations
+    optimize_request = OptimizeRequest(target_hour=8, top_n=10)
+    cases["optimize_stations"] = (lambda: _run(optimize_stations(optimize_request)), 50)
+    cases["get_heatmap"] = (
+        lambda: _run(get_heatmap(_dummy_request(), hour=8, days=DaySelection(), region=DEFAULT_REGION, layout="rows")),
+        50,
+    )
+
+    # 25MB 픽스처 생성 비용이 크므로 선택된 경우에만 준비
+    if name_filter in "parse_ridership_25mb":
+        try:
+            cases["parse_ridership_25mb"] = (_parse_ridership_case(), 1)
+        except ImportError as e:
+            print(f"skip parse_ridership: {e}", file=sys.stderr)
+
+    return {name: case for name, case in cases.items() if name_filter in name}
+
+
+def _parse_ridership_case() -> Callable[[], object]:
+    """합성 25MB cp949 CSV로 parse_ridership 실행 (출력은 임시 디렉터리)"""
+    import pandas  # noqa: F401  (parse_voter_data 의존성 확인)
+    from benchmarks.fixtures import load_parser, write_ridership_csv
+
+    parser = load_parser()
+    workdir = Path(tempfile.mkdtemp(prefix="npfs-bench-"))
+    write_ridership_csv(workdir / "raw" / parser.RIDERSHIP_FILE)
+    parser.RAW_DIR = workdir / "raw"
+    parser.PROCESSED_DIR = workdir / "processed"
+    parser.PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
+    return lambda: parser.parse_ridership()
+
+
+def measure(func: Callable[[], object], repeat: int, warmup: int = 1) -> dict:
+    """warmup 후 repeat회 실행 시간 (ms) 통계"""
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples = np.array(samples)
+    return {
+        "repeat": repeat,
+        "min_ms": round(float(samples.min()), 3),
+        "median_ms": round(float(np.median(samples)), 3),
+        "p99_ms": round(float(np.percentile(samples, 99)), 3),
+        "mean_ms": round(float(samples.mean()), 3),
+    }
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(current: dict, baseline: dict) -> None:
+    """기준 결과 대비 중앙값 변화율 출력"""
+    print(f"\n{'benchmark':<28}{'base ms':>12}{'now ms':>12}{'change':>10}")
+    for name, stats in current["benchmarks"].items():
+        base = baseline["benchmarks"].get(name)
+        if base is None:
+            continue
+        change = stats["median_ms"] / base["median_ms"] - 1
+        flag = "  REGRESSION" if change > REGRESSION_THRESHOLD else ""
+        print(f"{name:<28}{base['median_ms']:>12.2f}{stats['median_ms']:>12.2f}{change:>+10.1%}{flag}")
+
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description="NPFS ML API benchmarks")
+    parser.add_argument("-k", "--filter", default="", help="이름에 포함된 케이스만 실행")
+    parser.add_argument("--repeat-scale", type=float, default=1.0, help="반복 횟수 배율")
+    parser.add_argument("--output", type=Path, help="결과 JSON 경로 (기본: results/<commit>.json)")
+    parser.add_argument("--compare", type=Path, help="비교할 기준 결과 JSON")
+    args = parser.parse_args(argv)
+
+    results = {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "numpy": np.__version__,
+        "benchmarks": {},
+    }
+
+    print(f"{'benchmark':<28}{'median ms':>12}{'min ms':>12}{'p99 ms':>12}")
+    for name, (func, repeat) in build_cases(args.filter).items():
+        stats = measure(func, max(1, int(repeat * args.repeat_scale)), warmup=0 if repeat == 1 else 1)
+        results["benchmarks"][name] = stats
+        print(f"{name:<28}{stats['median_ms']:>12.2f}{stats['min_ms']:>12.2f}{stats['p99_ms']:>12.2f}")
+
+    output = args.output or RESULTS_DIR / f"{results['revision']}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    print(f"\nSaved: {output}")
+
+    if args.compare:
+        compare(results, json.loads(args.compare.read_text()))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,2 +1,15 @@
-from .schemas import SimulationParams, SimulationResult
-from .simulation import run_simulation, get_population_estimates
+# 하위 모듈은 필요할 때 import (numpy 의존 모듈을 voter-reach 경로에서 피하기 위함)
+_EXPORTS = {
+    "SimulationParams": "schemas",
+    "SimulationResult": "schemas",
+    "run_simulation": "simulation",
+    "get_population_estimates": "simulation",
+}
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        import importlib
+        module = importlib.import_module(f".{_EXPORTS[name]}", __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
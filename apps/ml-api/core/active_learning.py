@@ -0,0 +1,140 @@
+"""
+대리 모델 학습 시나리오 능동 학습 (active learning)
+균등 무작위 시나리오 대신 공간 충전 설계에서 시작해, 위원회 (committee) 모델들의 예측이
+가장 엇갈리는 후보를 골라 시뮬레이션하는 과정을 반복
+
+1. 초기 설계: 학습 범위의 스크램블 Sobol 점 (INITIAL_SAMPLES개)
+2. 검증: 현재 시나리오로 학습한 모델의 검증 시나리오 오차가 목표 이하이거나 예산을 다 쓰면 종료
+   (목표: 같은 예산의 균등 무작위 시나리오로 학습한 모델의 검증 MAE와 95% 분위수, 둘 다 넘어서야 종료)
+3. 위원회: 부분 표본 (subsample) 부스팅 모델 COMMITTEE_SIZE개를 현재 시나리오로 학습
+4. 획득: 같은 Sobol 수열의 다음 CANDIDATE_POOL개 후보 중 위원회 예측 표준편차 상위 BATCH_SIZE개를 추가
+
+모든 평가는 policy_depletion_years로 (시나리오 수 × 연도 수) 행렬 한 번에 계산
+(run_simulation_simple과 같은 값)
+"""
+import warnings
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .schemas import DEFAULT_SENSITIVITY_RANGES, SimulationParams
+from .sensitivity import scale_design
+from .simulation import policy_depletion_years
+from .surrogate import SURROGATE_FEATURES as FEATURES
+
+INITIAL_SAMPLES = 512
+BATCH_SIZE = 256
+CANDIDATE_POOL = 1024
+COMMITTEE_SIZE = 3
+# 위원회 모델: 부분 표본 + 절반 트리 (불일치 추정용, 최종 모델보다 가벼움)
+COMMITTEE_OPTIONS = {"subsample": 0.5, "n_estimators": 50}
+VALIDATION_SAMPLES = 1024
+
+
+
+@dataclass
+class ActiveLearningResult:
+    """마지막 라운드 모델, 학습 시나리오 (입력 X, 고갈 연도 y)와 라운드별 검증 이력"""
+    model: object
+    X: np.ndarray
+    y: np.ndarray
+    simulations: int  # 검증 / 기준 시나리오 포함 시뮬레이션 횟수
+    reached_target: bool
+    history: List[dict] = field(default_factory=list)
+    baseline: Optional[dict] = None  # 같은 예산 균등 무작위 모델의 검증 오차 (목표를 직접 준 경우 None)
+
+
+def design_inputs(points: np.ndarray) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """단위 입방체 점 (시나리오 수 × 변수 수) → 모델 입력 행렬과 변수별 값"""
+    columns = scale_design(points, list(FEATURES), DEFAULT_SENSITIVITY_RANGES)
+    return np.column_stack([columns[name] for name in FEATURES]).astype(float), columns
+
+
+def simulate_design(points: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """단위 입방체 점 → 모델 입력 행렬과 고갈 연도 (배치 시뮬레이션)"""
+    X, columns = design_inputs(points)
+    return X, policy_depletion_years(SimulationParams(), **columns).astype(float)
+
+
+def validation_errors(model, X_val: np.ndarray, y_val: np.ndarray) -> Tuple[float, float]:
+    """검증 시나리오 절대 오차의 (평균, 95% 분위수)"""
+    errors = np.abs(model.predict(X_val) - y_val)
+    return float(errors.mean()), float(np.percentile(errors, 95))
+
+
+def uniform_baseline(
+    model_factory: Callable[..., object],
+    budget: int,
+    rng: np.random.Generator,
+    X_val: np.ndarray,
+    y_val: np.ndarray,
+) -> dict:
+    """같은 예산의 균등 무작위 시나리오로 학습한 모델의 검증 오차 (능동 학습 종료 목표)"""
+    X, y = simulate_design(rng.random((budget, len(FEATURES))))
+    mae, p95 = validation_errors(model_factory().fit(X, y), X_val, y_val)
+    return {"n_samples": budget, "validation_mae": round(mae, 4), "validation_p95": round(p95, 4)}
+
+
+def active_learning_design(
+    model_factory: Callable[..., object],
+    budget: int = 5000,
+    seed: int = 42,
+    target_p95: Optional[float] = None,
+    initial_samples: int = INITIAL_SAMPLES,
+    batch_size: int = BATCH_SIZE,
+    candidate_pool: int = CANDIDATE_POOL,
+    committee_size: int = COMMITTEE_SIZE,
+    validation_samples: int = VALIDATION_SAMPLES,
+) -> ActiveLearningResult:
+    """
+    능동 학습 시나리오 설계와 학습된 모델
+    model_factory(**overrides): fit / predict 모델 생성 (인자 없이 최종 모델, COMMITTEE_OPTIONS로 위원회)
+    budget: 학습 시나리오 최대 수
+    target_p95: 검증 오차 95% 분위수 목표 (년), None이면 같은 예산의 균등 무작위 모델보다
+    검증 MAE와 95% 분위수가 모두 작아질 때 종료 (기준 모델 학습 비용 추가)
+    """
+    from scipy.stats import qmc
+
+    rng = np.random.default_rng(seed)
+    with warnings.catch_warnings():
+        # Sobol 균형 조건(2의 거듭제곱) 경고 무시
+        warnings.simplefilter("ignore", UserWarning)
+        design = qmc.Sobol(d=len(FEATURES), scramble=True, seed=rng)
+        X, y = simulate_design(design.random(min(initial_samples, budget)))
+        X_val, y_val = simulate_design(qmc.Sobol(d=len(FEATURES), scramble=True, seed=rng).random(validation_samples))
+        baseline = None
+        if target_p95 is None:
+            baseline = uniform_baseline(model_factory, budget, rng, X_val, y_val)
+
+        history = []
+        while True:
+            model = model_factory().fit(X, y)
+            mae, p95 = validation_errors(model, X_val, y_val)
+            history.append({
+                "round": len(history),
+                "n_samples": len(y),
+                "validation_mae": round(mae, 4),
+                "validation_p95": round(p95, 4),
+            })
+            if baseline is None:
+                reached = p95 <= target_p95
+            else:
+                reached = mae < baseline["validation_mae"] and p95 < baseline["validation_p95"]
+            if reached or len(y) >= budget:
+                break
+
+            # 같은 수열의 다음 후보 중 위원회 예측이 가장 엇갈리는 점 (불확실성 상위)
+            committee = [
+                model_factory(**COMMITTEE_OPTIONS, random_state=int(state)).fit(X, y)
+                for state in rng.integers(0, 2 ** 31 - 1, committee_size)
+            ]
+            candidates = design.random(candidate_pool)
+            candidate_X, _ = design_inputs(candidates)
+            disagreement = np.std([member.predict(candidate_X) for member in committee], axis=0)
+            picked = np.argsort(disagreement)[::-1][:min(batch_size, budget - len(y))]
+            X_new, y_new = simulate_design(candidates[picked])
+            X, y = np.vstack([X, X_new]), np.concatenate([y, y_new])
+
+    simulations = len(y) + len(y_val) + (budget if baseline else 0)
+    return ActiveLearningResult(model, X, y, simulations, reached, history, baseline)
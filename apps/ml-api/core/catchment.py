@@ -0,0 +1,278 @@
+"""
+역세권(catchment) 엔진
+행정동을 가장 가까운 역들에 배정하고, 역별 유권자 수와 투표율 가중 유권자 비율을 계산
+(CATCHMENT_NEIGHBOURS = 1이면 Voronoi 분할, 그 이상이면 가까운 k개 역에 거리 역수로 분배)
+
+- 단위: 행정동 (seoul_geometry_index.json의 면적가중 중심점)
+- 동별 유권자: 동 연령 자료가 있으면 동 선거연령(18세 이상) 인구를 구 유권자 수에 맞춰 보정한 값
+  (voter_share_level = "dong"), 없으면 구 유권자 비율 × 동 인구 (면적 비례 배분 포함, "gu")
+- 동별 투표율: 구 투표율 (seoul_turnout_by_gu.json, 없으면 선거구 평균), 동 단위 자료는 없음
+- 동별 연령 구성: population_by_dong_age.json의 동 → 구 → 서울 기본값 순으로 사용
+  (연령 자료가 하나도 없으면 age_data = "default", 역별 연령 구성이 모두 같음)
+
+station × dong 가중치 행렬을 한 번 계산해 두므로 /optimize 점수는
+행렬-벡터 곱 하나와 시간대 승하차 벡터의 원소곱으로 끝남
+연령대 지정 점수도 (시간대, 역, 연령대) 승객 구성 배열을 미리 만들어 두어 같은 비용
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# 동 하나를 나눠 갖는 최근접 역 수
+CATCHMENT_NEIGHBOURS = 3
+
+# 거리 역수 가중치의 최소 거리 (km): 중심점 바로 옆 역이 동 전체를 가져가지 않도록
+# (환승역처럼 노선별 좌표가 조금씩 다른 역들도 사실상 균등 분할됨)
+MIN_DISTANCE_KM = 0.3
+
+EARTH_RADIUS_KM = 6371.0088
+
+# 시간대 축 (ridership_hourly의 hour: 5~24)
+N_HOURS = 25
+
+# 유권자 연령대 (scripts/parse_voter_data.py의 AGE_SEGMENTS와 같은 순서)
+AGE_SEGMENTS = ("18-29", "30-39", "40-49", "50-59", "60+")
+
+# 연령 자료가 없을 때 쓰는 서울 유권자 연령 구성 (2024 총선 선거인수 기준 근사치)
+DEFAULT_AGE_MIX = (0.17, 0.17, 0.17, 0.17, 0.32)
+
+# 시간대별 연령대 상대 이용 성향 (가정치): 출퇴근 시간은 30~40대, 낮 시간은 60대 이상,
+# 심야는 20대 승객 비중이 높음. (시작 시, 끝 시, 연령대별 배수)
+HOURLY_AGE_PROPENSITY = (
+    (0, 6, (1.2, 1.1, 1.0, 1.0, 0.8)),
+    (7, 9, (1.2, 1.4, 1.3, 1.0, 0.5)),
+    (10, 16, (0.9, 0.8, 0.8, 1.0, 1.6)),
+    (17, 19, (1.2, 1.3, 1.2, 1.0, 0.6)),
+    (20, 24, (1.5, 1.2, 1.0, 0.8, 0.5)),
+)
+
+
+@dataclass
+class CatchmentModel:
+    """역세권 가중치와 시간대별 승하차 행렬"""
+    station_ids: List[str]
+    stations: List[dict]
+    station_index: Dict[str, int]
+    weights: np.ndarray  # (역 수, 동 수) 인구 기준 역세권 구성비, 행 합 1
+    dong_voter_share: np.ndarray  # (동 수,) 인구 대비 유권자 비율
+    dong_turnout: np.ndarray  # (동 수,) 투표율
+    dong_gu: List[str]
+    catchment_voters: np.ndarray  # (역 수,) 역세권 유권자 수
+    catchment_population: np.ndarray  # (역 수,) 역세권 인구
+    ridership: np.ndarray  # (시간대, 역 수) 평균 승차 + 하차
+    observed: np.ndarray  # (시간대, 역 수) 승하차 데이터 존재 여부
+    station_names: List[str]
+    catchment_age: np.ndarray  # (역 수, 연령대 수) 역세권 유권자 연령 구성, 행 합 1
+    rider_age_mix: np.ndarray  # (시간대, 역 수, 연령대 수) 승객 연령 구성, 마지막 축 합 1
+    age_data: str = "default"  # 연령 구성 출처: dong | gu | default (default면 역마다 같아 연령대 지정이 순위를 바꾸지 못함)
+    voter_share_level: str = "gu"  # 유권자 비율 단위: dong (동 선거연령 인구) | gu (모든 동에 구 비율)
+
+    def voter_rate(self, dong_turnout: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        역별 '투표할 유권자' 비율 = Σ_d w[s,d] · 유권자비율_d · 투표율_d
+        dong_turnout을 바꿔(선거구 지정 등) 같은 가중치로 다시 계산 가능
+        """
+        turnout = self.dong_turnout if dong_turnout is None else dong_turnout
+        return self.weights @ (self.dong_voter_share * turnout)
+
+    def segment_share(self, hour: int, segments: Optional[List[str]] = None) -> np.ndarray:
+        """역별 해당 시간대 승객 중 지정 연령대 비율 (segments가 없으면 1)"""
+        if not segments:
+            return np.ones(len(self.station_ids))
+        columns = [AGE_SEGMENTS.index(segment) for segment in segments]
+        return self.rider_age_mix[hour][:, columns].sum(axis=1)
+
+    def catchment_turnout(self, dong_turnout: Optional[np.ndarray] = None) -> np.ndarray:
+        """역세권 유권자 가중 평균 투표율"""
+        turnout = self.dong_turnout if dong_turnout is None else dong_turnout
+        share = self.weights @ self.dong_voter_share
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(share > 0, self.voter_rate(turnout) / share, 0.0)
+
+
+def _project_km(lat: np.ndarray, lng: np.ndarray, lat0: float) -> np.ndarray:
+    """위경도 → 지역 평면 좌표 (km)"""
+    return np.column_stack([
+        np.radians(lng) * EARTH_RADIUS_KM * np.cos(np.radians(lat0)),
+        np.radians(lat) * EARTH_RADIUS_KM,
+    ])
+
+
+def nearest_station_weights(
+    station_xy: np.ndarray,
+    unit_xy: np.ndarray,
+    k: int = CATCHMENT_NEIGHBOURS,
+    min_distance_km: float = MIN_DISTANCE_KM,
+) -> np.ndarray:
+    """
+    각 단위(동)를 가까운 k개 역에 나누는 (역 수, 단위 수) 배정 행렬 (열 합 1)
+    가중치는 거리 역수 (min_distance_km 미만은 같은 거리로 취급), k = 1이면 Voronoi 분할
+    역 수백 × 동 수백 규모라 KD-tree 없이 거리 행렬 + argpartition으로 계산
+    """
+    distances = np.hypot(
+        station_xy[:, np.newaxis, 0] - unit_xy[np.newaxis, :, 0],
+        station_xy[:, np.newaxis, 1] - unit_xy[np.newaxis, :, 1],
+    )
+    k = min(k, len(station_xy))
+    nearest = np.argpartition(distances, k - 1, axis=0)[:k]  # (k, 단위 수)
+    columns = np.arange(unit_xy.shape[0])
+    inverse = 1.0 / np.maximum(distances[nearest, columns], min_distance_km)
+
+    assignment = np.zeros_like(distances)
+    assignment[nearest, columns] = inverse
+    return assignment / assignment.sum(axis=0, keepdims=True)
+
+
+def hourly_age_propensity() -> np.ndarray:
+    """(시간대, 연령대) 상대 이용 성향"""
+    propensity = np.ones((N_HOURS, len(AGE_SEGMENTS)))
+    for start, end, weights in HOURLY_AGE_PROPENSITY:
+        propensity[start:end + 1] = weights
+    return propensity
+
+
+def rider_age_mix(catchment_age: np.ndarray, propensity: np.ndarray) -> np.ndarray:
+    """
+    (시간대, 역, 연령대) 승객 연령 구성
+    역세권 유권자 연령 구성 × 시간대별 이용 성향을 연령대 축으로 정규화
+    """
+    mix = catchment_age[np.newaxis, :, :] * propensity[:, np.newaxis, :]
+    total = mix.sum(axis=2, keepdims=True)
+    return np.divide(mix, total, out=np.zeros_like(mix), where=total > 0)
+
+
+def _dong_key(dong: dict) -> Optional[str]:
+    """geometry index의 adm_nm ('서울특별시 종로구 사직동') → 인구 자료 키 ('종로구 사직동')"""
+    name = dong.get("adm_nm")
+    if not name:
+        return None
+    parts = name.split()
+    return " ".join(parts[-2:]) if len(parts) >= 2 else None
+
+
+def build_catchment_model(
+    stations: List[dict],
+    ridership: List[dict],
+    geometry_index: dict,
+    gu_voters: List[dict],
+    gu_turnout: Dict[str, float],
+    population_table: Optional[dict] = None,
+) -> Optional[CatchmentModel]:
+    """
+    역세권 모델 생성
+
+    gu_voters: seoul_election_2024.json (gu_name, population, registered_voters)
+    gu_turnout: 구 이름 → 투표율 (0~1)
+    population_table: population_by_dong_age.json (동/구별 인구와 연령대 인원, 없으면 면적 비례 + 기본 연령 구성)
+    """
+    stations = [s for s in stations if s.get("lat") is not None and s.get("lng") is not None]
+    dongs = geometry_index.get("dong", [])
+    gu_index = geometry_index.get("gu", {})
+    if not stations or not dongs or not gu_index:
+        return None
+
+    code_to_gu = {info["gu_code"]: name for name, info in gu_index.items()}
+    voters_by_gu = {row["gu_name"]: row for row in gu_voters}
+    dong_gu = [code_to_gu.get(dong.get("gu_code"), "") for dong in dongs]
+    dong_area = np.array([dong["area_km2"] for dong in dongs])
+
+    # 동 인구: 구 인구를 면적 비례 배분 (동 인구 자료가 있으면 아래에서 대체)
+    gu_population = np.array([voters_by_gu.get(gu, {}).get("population", 0) for gu in dong_gu], dtype=float)
+    gu_registered = np.array([voters_by_gu.get(gu, {}).get("registered_voters", 0) for gu in dong_gu], dtype=float)
+    gu_area = np.array([gu_index.get(gu, {}).get("area_km2", 0) for gu in dong_gu], dtype=float)
+    population = gu_population * np.divide(dong_area, gu_area, out=np.zeros_like(dong_area), where=gu_area > 0)
+
+    # 동 연령 구성: 동 자료 → 구 자료 → 기본값
+    table = population_table if population_table and population_table.get("segments") == list(AGE_SEGMENTS) else {}
+    dong_table, gu_table = table.get("dong", {}), table.get("gu", {})
+    age = np.tile(np.asarray(DEFAULT_AGE_MIX, dtype=float), (len(dongs), 1))
+    age_sources = set()
+    for d, (dong, gu) in enumerate(zip(dongs, dong_gu)):
+        dong_row = dong_table.get(_dong_key(dong))
+        row = dong_row or gu_table.get(gu)
+        if row and sum(row["age"]) > 0:
+            age[d] = row["age"]
+            age_sources.add("dong" if dong_row else "gu")
+        if dong_row:
+            population[d] = dong_row["population"]
+    age /= age.sum(axis=1, keepdims=True)
+    age_data = next((source for source in ("dong", "gu") if source in age_sources), "default")
+
+    voter_share = np.divide(gu_registered, gu_population, out=np.zeros_like(gu_registered), where=gu_population > 0)
+
+    # 동 선거연령 인구가 있으면 동별 유권자 비율: 구 유권자 수 / 구 선거연령 인구로 보정 (외국인 등 제외분)
+    dong_voting_age = np.array([sum((dong_table.get(_dong_key(dong)) or {}).get("age", ())) for dong in dongs], dtype=float)
+    gu_voting_age = np.array([sum(gu_table.get(gu, {}).get("age", ())) for gu in dong_gu], dtype=float)
+    registered_ratio = np.divide(gu_registered, gu_voting_age, out=np.ones_like(gu_registered), where=gu_voting_age > 0)
+    has_dong_voters = (dong_voting_age > 0) & (population > 0)
+    voter_share = np.where(
+        has_dong_voters,
+        np.minimum(dong_voting_age * registered_ratio / np.where(population > 0, population, 1.0), 1.0),
+        voter_share,
+    )
+    voter_share_level = "dong" if has_dong_voters.any() else "gu"
+    mean_turnout = float(np.mean(list(gu_turnout.values()))) if gu_turnout else 0.7
+    turnout = np.array([gu_turnout.get(gu, mean_turnout) for gu in dong_gu])
+
+    lat0 = float(np.mean([s["lat"] for s in stations]))
+    station_xy = _project_km(np.array([s["lat"] for s in stations]), np.array([s["lng"] for s in stations]), lat0)
+    dong_xy = _project_km(
+        np.array([dong["center"]["lat"] for dong in dongs]),
+        np.array([dong["center"]["lng"] for dong in dongs]),
+        lat0,
+    )
+    assignment = nearest_station_weights(station_xy, dong_xy)  # (역, 동), 열 합 1
+
+    # 역세권 인구 기준 구성비 (행 합 1), 배정된 동이 없는 역은 가장 가까운 동 하나로 대체
+    people = assignment * population
+    catchment_population = people.sum(axis=1)
+    empty = catchment_population <= 0
+    if empty.any():
+        nearest_dong = np.argmin(
+            np.hypot(station_xy[empty, np.newaxis, 0] - dong_xy[:, 0], station_xy[empty, np.newaxis, 1] - dong_xy[:, 1]),
+            axis=1,
+        )
+        people[empty] = 0.0
+        people[np.flatnonzero(empty), nearest_dong] = 1.0
+    weights = people / people.sum(axis=1, keepdims=True)
+
+    # 역세권 유권자 연령 구성 (유권자 비율 가중)
+    voter_age = weights @ (age * voter_share[:, np.newaxis])
+    voter_age_total = voter_age.sum(axis=1, keepdims=True)
+    catchment_age = np.divide(
+        voter_age, voter_age_total, out=np.tile(np.asarray(DEFAULT_AGE_MIX), (len(stations), 1)), where=voter_age_total > 0
+    )
+
+    station_ids = [str(s["id"]) for s in stations]
+    station_index = {station_id: i for i, station_id in enumerate(station_ids)}
+    dense = np.zeros((N_HOURS, len(stations)))
+    observed = np.zeros((N_HOURS, len(stations)), dtype=bool)
+    names = [s.get("name", "Unknown") for s in stations]
+    for row in ridership:
+        i = station_index.get(str(row.get("station_id")))
+        hour = row.get("hour")
+        if i is None or hour is None or not 0 <= hour < N_HOURS:
+            continue
+        dense[hour, i] = row.get("avg_boarding", 0) + row.get("avg_alighting", 0)
+        observed[hour, i] = True
+        names[i] = row.get("station_name", names[i])
+
+    return CatchmentModel(
+        station_ids=station_ids,
+        stations=stations,
+        station_index=station_index,
+        weights=weights,
+        dong_voter_share=voter_share,
+        dong_turnout=turnout,
+        dong_gu=dong_gu,
+        catchment_voters=(assignment * population * voter_share).sum(axis=1),
+        catchment_population=catchment_population,
+        ridership=dense,
+        observed=observed,
+        station_names=names,
+        catchment_age=catchment_age,
+        rider_age_mix=rider_age_mix(catchment_age, hourly_age_propensity()),
+        age_data=age_data,
+        voter_share_level=voter_share_level,
+    )
@@ -0,0 +1,349 @@
+"""
+코호트 요인법 인구 추계
+단세 연령(0~100세 이상) × 성별 인구를 출산 / 사망 / 국제이동 단계로 한 해씩 진행 (Leslie 행렬 방식)
+
+- 기준 인구: data/population_base_2024.json (통계청 장래인구추계 기준인구, 천명)이 있으면 사용,
+  없으면 2024년 10세 단위 인구와 성비로 만든 근사치
+- 출산: 합계출산율(TFR)이 목표 연도까지 선형으로 목표값에 수렴, 연령별 분포는 정규 분포 (평균 33.5세)
+- 사망: Gompertz-Makeham 사망력 (2023 생명표 기대수명에 맞춤) × 연간 개선율
+- 국제이동: 연간 순이동을 20~30대 중심 연령 분포로 배분
+- 가입 / 수급: 연도별 가입률, 수급률은 기본 가정 추계가 재정추계 기준 곡선의 가입자 / 수급자 수를
+  재현하도록 보정 (다른 가정은 같은 비율을 적용해 기준 대비 인구 변화만 반영)
+
+시나리오(가정 조합) 축으로 벡터화되어 있어 여러 가정을 한 번에 추계하고,
+결과는 가정 조합별로 캐시 (읽기 전용 배열)
+"""
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from .serialization import json_loads
+
+BASE_YEAR = 2024
+DEFAULT_HORIZON = 2093
+
+MAX_AGE = 100  # 100세 이상은 한 칸
+AGES = np.arange(MAX_AGE + 1)
+MALE, FEMALE = 0, 1
+
+BASE_POPULATION_FILE = Path(__file__).parent.parent / "data" / "population_base_2024.json"
+
+# 기준 인구 근사치: 2024년 10세 단위 인구 (천명)와 남자 비율, 구간 안에서는 균등 배분
+BASE_DECADE_POPULATION = (3300, 4700, 6200, 6600, 7900, 8700, 7500, 3900, 2000, 300)
+BASE_DECADE_MALE_SHARE = (0.513, 0.517, 0.525, 0.525, 0.508, 0.502, 0.490, 0.450, 0.360, 0.250)
+
+# 출산
+FERTILITY_MEAN_AGE = 33.5
+FERTILITY_SD = 5.0
+FERTILITY_AGES = (15, 49)
+BASE_TFR = 0.72  # 2023년 합계출산율
+SEX_RATIO_AT_BIRTH = 1.05  # 여아 100명당 남아
+
+# 사망: mu(x) = A + B · exp(c · x), B는 2023 생명표 기대수명 (남 80.6세, 여 86.4세)에 맞춘 값
+MAKEHAM_A = 0.0001
+GOMPERTZ_B = (1.765e-5, 9.43e-6)  # (남, 여)
+GOMPERTZ_C = 0.1
+INFANT_MORTALITY = 0.0025
+
+# 국제이동 연령 분포
+MIGRATION_MEAN_AGE = 28.0
+MIGRATION_SD = 8.0
+
+# 국민연금 가입 / 수급
+CONTRIBUTION_AGES = (18, 59)  # 의무가입 연령
+BENCHMARK_PENSION_AGE = 65  # 기준 곡선의 수급 개시 연령
+
+
+@dataclass(frozen=True)
+class DemographicAssumptions:
+    """인구 추계 가정 (캐시 키)"""
+    total_fertility_rate: float = 1.08  # 목표 연도의 합계출산율
+    tfr_target_year: int = 2050
+    mortality_improvement: float = 0.01  # 연간 사망률 개선율
+    net_migration: float = 50.0  # 연간 순이동 (천명)
+
+
+BASELINE = DemographicAssumptions()
+
+
+def base_population() -> np.ndarray:
+    """(성별, 연령) 기준 인구 (천명)"""
+    if BASE_POPULATION_FILE.exists():
+        data = json_loads(BASE_POPULATION_FILE.read_bytes())
+        return np.array([data["male"], data["female"]], dtype=float)[:, :MAX_AGE + 1]
+
+    population = np.zeros((2, MAX_AGE + 1))
+    for decade, (total, male_share) in enumerate(zip(BASE_DECADE_POPULATION, BASE_DECADE_MALE_SHARE)):
+        ages = slice(decade * 10, MAX_AGE + 1) if decade == len(BASE_DECADE_POPULATION) - 1 else slice(decade * 10, decade * 10 + 10)
+        n_ages = len(AGES[ages])
+        population[MALE, ages] = total * male_share / n_ages
+        population[FEMALE, ages] = total * (1 - male_share) / n_ages
+    return population
+
+
+def _normal_profile(mean: float, sd: float, lo: int = 0, hi: int = MAX_AGE) -> np.ndarray:
+    """연령 분포 (합 1)"""
+    profile = np.exp(-0.5 * ((AGES - mean) / sd) ** 2)
+    profile[(AGES < lo) | (AGES > hi)] = 0.0
+    return profile / profile.sum()
+
+
+FERTILITY_PROFILE = _normal_profile(FERTILITY_MEAN_AGE, FERTILITY_SD, *FERTILITY_AGES)
+MIGRATION_PROFILE = _normal_profile(MIGRATION_MEAN_AGE, MIGRATION_SD)
+BASE_HAZARD = MAKEHAM_A + np.array(GOMPERTZ_B)[:, np.newaxis] * np.exp(GOMPERTZ_C * AGES)  # (성별, 연령)
+
+
+def tfr_path(assumptions: Sequence[DemographicAssumptions], years: np.ndarray) -> np.ndarray:
+    """(시나리오, 연도) 합계출산율"""
+    target = np.array([a.total_fertility_rate for a in assumptions])[:, np.newaxis]
+    target_year = np.array([a.tfr_target_year for a in assumptions])[:, np.newaxis]
+    progress = np.clip((years - BASE_YEAR) / np.maximum(target_year - BASE_YEAR, 1), 0.0, 1.0)
+    return BASE_TFR + (target - BASE_TFR) * progress
+
+
+def mortality_rates(scale: np.ndarray) -> np.ndarray:
+    """(시나리오, 성별, 연령) 사망확률, scale: (시나리오,) 기준 사망력 배율 (100세 이상 구간은 연간 사망확률 그대로 적용)"""
+    hazard = BASE_HAZARD.astype(scale.dtype, copy=False) * scale[:, np.newaxis, np.newaxis]
+    q = -np.expm1(-hazard, out=hazard)
+    q[:, :, 0] = (INFANT_MORTALITY * scale)[:, np.newaxis]
+    return q
+
+
+def death_probabilities(improvement: np.ndarray, year_offset: int) -> np.ndarray:
+    """(시나리오, 성별, 연령) 사망확률 (사망력이 매년 improvement 비율로 개선)"""
+    return mortality_rates((1.0 - improvement) ** year_offset)
+
+
+def advance(previous: np.ndarray, q: np.ndarray, tfr: np.ndarray, migration: np.ndarray) -> np.ndarray:
+    """
+    (시나리오, 성별, 연령) 인구를 한 해 진행: 생존 → 한 살 증가 → 출생 → 국제이동
+    q: 사망확률, tfr: (시나리오,) 합계출산율, migration: (시나리오, 연령) 성별당 순이동
+    """
+    survivors = previous * (1.0 - q)
+
+    current = np.empty_like(previous)
+    current[:, :, 1:] = survivors[:, :, :-1]
+    current[:, :, MAX_AGE] += survivors[:, :, MAX_AGE]
+
+    # 출생아: 연초/연말 가임기 여성 평균 × 연령별 출산율, 영아 사망은 반년분 적용
+    women = (previous[:, FEMALE] + current[:, FEMALE]) / 2
+    births = (women @ FERTILITY_PROFILE.astype(women.dtype, copy=False)) * tfr
+    infant_survival = 1.0 - q[:, :, 0] / 2
+    male_birth_share = SEX_RATIO_AT_BIRTH / (1 + SEX_RATIO_AT_BIRTH)
+    current[:, MALE, 0] = births * male_birth_share * infant_survival[:, MALE]
+    current[:, FEMALE, 0] = births * (1 - male_birth_share) * infant_survival[:, FEMALE]
+
+    current += migration[:, np.newaxis, :]
+    return np.maximum(current, 0.0, out=current)
+
+
+def project(assumptions: Sequence[DemographicAssumptions], end_year: int = DEFAULT_HORIZON) -> np.ndarray:
+    """
+    (시나리오, 연도, 성별, 연령) 인구 (천명), 연도 축은 BASE_YEAR ~ end_year
+    연도마다: 생존 → 한 살 증가 → 출생 → 국제이동
+    """
+    assumptions = list(assumptions)
+    n, n_years = len(assumptions), end_year - BASE_YEAR + 1
+    years = np.arange(BASE_YEAR, end_year + 1)
+    tfr = tfr_path(assumptions, years)
+    improvement = np.array([a.mortality_improvement for a in assumptions])
+    migration = np.array([a.net_migration for a in assumptions])[:, np.newaxis] * MIGRATION_PROFILE / 2
+
+    population = np.empty((n, n_years, 2, MAX_AGE + 1))
+    population[:, 0] = base_population()
+    for t in range(1, n_years):
+        q = death_probabilities(improvement, t - 1)
+        population[:, t] = advance(population[:, t - 1], q, tfr[:, t - 1], migration)
+
+    return population
+
+
+def benchmark_counts(years: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    재정추계 기준 곡선 (통계청 장래인구추계(2022) 기반 간소화 모델, 2023 재정추계 적자전환 / 소진 연도에 맞춘 값)
+    반환: 연도별 가입자 수, 65세 이상 수급자 수 (천명)
+    """
+    offset = years - BASE_YEAR
+    # 생산가능인구 (15-64세): 2024년 3,600만명 → 2070년 1,700만명
+    working_age = np.maximum(17000, np.select(
+        [offset <= 10, offset <= 30],
+        [36000 - offset * 150, 34500 - (offset - 10) * 400],
+        26500 - (offset - 30) * 200,
+    ))
+    # 고령인구 (65세 이상)
+    elderly = np.minimum(20000, np.select(
+        [offset <= 10, offset <= 25],
+        [9500 + offset * 350, 13000 + (offset - 10) * 400],
+        19000 + (offset - 25) * 50,
+    ))
+    participation = np.maximum(0.50, 0.58 - offset * 0.001)
+    # 제도 성숙: 70% → 2034년 85% → 2049년 90%
+    maturity = np.select(
+        [offset <= 0, offset <= 10, offset <= 25],
+        [0.70, 0.70 + offset * 0.015, 0.85 + (offset - 10) * 0.003],
+        0.90,
+    )
+    return working_age * participation, elderly * maturity
+
+
+@lru_cache(maxsize=8)
+def calibration_rates(end_year: int = DEFAULT_HORIZON) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    BASE_YEAR~end_year 연도별 (가입률, 수급률): 기본 가정 추계의 18~59세 인구 / 65세 이상 인구 대비
+    기준 곡선 가입자 / 수급자 비율 (읽기 전용)
+    """
+    years = np.arange(BASE_YEAR, end_year + 1)
+    by_age = PROJECTIONS.get(BASELINE, end_year)[:len(years)].sum(axis=1)
+    lo, hi = CONTRIBUTION_AGES
+    contributors, beneficiaries = benchmark_counts(years)
+    participation = contributors / by_age[:, lo:hi + 1].sum(axis=1)
+    coverage = beneficiaries / by_age[:, BENCHMARK_PENSION_AGE:].sum(axis=1)
+    participation.flags.writeable = False
+    coverage.flags.writeable = False
+    return participation, coverage
+
+
+def _calibrated(years: np.ndarray, which: int) -> np.ndarray:
+    years = np.asarray(years)
+    rates = calibration_rates(max(int(years.max()), DEFAULT_HORIZON))[which]
+    return rates[np.clip(years - BASE_YEAR, 0, len(rates) - 1)]
+
+
+def participation_rate(years: np.ndarray) -> np.ndarray:
+    """18~59세 인구 대비 가입자 비율 (기준 곡선에 보정)"""
+    return _calibrated(years, 0)
+
+
+def coverage_rate(years: np.ndarray) -> np.ndarray:
+    """수급 연령 인구 중 수급자 비율 (65세 기준으로 기준 곡선에 보정)"""
+    return _calibrated(years, 1)
+
+
+def pension_counts(
+    population: np.ndarray,
+    years: np.ndarray,
+    pension_ages: Sequence[int],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    인구 배열 (..., 연도, 성별, 연령)에서 연령 기준으로 가입자 / 수급자 수 (천명) 계산
+    반환: (..., 연도) 가입자, (..., 수급 연령 수, 연도) 수급자
+    """
+    by_age = population.sum(axis=-2)  # (..., 연도, 연령)
+    lo, hi = CONTRIBUTION_AGES
+    contributors = by_age[..., lo:hi + 1].sum(axis=-1) * participation_rate(years)
+
+    # 연령 이상 인구 = 뒤에서부터 누적합
+    at_or_above = np.flip(np.cumsum(np.flip(by_age, axis=-1), axis=-1), axis=-1)
+    elderly = np.stack([at_or_above[..., age] for age in pension_ages], axis=-2)
+    return contributors, elderly * coverage_rate(years)
+
+
+# 경로별 추계는 경로 묶음 단위로 진행 (묶음 배열이 캐시에 들어가는 크기), 인구는 float32
+PATH_CHUNK = 1024
+
+
+def project_pension_paths(
+    tfr: np.ndarray,
+    mortality_scale: np.ndarray,
+    net_migration: np.ndarray,
+    pension_age: Union[int, np.ndarray],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    경로별 확률 추계: 연도 축은 BASE_YEAR부터 tfr.shape[1]년
+    tfr, mortality_scale: (경로, 연도) 합계출산율 / 기준 사망력 배율, net_migration: (경로,) 연간 순이동 (천명)
+    pension_age: 수급 개시 연령 또는 (연도,) 연도별 수급 연령
+    인구 배열은 현재 연도만 유지하고 (경로, 연도) 가입자 / 수급자 수 (천명)만 반환
+    """
+    n, n_years = tfr.shape
+    years = np.arange(BASE_YEAR, BASE_YEAR + n_years)
+    participation, coverage = participation_rate(years), coverage_rate(years)
+    lo, hi = CONTRIBUTION_AGES
+    pension_ages = np.broadcast_to(np.asarray(pension_age, dtype=np.int64), (n_years,))
+    contributors = np.empty((n, n_years))
+    beneficiaries = np.empty((n, n_years))
+
+    tfr = tfr.astype(np.float32)
+    mortality_scale = mortality_scale.astype(np.float32)
+    migration = (np.asarray(net_migration, dtype=np.float32)[:, np.newaxis] * MIGRATION_PROFILE / 2).astype(np.float32)
+    base = base_population().astype(np.float32)
+
+    for start in range(0, n, PATH_CHUNK):
+        paths = slice(start, min(start + PATH_CHUNK, n))
+        population = np.broadcast_to(base, (paths.stop - paths.start,) + base.shape).copy()
+        for t in range(n_years):
+            if t > 0:
+                q = mortality_rates(mortality_scale[paths, t - 1])
+                population = advance(population, q, tfr[paths, t - 1], migration[paths])
+            by_age = population.sum(axis=1)
+            contributors[paths, t] = by_age[:, lo:hi + 1].sum(axis=1) * participation[t]
+            beneficiaries[paths, t] = by_age[:, pension_ages[t]:].sum(axis=1) * coverage[t]
+    return contributors, beneficiaries
+
+
+class ProjectionCache:
+    """가정 조합별 인구 추계 LRU 캐시 (없는 조합들은 한 번의 벡터화 추계로 계산)"""
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._items: "OrderedDict[Tuple[DemographicAssumptions, int], np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, assumptions: Iterable[DemographicAssumptions], end_year: int = DEFAULT_HORIZON) -> List[np.ndarray]:
+        end_year = max(end_year, DEFAULT_HORIZON)
+        assumptions = list(assumptions)
+        with self._lock:
+            missing = list(dict.fromkeys(a for a in assumptions if (a, end_year) not in self._items))
+        if missing:
+            projected = project(missing, end_year)
+            with self._lock:
+                for a, population in zip(missing, projected):
+                    population.flags.writeable = False
+                    self._items[(a, end_year)] = population
+                while len(self._items) > max(self.maxsize, len(assumptions)):
+                    self._items.popitem(last=False)
+        with self._lock:
+            result = []
+            for a in assumptions:
+                self._items.move_to_end((a, end_year))
+                result.append(self._items[(a, end_year)])
+            return result
+
+    def get(self, assumptions: DemographicAssumptions = BASELINE, end_year: int = DEFAULT_HORIZON) -> np.ndarray:
+        return self.get_many([assumptions], end_year)[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+
+PROJECTIONS = ProjectionCache()
+
+
+def year_slice(population: np.ndarray, start_year: int, end_year: int) -> np.ndarray:
+    """연도 범위의 행 (BASE_YEAR 이전 연도는 기준 인구로 대체)"""
+    rows = np.clip(np.arange(start_year, end_year + 1) - BASE_YEAR, 0, population.shape[0] - 1)
+    return population[rows]
+
+
+def pension_population(
+    pension_age: int,
+    start_year: int,
+    end_year: int,
+    assumptions: DemographicAssumptions = BASELINE,
+) -> Dict[str, np.ndarray]:
+    """연도별 생산가능인구(15~64세), 고령인구(65세 이상), 가입자, 수급자 (천명)"""
+    population = year_slice(PROJECTIONS.get(assumptions, end_year), start_year, end_year)
+    years = np.arange(start_year, end_year + 1)
+    contributors, beneficiaries = pension_counts(population, years, [pension_age])
+    by_age = population.sum(axis=1)
+    return {
+        "working_age_pop": by_age[:, 15:65].sum(axis=1),
+        "elderly_pop": by_age[:, 65:].sum(axis=1),
+        "contributors": contributors,
+        "beneficiaries": beneficiaries[0],
+    }
@@ -0,0 +1,103 @@
+"""
+세대별 수익비 / 형평성 지수 계산
+정책 값과 고갈 연도 배열에서 (시나리오 수 × 세대 수) 행렬로 한 번에 계산
+"""
+from typing import Dict, Sequence
+
+import numpy as np
+
+from .schemas import SimulationParams
+from .simulation import policy_path, scenario_rows
+
+# 분석 대상 출생연도: 1950년생 ~ 2025년생 (5년 단위)
+BIRTH_YEARS = list(range(1950, 2030, 5))
+
+
+def cohort_policy(params: SimulationParams, birth_years: Sequence[int]) -> Dict[str, np.ndarray]:
+    """
+    세대별로 적용되는 정책 값 (세대 수,) 배열, 상수 정책 변수는 그 값 그대로
+    - pension_age: 그 해 수급 연령 이상이 되는 첫 나이 (60~70세)
+    - contribution_rate / replacement_rate: 납부 기간 (2024~2093) 연도별 값의 평균
+      (납부 기간이 없으면 납부 시작 연도 값)
+    일정은 시뮬레이션 기간 밖 연도에 첫 해 / 마지막 해 값 적용
+    """
+    birth = np.asarray(birth_years, dtype=np.int64)
+
+    def at(path: np.ndarray, years: np.ndarray) -> np.ndarray:
+        return path[np.clip(years - params.start_year, 0, len(path) - 1)]
+
+    ages = policy_path(params, "pension_age")
+    if ages.ndim:
+        candidates = np.arange(60, 71)
+        reached = candidates >= at(ages, birth[:, np.newaxis] + candidates)
+        pension_age = candidates[np.argmax(reached, axis=1)]
+    else:
+        pension_age = np.full(len(birth), int(ages))
+    policy = {"pension_age": pension_age}
+
+    # 납부 기간 [first, last)의 누적합 차이로 평균
+    first = np.clip(birth + 22, 2024, 2093)
+    last = np.clip(birth + pension_age, first, 2093)
+    grid = np.arange(2024, 2094)
+    for name in ("contribution_rate", "replacement_rate"):
+        path = policy_path(params, name)
+        if path.ndim == 0:
+            policy[name] = np.full(len(birth), float(path))
+            continue
+        cumulative = np.concatenate([[0.0], np.cumsum(at(path, grid))])
+        span = last - first
+        mean = (cumulative[last - 2024] - cumulative[first - 2024]) / np.maximum(span, 1)
+        policy[name] = np.where(span > 0, mean, at(path, first))
+    return policy
+
+
+def generation_roi_matrix(
+    birth_years: np.ndarray,
+    contribution_rate: np.ndarray,
+    replacement_rate: np.ndarray,
+    pension_age: np.ndarray,
+    depletion_year: np.ndarray,
+) -> np.ndarray:
+    """
+    (시나리오 수 × 세대 수) 수익비 (routers.generation.calculate_generation_data와 같은 가정, 반올림 전)
+    정책 입력은 시나리오별 (시나리오 수,) 배열 또는 세대별 값 (시나리오 수 또는 1, 세대 수) (cohort_policy),
+    고갈되지 않은 시나리오의 depletion_year는 np.inf
+    """
+    birth = np.asarray(birth_years, dtype=float)[np.newaxis, :]
+    contribution_rate = scenario_rows(contribution_rate)
+    replacement_rate = scenario_rows(replacement_rate)
+    pension_age = scenario_rows(pension_age)
+    depletion_year = scenario_rows(depletion_year)
+
+    contribution_years = np.maximum(0, np.minimum(birth + pension_age, 2093) - np.maximum(birth + 22, 2024))
+    benefit_start_year = birth + pension_age
+    benefit_end_year = birth + 85
+    full_benefit_years = np.maximum(0, benefit_end_year - benefit_start_year)
+
+    # 소진 후 은퇴: 급여 50% / 은퇴 중 소진: 소진 이후 기간만 50%
+    retired_after = benefit_start_year >= depletion_year
+    depleted_during = (benefit_start_year < depletion_year) & (depletion_year < benefit_end_year)
+    effective_replacement = np.where(retired_after, replacement_rate * 0.5, replacement_rate)
+    switch_year = np.minimum(depletion_year, benefit_end_year)
+    benefit_years = np.where(
+        depleted_during,
+        (switch_year - benefit_start_year) + (benefit_end_year - switch_year) * 0.5,
+        full_benefit_years,
+    )
+
+    average_income = 4200 * (1.02 ** (birth + 45 - 2024))
+    total_contribution = average_income * contribution_rate * 12 * contribution_years
+    total_benefit = average_income * effective_replacement * (np.minimum(contribution_years, 40) / 40) * 12 * benefit_years
+    return np.divide(total_benefit, total_contribution, out=np.zeros_like(total_benefit), where=total_contribution > 0)
+
+
+def equity_index_matrix(rois: np.ndarray) -> np.ndarray:
+    """행별 세대간 형평성 지수 (routers.generation.calculate_equity_index와 같은 식, 반올림 전)"""
+    positive = rois > 0
+    count = positive.sum(axis=1)
+    safe_count = np.maximum(count, 1)
+    mean_roi = np.where(positive, rois, 0.0).sum(axis=1) / safe_count
+    deviation = np.where(positive, rois - mean_roi[:, np.newaxis], 0.0)
+    std_roi = np.sqrt((deviation ** 2).sum(axis=1) / safe_count)
+    cv = np.divide(std_roi, mean_roi, out=np.full_like(mean_roi, np.inf), where=mean_roi != 0)
+    return np.where(count < 2, 1.0, np.maximum(0.0, 1 - cv))
@@ -0,0 +1,121 @@
+"""
+기금 궤적의 정책 변수 미분 (forward-mode)
+잔액 점화식과 함께 변수 4개의 접선 (d잔액 / d변수)을 연도마다 전파해 한 번의 시뮬레이션으로 모든 민감도 계산
+
+    B_t = B_{t-1} + C_t + I_t - E_t,  I_t = r_t · B_{t-1} (B_{t-1} > 0)
+    dB_t = dB_{t-1} + dC_t + r_t · dB_{t-1} + B_{t-1} · dr_t - dE_t
+
+- 보험료율 / 소득대체율 / 기금 수익률: 일정이면 모든 연도를 같이 이동하는 방향의 미분 (SHAP 단위 변화와 같은 정의)
+- 수급 연령: 정수 연령 사이를 선형 보간한 완화 모형의 미분 (연령 + 1세 단위 급여 지출과의 차이)
+- 연속 고갈 시점: 잔액이 처음 0 이하가 되는 해 안에서 전년도 말 잔액과 선형 보간
+  (올림하면 정수 고갈 연도), 정수 연도와 달리 변수에 대해 매끄러움
+"""
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from .schemas import SimulationParams, shift_policy
+from .simulation import INITIAL_FUND_BALANCE, policy_path, project_cashflows
+
+# 접선 축 순서
+GRADIENT_PARAMETERS = ("contribution_rate", "replacement_rate", "pension_age", "fund_return_rate")
+
+
+@dataclass
+class FundTangents:
+    """(경로, 연도) 잔액과 (경로, 연도, 변수) 잔액 미분, 경로별 연속 고갈 시점 (연도 축 인덱스 기준)"""
+    balances: np.ndarray
+    balance_gradients: np.ndarray
+    depletion_time: np.ndarray  # 고갈되지 않으면 nan
+    depletion_gradients: np.ndarray  # (경로, 변수), 고갈되지 않으면 nan
+
+
+def propagate_tangents(
+    contribution: np.ndarray,
+    benefit: np.ndarray,
+    returns: np.ndarray,
+    d_contribution: np.ndarray,
+    d_benefit: np.ndarray,
+    d_returns: np.ndarray,
+    initial_balance: float = INITIAL_FUND_BALANCE,
+) -> FundTangents:
+    """
+    contribution, benefit: (1 또는 경로 수, 연도 수), returns: (경로 수, 1 또는 연도 수)
+    d_*: 같은 모양 + 변수 축 (..., 변수 수)
+    잔액은 core.kernels와 같은 규칙 (첫 고갈 연도에 0으로 조정, 조정된 값의 미분은 0)
+    연속 고갈 시점 t* = (t - 1) + B_{t-1} / (B_{t-1} - B_t), 올림하면 고갈 연도 인덱스 t
+    """
+    n_paths, n_years = returns.shape[0], contribution.shape[1]
+    n_params = d_contribution.shape[-1]
+    fixed_rate = returns.shape[1] == 1
+
+    balance = np.full(n_paths, float(initial_balance))
+    tangent = np.zeros((n_paths, n_params))
+    balances = np.empty((n_paths, n_years))
+    balance_gradients = np.empty((n_paths, n_years, n_params))
+    depletion_time = np.full(n_paths, np.nan)
+    depletion_gradients = np.full((n_paths, n_params), np.nan)
+    active = np.ones(n_paths, dtype=bool)
+
+    for t in range(n_years):
+        column = 0 if fixed_rate else t
+        rate, d_rate = returns[:, column], d_returns[:, column]
+        invested = (balance > 0)[:, np.newaxis]
+        next_balance = balance + contribution[:, t] + np.where(balance > 0, balance * rate, 0.0) - benefit[:, t]
+        next_tangent = (
+            tangent
+            + d_contribution[:, t]
+            + np.where(invested, rate[:, np.newaxis] * tangent + balance[:, np.newaxis] * d_rate, 0.0)
+            - d_benefit[:, t]
+        )
+
+        depleted = active & (next_balance <= 0)
+        if depleted.any():
+            previous, current = balance[depleted], next_balance[depleted]
+            gap = previous - current
+            depletion_time[depleted] = t - 1 + previous / gap
+            depletion_gradients[depleted] = (
+                previous[:, np.newaxis] * next_tangent[depleted] - current[:, np.newaxis] * tangent[depleted]
+            ) / (gap ** 2)[:, np.newaxis]
+            next_balance[depleted] = 0.0
+            next_tangent[depleted] = 0.0
+            active &= ~depleted
+
+        balance, tangent = next_balance, next_tangent
+        balances[:, t] = balance
+        balance_gradients[:, t] = tangent
+
+    return FundTangents(balances, balance_gradients, depletion_time, depletion_gradients)
+
+
+def fund_tangents(params: SimulationParams, returns: Optional[np.ndarray] = None) -> FundTangents:
+    """
+    params의 기금 궤적과 정책 변수 4개 (GRADIENT_PARAMETERS 순서)에 대한 미분
+    returns: (경로 수, 연도 수) 수익률 경로 (없으면 params의 고정 수익률 / 일정), 경로별 미분은 pathwise
+    """
+    contribution, benefit = project_cashflows(params)
+    unit = {"contribution_rate": 1.0, "replacement_rate": 1.0}
+    unit_income, unit_expenditure = project_cashflows(params.model_copy(update=unit))
+    _, older_expenditure = project_cashflows(params.model_copy(update={
+        **unit, "pension_age": shift_policy(params.pension_age, 1),
+    }))
+    replacement_rate = policy_path(params, "replacement_rate")
+
+    n_years = params.end_year - params.start_year + 1
+    zeros = np.zeros(n_years)
+    d_contribution = np.stack([unit_income, zeros, zeros, zeros], axis=-1)
+    d_benefit = np.stack([
+        zeros, unit_expenditure, (older_expenditure - unit_expenditure) * replacement_rate, zeros,
+    ], axis=-1)
+
+    if returns is None:
+        returns = np.atleast_2d(np.broadcast_to(policy_path(params, "fund_return_rate"), n_years))
+    returns = np.atleast_2d(returns)
+    d_returns = np.zeros(returns.shape + (len(GRADIENT_PARAMETERS),))
+    d_returns[..., GRADIENT_PARAMETERS.index("fund_return_rate")] = 1.0
+
+    return propagate_tangents(
+        contribution[np.newaxis], benefit[np.newaxis], returns,
+        d_contribution[np.newaxis], d_benefit[np.newaxis], d_returns,
+    )
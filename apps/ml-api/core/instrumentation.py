@@ -0,0 +1,241 @@
+"""
+성능 계측
+- 엔드포인트별 지연시간 히스토그램 (ASGI 미들웨어)
+- 핫패스 구간 타이밍 (timed 데코레이터 / 컨텍스트 매니저)
+- Prometheus 텍스트 포맷 출력
+- 요청 단위 프로파일러 (ENABLE_PROFILING=1 일 때 ?profile=1 또는 X-Profile: 1)
+"""
+import bisect
+import functools
+import io
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+
+# 초 단위 버킷 (Prometheus 기본값 + 저지연 구간)
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+REQUEST_METRIC = "npfs_http_request_duration_seconds"
+SPAN_METRIC = "npfs_span_duration_seconds"
+
+PROFILING_ENABLED = os.getenv("ENABLE_PROFILING", "").lower() in ("1", "true", "yes")
+
+
+class Histogram:
+    """누적 버킷 히스토그램 (스레드 안전)"""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # 마지막은 +Inf
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def snapshot(self) -> Tuple[list, float, int]:
+        """(누적 버킷 카운트, 합계, 개수)"""
+        with self._lock:
+            counts, total, count = list(self.counts), self.sum, self.count
+        cumulative, running = [], 0
+        for c in counts:
+            running += c
+            cumulative.append(running)
+        return cumulative, total, count
+
+
+class MetricsRegistry:
+    """이름 + 라벨 조합별 히스토그램 저장소"""
+
+    def __init__(self):
+        self._histograms: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], Histogram] = {}
+        self._help: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str = "",
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        **labels: str,
+    ) -> Histogram:
+        key = (name, tuple(sorted(labels.items())))
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, Histogram(buckets))
+                if help_text:
+                    self._help.setdefault(name, help_text)
+        return histogram
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format (0.0.4)"""
+        lines = []
+        for name in sorted({key[0] for key in self._histograms}):
+            if name in self._help:
+                lines.append(f"# HELP {name} {self._help[name]}")
+            lines.append(f"# TYPE {name} histogram")
+            for (metric, labels), histogram in sorted(self._histograms.items()):
+                if metric != name:
+                    continue
+                cumulative, total, count = histogram.snapshot()
+                base = [f'{k}="{_escape(v)}"' for k, v in labels]
+                for bound, value in zip(list(histogram.buckets) + ["+Inf"], cumulative):
+                    label_str = ",".join(base + [f'le="{bound}"'])
+                    lines.append(f"{name}_bucket{{{label_str}}} {value}")
+                label_str = "{" + ",".join(base) + "}" if base else ""
+                lines.append(f"{name}_sum{label_str} {total}")
+                lines.append(f"{name}_count{label_str} {count}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+REGISTRY = MetricsRegistry()
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """구간 실행 시간을 npfs_span_duration_seconds{span=name}에 기록"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        REGISTRY.histogram(SPAN_METRIC, "Duration of instrumented hot-path spans", span=name).observe(
+            time.perf_counter() - start
+        )
+
+
+def timed(name: Optional[str] = None):
+    """함수 실행 시간을 span으로 기록하는 데코레이터"""
+    def decorator(func):
+        span_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class MetricsMiddleware:
+    """
+    라우트 템플릿 기준 요청 지연시간 기록 (순수 ASGI 미들웨어)
+    매칭되지 않은 경로는 카디널리티 제한을 위해 하나로 묶음
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            REGISTRY.histogram(
+                REQUEST_METRIC,
+                "HTTP request latency by route",
+                method=scope["method"],
+                route=_route_label(scope),
+                status=str(status["code"]),
+            ).observe(time.perf_counter() - start)
+
+
+class ProfilerMiddleware:
+    """
+    요청 단위 프로파일링 (ENABLE_PROFILING=1 에서만 등록)
+    ?profile=1 또는 X-Profile: 1 요청은 원래 응답 대신 프로파일 리포트를 반환
+    pyinstrument가 설치되어 있으면 사용 (async 친화적), 아니면 cProfile
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _profile_requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        async def discard(message):
+            pass
+
+        try:
+            from pyinstrument import Profiler
+            profiler = Profiler(async_mode="enabled")
+            profiler.start()
+            try:
+                await self.app(scope, receive, discard)
+            finally:
+                profiler.stop()
+            body = profiler.output_text(unicode=True, color=False).encode()
+        except ImportError:
+            import cProfile
+            import pstats
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                await self.app(scope, receive, discard)
+            finally:
+                profiler.disable()
+            stream = io.StringIO()
+            pstats.Stats(profiler, stream=stream).sort_stats("cumulative").print_stats(50)
+            body = stream.getvalue().encode()
+
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"text/plain; charset=utf-8"), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+def _route_label(scope) -> str:
+    """요청 경로의 path 파라미터 값을 {이름}으로 되돌린 라우트 템플릿"""
+    if scope.get("route") is None:
+        return "__unmatched__"
+    path = scope["path"]
+    for name, value in scope.get("path_params", {}).items():
+        path = path.replace(f"/{value}", f"/{{{name}}}", 1)
+    return path
+
+
+def _profile_requested(scope) -> bool:
+    query = scope.get("query_string", b"").decode()
+    if any(part in ("profile=1", "profile=true") for part in query.split("&")):
+        return True
+    return dict(scope.get("headers", [])).get(b"x-profile", b"") in (b"1", b"true")
+
+
+def add_instrumentation(app):
+    """계측 미들웨어 등록 (프로파일러는 ENABLE_PROFILING=1 일 때만)"""
+    if PROFILING_ENABLED:
+        app.add_middleware(ProfilerMiddleware)
+    app.add_middleware(MetricsMiddleware)
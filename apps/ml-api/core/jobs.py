@@ -0,0 +1,304 @@
+"""
+비동기 작업 (job) 실행
+대규모 Monte Carlo, 대리 모델 재학습, 시나리오 일괄 계산처럼 요청-응답 안에 끝나기 어려운 작업을
+인프로세스 큐와 워커 풀에서 실행하고 결과를 SQLite에 저장
+
+- submit(): 작업 id 반환 (같은 kind + 정규화된 입력이 실행 중이면 기존 작업 id 반환 = single-flight)
+  중복 판정은 저장소의 유일 색인 (대기/실행 중인 작업의 key)으로 하므로 저장소를 공유하는 프로세스 사이에도 적용
+- get(): 상태 / 결과 조회
+
+여러 프로세스(uvicorn 워커, 배포 중 겹치는 구/신 프로세스)가 같은 JOB_STORE_PATH를 공유할 수 있도록
+작업마다 실행 프로세스(호스트, pid, 부팅 id)를 기록하고, 시작 시에는 같은 호스트에서 이미 종료된
+프로세스의 미완료 작업만 실패 처리 (다른 호스트의 작업은 건드리지 않음)
+"""
+import hashlib
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+APP_DIR = Path(__file__).parent.parent
+DEFAULT_STORE_PATH = APP_DIR / "models" / "jobs.sqlite3"
+
+# 작업 상태
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+ACTIVE_STATES = (QUEUED, RUNNING)
+
+# 완료된 작업 보관 기간 (초)
+RESULT_TTL_SECONDS = 24 * 3600
+# 만료 작업 삭제 주기 (초, 작업 등록 시 마지막 삭제 후 이만큼 지났으면 실행)
+PURGE_INTERVAL_SECONDS = 3600
+
+
+def process_owner() -> Tuple[str, int, str]:
+    """이 프로세스의 작업 소유자 (호스트, pid, 부팅 id), 부팅 id는 재시작으로 pid가 재사용된 경우 구분"""
+    return socket.gethostname(), os.getpid(), _BOOT_ID
+
+
+_BOOT_ID = uuid.uuid4().hex
+
+
+def process_alive(pid: int) -> bool:
+    """같은 호스트의 pid가 살아 있는지"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:  # 다른 사용자 프로세스
+        return True
+    return True
+
+
+def canonical_key(kind: str, payload: Any) -> str:
+    """작업 종류 + 입력의 정규화된 해시 (키 순서, 공백과 무관)"""
+    text = json.dumps({"kind": kind, "payload": payload}, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class JobStore:
+    """작업 메타데이터와 결과를 저장하는 SQLite 저장소 (스레드 간 공유)"""
+
+    def __init__(self, path):
+        self.path = str(path)
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    job_id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL,
+                    result TEXT,
+                    error TEXT
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_key ON jobs (key, status)")
+            # 소유자 열이 없던 저장소 파일 이전
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+            for column, kind in (("owner_host", "TEXT"), ("owner_pid", "INTEGER"), ("owner_boot", "TEXT")):
+                if column not in columns:
+                    self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {kind}")
+            # 대기/실행 중인 작업은 key당 하나 (single-flight 선점), 색인 이전 파일의 중복은 가장 오래된 것만 남김
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, error = ? WHERE status IN (?, ?) AND rowid NOT IN "
+                "(SELECT MIN(rowid) FROM jobs WHERE status IN (?, ?) GROUP BY key)",
+                (FAILED, time.time(), "duplicate of an active job", *ACTIVE_STATES, *ACTIVE_STATES),
+            )
+            self._conn.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS jobs_active_key ON jobs (key) WHERE status IN ('queued', 'running')"
+            )
+
+    def create(self, job_id: str, kind: str, key: str, owner: Optional[Tuple[str, int, str]] = None) -> Optional[str]:
+        """
+        작업 행 추가로 key 선점, 성공하면 None
+        같은 key의 작업이 대기/실행 중이면 (다른 프로세스 포함, 유일 색인 위반) 추가하지 않고 그 작업 id 반환
+        """
+        host, pid, boot = owner or process_owner()
+        with self._lock:
+            while True:
+                try:
+                    self._conn.execute(
+                        "INSERT INTO jobs (job_id, kind, key, status, created_at, owner_host, owner_pid, owner_boot) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        (job_id, kind, key, QUEUED, time.time(), host, pid, boot),
+                    )
+                    return None
+                except sqlite3.IntegrityError:
+                    row = self._conn.execute(
+                        "SELECT job_id FROM jobs WHERE key = ? AND status IN (?, ?)", (key, *ACTIVE_STATES)
+                    ).fetchone()
+                    if row is not None:
+                        return row[0]
+                    # 조회 전에 그 작업이 끝났으면 다시 선점
+
+    def mark_running(self, job_id: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, started_at = ? WHERE job_id = ?",
+                (RUNNING, time.time(), job_id),
+            )
+
+    def finish(self, job_id: str, result: Any = None, error: Optional[str] = None) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, result = ?, error = ? WHERE job_id = ?",
+                (
+                    FAILED if error else SUCCEEDED,
+                    time.time(),
+                    None if error else json.dumps(result, default=str),
+                    error,
+                    job_id,
+                ),
+            )
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT job_id, kind, status, created_at, started_at, finished_at, result, error "
+                "FROM jobs WHERE job_id = ?",
+                (job_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        job_id, kind, status, created_at, started_at, finished_at, result, error = row
+        return {
+            "job_id": job_id,
+            "kind": kind,
+            "status": status,
+            "created_at": created_at,
+            "started_at": started_at,
+            "finished_at": finished_at,
+            "result": json.loads(result) if result is not None else None,
+            "error": error,
+        }
+
+    def abandon_active(self, owner: Optional[Tuple[str, int, str]] = None) -> int:
+        """
+        이 호스트에서 종료된 프로세스가 끝내지 못한 작업을 실패 처리
+        (pid가 없거나, 이 프로세스와 pid가 같지만 부팅 id가 다른 경우 / 소유자 기록 전 작업)
+        살아 있는 다른 프로세스와 다른 호스트의 작업은 그대로 둠
+        """
+        host, pid, boot = owner or process_owner()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT job_id, owner_host, owner_pid, owner_boot FROM jobs WHERE status IN (?, ?)",
+                ACTIVE_STATES,
+            ).fetchall()
+            dead = [
+                job_id
+                for job_id, job_host, job_pid, job_boot in rows
+                if job_host is None
+                or (job_host == host and job_boot != boot and (job_pid == pid or not process_alive(job_pid)))
+            ]
+            for job_id in dead:
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, finished_at = ?, error = ? WHERE job_id = ? AND status IN (?, ?)",
+                    (FAILED, time.time(), "server restarted before the job finished", job_id, *ACTIVE_STATES),
+                )
+        return len(dead)
+
+    def purge(self, older_than: float) -> int:
+        """완료 후 older_than 초가 지난 작업 삭제"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM jobs WHERE finished_at IS NOT NULL AND finished_at < ?",
+                (time.time() - older_than,),
+            )
+        return cursor.rowcount
+
+
+class JobManager:
+    """
+    작업 큐 + 워커 풀
+    handler는 kind별로 register()로 등록: handler(payload) -> JSON 직렬화 가능한 결과
+    """
+
+    def __init__(self, store: JobStore, max_workers: int = 2):
+        self.store = store
+        self.max_workers = max_workers
+        self._handlers: Dict[str, Callable[[Any], Any]] = {}
+        self._inflight: Dict[str, str] = {}  # key -> job_id (이 프로세스가 실행 중인 작업, 저장소 조회 전 빠른 경로)
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="npfs-job")
+        self._purged_at = 0.0
+        self.store.abandon_active()
+        self.purge_expired()
+
+    def purge_expired(self, force: bool = True) -> int:
+        """보관 기간이 지난 작업 삭제 (force가 아니면 PURGE_INTERVAL_SECONDS마다 한 번)"""
+        now = time.time()
+        if not force and now - self._purged_at < PURGE_INTERVAL_SECONDS:
+            return 0
+        self._purged_at = now
+        return self.store.purge(RESULT_TTL_SECONDS)
+
+    def register(self, kind: str, handler: Callable[[Any], Any]) -> None:
+        self._handlers[kind] = handler
+
+    @property
+    def kinds(self):
+        return tuple(self._handlers)
+
+    def submit(self, kind: str, payload: Any) -> dict:
+        """
+        작업 등록, {"job_id", "deduplicated"} 반환
+        같은 kind와 입력의 작업이 대기/실행 중이면 새로 만들지 않고 그 작업 id 반환
+        """
+        if kind not in self._handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+
+        self.purge_expired(force=False)
+        key = canonical_key(kind, payload)
+        with self._lock:
+            job_id = self._inflight.get(key)
+            if job_id is not None:
+                return {"job_id": job_id, "deduplicated": True}
+            job_id = uuid.uuid4().hex
+            active_id = self.store.create(job_id, kind, key)
+            # 선점한 작업의 프로세스가 이 호스트에서 이미 종료됐으면 실패 처리하고 다시 선점
+            if active_id is not None and self.store.abandon_active():
+                active_id = self.store.create(job_id, kind, key)
+            if active_id is not None:
+                return {"job_id": active_id, "deduplicated": True}
+            self._inflight[key] = job_id
+
+        self._executor.submit(self._run, job_id, kind, key, payload)
+        return {"job_id": job_id, "deduplicated": False}
+
+    def _run(self, job_id: str, kind: str, key: str, payload: Any) -> None:
+        self.store.mark_running(job_id)
+        try:
+            result = self._handlers[kind](payload)
+        except Exception as e:  # 작업 실패는 상태로 기록
+            self.store.finish(job_id, error=f"{type(e).__name__}: {e}")
+        else:
+            self.store.finish(job_id, result=result)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        return self.store.get(job_id)
+
+    def queue_depth(self) -> int:
+        with self._lock:
+            return len(self._inflight)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+
+_MANAGER: Optional[JobManager] = None
+_MANAGER_LOCK = threading.Lock()
+
+
+def get_job_manager() -> JobManager:
+    """
+    프로세스 전역 JobManager
+    JOB_STORE_PATH (기본 models/jobs.sqlite3, ":memory:" 가능), JOB_WORKERS (기본 2)
+    """
+    global _MANAGER
+    if _MANAGER is None:
+        with _MANAGER_LOCK:
+            if _MANAGER is None:
+                store = JobStore(os.getenv("JOB_STORE_PATH", str(DEFAULT_STORE_PATH)))
+                _MANAGER = JobManager(store, max_workers=int(os.getenv("JOB_WORKERS", "2")))
+    return _MANAGER
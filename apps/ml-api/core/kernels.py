@@ -0,0 +1,206 @@
+"""
+기금 잔액 시간 진행 커널
+잔액 점화식은 전년도 잔액에 의존 (양수일 때만 운용수익, 처음 고갈되는 해에 0으로 조정)하므로
+연도 방향은 순차적이고, 경로 / 시나리오 방향으로만 병렬화 가능
+
+- numpy: 경로 방향 벡터화, 연도 수만큼 Python 반복 (의존성 없음)
+- numba: @njit(parallel=True) 경로별 네이티브 루프 (prange), 고갈 후 잔액 기록이 필요 없으면 조기 종료
+
+numba가 설치되어 있으면 자동 선택, NPFS_KERNEL=numpy|numba로 강제.
+numba는 첫 사용 시 import / 컴파일 (cache=True로 디스크에 캐시)하여 콜드 스타트에 영향 없음
+
+입력 모양 (브로드캐스트 규칙):
+- contribution, benefit: (1 또는 경로 수, 연도 수) 보험료 수입 / 급여 지출 (조원)
+- returns: (경로 수, 1 또는 연도 수) 운용수익률 (1열이면 고정 수익률)
+"""
+import importlib.util
+import os
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+KERNELS: Dict[str, Callable[[], "FundKernel"]] = {}
+
+# 이 경로 수 이상이면 numba 병렬 루프 사용 (작은 배치는 스레드 기동 비용이 더 큼)
+PARALLEL_MIN_PATHS = 256
+
+
+def register_kernel(name: str):
+    """커널 백엔드 등록 데코레이터"""
+    def decorator(cls):
+        cls.name = name
+        KERNELS[name] = cls
+        return cls
+    return decorator
+
+
+class FundKernel:
+    """커널 백엔드 기본 클래스"""
+    name = "base"
+
+    def recurse(
+        self,
+        contribution: np.ndarray,
+        benefit: np.ndarray,
+        returns: np.ndarray,
+        initial_balance: float,
+        balances: Optional[np.ndarray] = None,
+        investment: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        경로별 첫 고갈 연도 인덱스 (고갈되지 않으면 연도 수)
+        balances / investment를 주면 (경로 수 × 연도 수) 연말 잔액 / 운용수익을 기록
+        """
+        raise NotImplementedError
+
+
+@register_kernel("numpy")
+class NumpyKernel(FundKernel):
+    """경로 방향 numpy 벡터화 (경로 1개면 Python float 루프가 더 빠름)"""
+
+    def recurse(self, contribution, benefit, returns, initial_balance, balances=None, investment=None):
+        n_paths, n_years = returns.shape[0], contribution.shape[1]
+        if n_paths == 1:
+            return self._single(contribution, benefit, returns, initial_balance, balances, investment)
+        fund_balance = np.full(n_paths, float(initial_balance))
+        depletion = np.full(n_paths, n_years, dtype=np.int64)
+        active = np.ones(n_paths, dtype=bool)
+        fixed_rate = returns.shape[1] == 1
+
+        for t in range(n_years):
+            rate = returns[:, 0] if fixed_rate else returns[:, t]
+            income = np.where(fund_balance > 0, fund_balance * rate, 0.0)
+            fund_balance = fund_balance + contribution[:, t] + income - benefit[:, t]
+
+            depleted = active & (fund_balance <= 0)
+            depletion[depleted] = t
+            active &= ~depleted
+            fund_balance[depleted] = 0.0
+
+            if balances is not None:
+                balances[:, t] = fund_balance
+            if investment is not None:
+                investment[:, t] = income
+
+        return depletion
+
+    @staticmethod
+    def _single(contribution, benefit, returns, initial_balance, balances, investment):
+        n_years = contribution.shape[1]
+        rates = np.broadcast_to(returns[0], (n_years,)).tolist()
+        fund_balance = float(initial_balance)
+        depletion = n_years
+        path_balances, path_income = [], []
+        for t, (income_in, expenditure, rate) in enumerate(zip(contribution[0].tolist(), benefit[0].tolist(), rates)):
+            income = fund_balance * rate if fund_balance > 0 else 0.0
+            fund_balance = fund_balance + income_in + income - expenditure
+            if fund_balance <= 0 and depletion == n_years:
+                depletion = t
+                fund_balance = 0.0
+            path_balances.append(fund_balance)
+            path_income.append(income)
+
+        if balances is not None:
+            balances[0] = path_balances
+        if investment is not None:
+            investment[0] = path_income
+        return np.array([depletion], dtype=np.int64)
+
+
+# numba 컴파일 전에 NumbaKernel이 numba.prange로 교체 (numba import는 첫 사용 시로 지연)
+_prange = range
+
+
+def _numba_recurse(contribution, benefit, returns, initial_balance, balances, investment, record):
+    """경로별 순차 점화식 (numba로 컴파일, prange는 parallel=False면 range와 같음)"""
+    n_paths, n_years = returns.shape[0], contribution.shape[1]
+    shared_flows = contribution.shape[0] == 1
+    fixed_rate = returns.shape[1] == 1
+    depletion = np.full(n_paths, n_years, dtype=np.int64)
+
+    for p in _prange(n_paths):
+        row = 0 if shared_flows else p
+        fund_balance = initial_balance
+        for t in range(n_years):
+            rate = returns[p, 0] if fixed_rate else returns[p, t]
+            income = fund_balance * rate if fund_balance > 0 else 0.0
+            fund_balance = fund_balance + contribution[row, t] + income - benefit[row, t]
+            if fund_balance <= 0 and depletion[p] == n_years:
+                depletion[p] = t
+                fund_balance = 0.0
+                if not record:
+                    break
+            if record:
+                balances[p, t] = fund_balance
+                investment[p, t] = income
+
+    return depletion
+
+
+@register_kernel("numba")
+class NumbaKernel(FundKernel):
+    """numba @njit 경로별 네이티브 루프 (경로 수가 많으면 parallel=True)"""
+
+    def __init__(self):
+        import numba
+
+        global _prange
+        _prange = numba.prange
+        self._serial = numba.njit(cache=True)(_numba_recurse)
+        self._parallel = numba.njit(parallel=True, cache=True)(_numba_recurse)
+
+    def recurse(self, contribution, benefit, returns, initial_balance, balances=None, investment=None):
+        record = balances is not None or investment is not None
+        n_paths, n_years = returns.shape[0], contribution.shape[1]
+        shape = (n_paths, n_years) if record else (0, 0)
+        balances_out = balances if balances is not None else np.empty(shape)
+        investment_out = investment if investment is not None else np.empty(shape)
+        kernel = self._parallel if n_paths >= PARALLEL_MIN_PATHS else self._serial
+        return kernel(
+            np.ascontiguousarray(contribution, dtype=np.float64),
+            np.ascontiguousarray(benefit, dtype=np.float64),
+            np.ascontiguousarray(returns, dtype=np.float64),
+            float(initial_balance),
+            balances_out,
+            investment_out,
+            record,
+        )
+
+
+def numba_available() -> bool:
+    return importlib.util.find_spec("numba") is not None
+
+
+_ACTIVE: Dict[str, FundKernel] = {}
+
+
+def get_kernel(name: Optional[str] = None) -> FundKernel:
+    """
+    커널 백엔드 (프로세스당 한 번 생성)
+    name 또는 NPFS_KERNEL: numpy | numba | auto (기본, numba가 있으면 numba)
+    """
+    name = name or os.getenv("NPFS_KERNEL", "auto").lower()
+    if name == "auto":
+        name = "numba" if numba_available() else "numpy"
+    if name not in KERNELS:
+        raise ValueError(f"Unknown kernel: {name} (available: {', '.join(KERNELS)})")
+    if name not in _ACTIVE:
+        _ACTIVE[name] = KERNELS[name]()
+    return _ACTIVE[name]
+
+
+def fund_recursion(
+    contribution: np.ndarray,
+    benefit: np.ndarray,
+    returns: np.ndarray,
+    initial_balance: float,
+    balances: Optional[np.ndarray] = None,
+    investment: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """기본 커널로 점화식 실행 (1차원 현금흐름 / 수익률은 경로 1개로 취급)"""
+    contribution = np.atleast_2d(contribution)
+    benefit = np.atleast_2d(benefit)
+    returns = np.asarray(returns, dtype=float)
+    if returns.ndim < 2:
+        returns = returns.reshape(-1, 1) if returns.ndim == 1 else returns.reshape(1, 1)
+    return get_kernel().recurse(contribution, benefit, returns, initial_balance, balances, investment)
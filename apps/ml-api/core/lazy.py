@@ -0,0 +1,87 @@
+"""
+지연 로딩 ASGI 마운트
+무거운 라우터(numpy, sklearn 의존)를 첫 요청 시점에 import하여 콜드 스타트 단축
+"""
+import importlib.util
+import os
+import threading
+from typing import Callable, Optional, Sequence
+
+# /analysis 라우터가 import 시점 또는 요청 처리 중에 필요로 하는 모듈
+ANALYSIS_DEPENDENCIES = ("numpy", "scipy", "sklearn")
+
+
+class LazyMount:
+    """
+    첫 요청(또는 load() 호출) 때 loader로 ASGI 앱을 만들어 위임
+    app.mount(prefix, LazyMount(loader)) 형태로 사용
+    loader가 ImportError를 내면 (시작 시 확인하지 못한 의존성 누락) 500 대신 503으로 응답
+    """
+
+    def __init__(self, loader: Callable[[], Callable]):
+        self._loader = loader
+        self._app: Optional[Callable] = None
+        self._lock = threading.Lock()
+        self.error: Optional[str] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._app is not None
+
+    def load(self) -> Callable:
+        if self._app is None:
+            with self._lock:
+                if self._app is None:
+                    self._app = self._loader()
+        return self._app
+
+    async def __call__(self, scope, receive, send):
+        try:
+            app = self.load()
+        except ImportError as e:
+            self.error = f"{type(e).__name__}: {e}"
+            if scope["type"] != "http":
+                raise
+            from starlette.responses import JSONResponse
+            response = JSONResponse({"detail": f"ML endpoints unavailable ({self.error})"}, status_code=503)
+            await response(scope, receive, send)
+            return
+        await app(scope, receive, send)
+
+
+def merge_lazy_openapi(app, prefix: str, mount: LazyMount) -> None:
+    """
+    app의 OpenAPI 스키마를 만들 때 지연 마운트 앱의 경로 / 스키마를 prefix 아래로 합침
+    (/openapi.json, /docs가 첫 요청 전에도 지연 라우터를 포함, import 실패 시 지연 라우터만 빠짐)
+    """
+    build_schema = app.openapi
+
+    def openapi() -> dict:
+        if app.openapi_schema is not None:
+            return app.openapi_schema
+        schema = build_schema()
+        try:
+            sub_schema = mount.load().openapi()
+        except ImportError as e:
+            mount.error = f"{type(e).__name__}: {e}"
+            return schema
+        for path, item in sub_schema.get("paths", {}).items():
+            schema["paths"][prefix + path] = item
+        components = sub_schema.get("components", {})
+        for section, entries in components.items():
+            schema.setdefault("components", {}).setdefault(section, {}).update(entries)
+        return schema
+
+    app.openapi = openapi
+
+
+def modules_available(*names: str) -> bool:
+    """모듈을 import하지 않고 설치 여부만 확인"""
+    return all(importlib.util.find_spec(name) is not None for name in names)
+
+
+def analysis_dependencies() -> Sequence[str]:
+    """/analysis 라우터 의존성 (NPFS_KERNEL=numba로 강제하면 numba 포함, auto면 없을 때 numpy 커널 사용)"""
+    if os.getenv("NPFS_KERNEL", "auto").lower() == "numba":
+        return ANALYSIS_DEPENDENCIES + ("numba",)
+    return ANALYSIS_DEPENDENCIES
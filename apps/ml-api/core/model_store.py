@@ -0,0 +1,139 @@
+"""
+대리 모델 (고갈 연도 GradientBoosting) 저장 / 로드 / 학습
+SHAP 분석, 대리 모델 모드, 재학습 작업, 시작 스냅샷이 공유
+"""
+import hashlib
+import pickle
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from .active_learning import active_learning_design
+from .instrumentation import timed
+from .schemas import SimulationParams
+from .simulation import policy_depletion_years
+from .snapshot import get_snapshot
+from .surrogate import json_safe, save_report, validate_model
+
+# 모델 경로
+MODEL_PATH = Path(__file__).parent.parent / "models" / "xgb_depletion.pkl"
+SNAPSHOT_KEY = f"models/{MODEL_PATH.name}"
+
+
+@timed()
+def train_model_if_needed():
+    """
+    모델이 없으면 학습하여 저장
+    실제로는 별도 스크립트로 학습하지만, 데모용으로 on-demand 학습
+    """
+    if MODEL_PATH.exists():
+        return
+    train_model()
+
+
+def build_model(**overrides):
+    """대리 모델 (GradientBoosting) 생성, overrides로 하이퍼파라미터 변경 (능동 학습 위원회)"""
+    from sklearn.ensemble import GradientBoostingRegressor
+
+    options = {"n_estimators": 100, "max_depth": 5, "random_state": 42, **overrides}
+    return GradientBoostingRegressor(**options)
+
+
+@timed()
+def train_model(
+    n_samples: int = 5000,
+    seed: int = 42,
+    sampling: str = "uniform",
+    target_p95: Optional[float] = None,
+) -> dict:
+    """
+    시나리오를 생성해 모델을 학습하고 MODEL_PATH에 저장 (재학습 작업에서도 사용)
+    sampling: uniform (균등 무작위 n_samples개, 기본)
+            | active (Sobol 초기 설계 + 위원회 불일치 기반 능동 학습, n_samples는 최대 예산,
+                      target_p95가 None이면 같은 예산의 균등 무작위 모델을 넘어설 때 종료)
+    """
+    print("Training model...")
+
+    if sampling == "active":
+        design = active_learning_design(build_model, budget=n_samples, seed=seed, target_p95=target_p95)
+        model, X, y = design.model, design.X, design.y
+        summary = {
+            "simulations": design.simulations,
+            "reached_target": design.reached_target,
+            "baseline": design.baseline,
+            "rounds": design.history,
+        }
+    elif sampling == "uniform":
+        # 시나리오 생성
+        np.random.seed(seed)
+        X = np.array([
+            [
+                np.random.uniform(0.09, 0.15),
+                np.random.uniform(0.35, 0.50),
+                np.random.randint(63, 70),
+                np.random.uniform(0.03, 0.08),
+            ]
+            for _ in range(n_samples)
+        ])
+        # run_simulation_simple과 같은 값을 한 번의 배치 시뮬레이션으로
+        y = policy_depletion_years(SimulationParams(), *X.T).astype(float)
+        summary = {"simulations": n_samples}
+        model = build_model()
+        model.fit(X, y)
+    else:
+        raise ValueError(f"Unknown sampling method: {sampling}")
+
+    # 저장 (로드 중인 요청이 쓰다 만 파일을 읽지 않도록 교체)
+    MODEL_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = MODEL_PATH.with_suffix(".tmp")
+    with open(tmp_path, "wb") as f:
+        pickle.dump(model, f)
+    tmp_path.replace(MODEL_PATH)
+
+    print(f"Model saved to {MODEL_PATH}")
+    load_model_bytes.cache_clear()
+    load_model.cache_clear()
+
+    # 새 버전의 보류 시나리오 오차 리포트 (대리 모델 모드의 오차 상한)
+    report = validate_model(model, model_version())
+    save_report(report)
+
+    return {
+        "model_path": str(MODEL_PATH),
+        "model_version": report["version"],
+        "sampling": sampling,
+        "n_samples": len(y),
+        "seed": seed,
+        "train_r2": round(float(model.score(X, y)), 4),
+        "holdout": json_safe(report["overall"]),
+        **summary,
+    }
+
+
+@lru_cache(maxsize=1)
+def load_model_bytes() -> bytes:
+    """
+    학습된 모델 pickle (프로세스당 1회)
+    시작 스냅샷에 모델이 있으면 파일/학습 없이 사용
+    """
+    snapshot = get_snapshot()
+    # 스냅샷 이후 재학습 / 교체된 모델 파일이 있으면 파일 우선
+    if snapshot is not None and snapshot.has_blob(SNAPSHOT_KEY) and snapshot.blob_current(SNAPSHOT_KEY, MODEL_PATH):
+        return snapshot.blob(SNAPSHOT_KEY)
+
+    train_model_if_needed()
+    return MODEL_PATH.read_bytes()
+
+
+@lru_cache(maxsize=1)
+@timed()
+def load_model():
+    """학습된 모델 로드 (프로세스당 1회)"""
+    return pickle.loads(load_model_bytes())
+
+
+def model_version() -> str:
+    """모델 버전 (pickle 내용 해시, 스냅샷 sources와 같은 sha1 앞 12자리)"""
+    return hashlib.sha1(load_model_bytes()).hexdigest()[:12]
@@ -0,0 +1,146 @@
+"""
+Monte Carlo 경로 실행과 요약
+스트리밍 / 일괄 엔드포인트와 비동기 작업이 함께 쓰는 계산 (routers.monte_carlo, routers.jobs)
+"""
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .instrumentation import timed
+from .return_models import ReturnModel
+from .sampling import apply_control_variate, effective_sample_size, sample_cashflows, sample_return_paths
+from .schemas import MonteCarloResult, SimulationParams
+from .simulation import simulate_depletion_years
+from .sketches import FundBandAccumulator
+from .stochastic_paths import DemographicUncertainty
+
+# control variate 기댓값 추정용 보조 표본 (수익률만 생성)
+CONTROL_REFERENCE_BATCHES = 5
+CONTROL_REFERENCE_BATCH_SIZE = 10000
+
+
+@timed("monte_carlo_batch")
+def run_monte_carlo_batch(
+    params: SimulationParams,
+    n_paths: int,
+    model: ReturnModel,
+    rng: Optional[np.random.Generator] = None,
+    sampling: str = "pseudo",
+    demography: Optional[DemographicUncertainty] = None,
+    bands: Optional[FundBandAccumulator] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    n_paths개 경로의 고갈 연도 배열과 경로별 그룹 번호
+    bands를 주면 이 배치의 연도별 기금 잔액을 스케치에 반영 (배치 잔액 행렬은 반환하지 않음)
+    """
+    n_years = params.end_year - params.start_year + 1
+    returns, groups = sample_return_paths(n_paths, n_years, model, rng, sampling)
+    flows = sample_cashflows(params, returns, model, demography, rng, sampling)
+    balances = np.empty_like(returns) if bands is not None else None
+    results = simulate_depletion_years(params, returns, flows, balances)
+    if bands is not None:
+        bands.update(balances, results)
+    return results, groups
+
+
+def control_variate_estimate(
+    params: SimulationParams,
+    results: np.ndarray,
+    returns: np.ndarray,
+    base_sample_size: float,
+    model: ReturnModel,
+    rng: Optional[np.random.Generator] = None,
+) -> Tuple[float, float]:
+    """
+    결정론적 시뮬레이션 기반 control variate
+
+    통제변수: 경로 평균 수익률을 고정 수익률로 넣은 run_simulation 고갈 연도.
+    고정 수익률별 고갈 연도 곡선을 한 번 계산해 보간하고,
+    기댓값은 수익률만 생성하는 저렴한 보조 표본으로 추정
+    """
+    rng = rng or np.random.default_rng()
+    n_years = returns.shape[1]
+    grid = np.linspace(-0.30, 0.30, 601)
+    curve = simulate_depletion_years(params, np.repeat(grid[:, np.newaxis], n_years, axis=1)).astype(float)
+
+    control = np.interp(returns.mean(axis=1), grid, curve)
+
+    reference = []
+    for _ in range(CONTROL_REFERENCE_BATCHES):
+        aux_returns, _ = sample_return_paths(CONTROL_REFERENCE_BATCH_SIZE, n_years, model, rng)
+        reference.append(np.interp(aux_returns.mean(axis=1), grid, curve))
+
+    return apply_control_variate(results, control, np.concatenate(reference), base_sample_size)
+
+
+def summarize_depletion_years(
+    results: np.ndarray,
+    groups: Optional[np.ndarray] = None,
+    sampling: str = "pseudo",
+    return_model: Optional[str] = None,
+    stochastic_demography: bool = False,
+    bin_years: int = 5,
+) -> MonteCarloResult:
+    """고갈 연도 표본을 백분위수와 히스토그램으로 요약"""
+    # 히스토그램 데이터 (bin_years년 단위 bins)
+    min_year = max(2030, int(np.min(results)))
+    max_year = min(2100, int(np.max(results)))
+    bins = list(range(min_year, max_year + bin_years, bin_years))
+
+    hist, _ = np.histogram(results, bins=bins)
+    distribution = hist.tolist()
+
+    if groups is None:
+        groups = np.arange(len(results))
+
+    return MonteCarloResult(
+        median_depletion_year=int(np.median(results)),
+        ci_90_lower=int(np.percentile(results, 5)),
+        ci_90_upper=int(np.percentile(results, 95)),
+        ci_50_lower=int(np.percentile(results, 25)),
+        ci_50_upper=int(np.percentile(results, 75)),
+        distribution=distribution,
+        n_simulations=len(results),
+        mean_depletion_year=round(float(np.mean(results)), 2),
+        sampling=sampling,
+        return_model=return_model,
+        effective_sample_size=round(effective_sample_size(results, groups), 1),
+        stochastic_demography=stochastic_demography,
+        histogram_bin_years=bin_years,
+    )
+
+
+@timed("monte_carlo")
+def monte_carlo_summary(
+    params: SimulationParams,
+    n_simulations: int,
+    model: ReturnModel,
+    sampling: str = "pseudo",
+    control_variate: bool = False,
+    rng: Optional[np.random.Generator] = None,
+    demography: Optional[DemographicUncertainty] = None,
+    bin_years: int = 5,
+    fund_bands: bool = False,
+) -> MonteCarloResult:
+    """
+    Monte Carlo 실행 및 요약
+    demography를 주면 출산 / 사망 / 임금도 경로별로 변동 (control variate는 수익률 기반 그대로 사용)
+    fund_bands면 연도별 기금 잔액 백분위 밴드와 생존 곡선 포함
+    """
+    rng = rng or np.random.default_rng()
+    n_years = params.end_year - params.start_year + 1
+    returns, groups = sample_return_paths(n_simulations, n_years, model, rng, sampling)
+    flows = sample_cashflows(params, returns, model, demography, rng, sampling)
+    balances = np.empty_like(returns) if fund_bands else None
+    results = simulate_depletion_years(params, returns, flows, balances)
+    summary = summarize_depletion_years(results, groups, sampling, model.name, demography is not None, bin_years)
+    if fund_bands:
+        summary.fund_bands = FundBandAccumulator(params.start_year, params.end_year, rng=rng).update(balances, results).bands()
+
+    if control_variate:
+        mean, ess = control_variate_estimate(params, results, returns, summary.effective_sample_size, model, rng)
+        summary.mean_depletion_year = round(mean, 2)
+        summary.effective_sample_size = round(ess, 1)
+        summary.control_variate = True
+
+    return summary
@@ -0,0 +1,129 @@
+"""
+지역별 데이터 파티션
+지역(또는 운영기관)마다 데이터 파일을 별도 디렉터리에 두고, 요청이 그 지역을 처음 참조할 때 읽음
+
+- seoul (기본): data/ 바로 아래 파일 (기존 배치, 시작 스냅샷에서 제공)
+- 그 외: data/regions/<region>/ (예: data/regions/busan/stations.json)
+
+JSON은 파일을 메모리 매핑한 버퍼에서 바로 파싱하고, .npy 배열은 읽기 전용 메모리 매핑으로 열어
+서울만 조회하는 요청에는 다른 지역 데이터가 시작 시간과 메모리에 영향을 주지 않음
+"""
+import mmap
+import re
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from .serialization import json_loads, orjson
+from .snapshot import get_snapshot
+
+APP_DIR = Path(__file__).parent.parent
+DATA_DIR = APP_DIR / "data"
+REGIONS_DIR = DATA_DIR / "regions"
+
+DEFAULT_REGION = "seoul"
+
+# 지역 id: 디렉터리 이름으로 쓰므로 소문자/숫자/-/_ 만 허용
+REGION_PATTERN = r"^[a-z][a-z0-9_-]*$"
+
+_MISSING = object()
+
+
+class DataPartition:
+    """
+    한 지역의 데이터 파일 묶음
+    json() / array() / cached() 결과는 파티션 안에서 한 번만 만들고 공유 (읽기 전용으로 취급)
+    """
+
+    def __init__(self, region: str, directory: Path, use_snapshot: bool = False):
+        self.region = region
+        self.directory = Path(directory)
+        self.use_snapshot = use_snapshot
+        self._cache: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+
+    def path(self, filename: str) -> Path:
+        return self.directory / filename
+
+    def cached(self, key: str, build: Callable[[], Any]) -> Any:
+        """key별로 build() 결과를 한 번만 계산 (역세권 모델, 승하차 큐브 등 파생 데이터)"""
+        value = self._cache.get(key, _MISSING)
+        if value is _MISSING:
+            with self._lock:
+                value = self._cache.get(key, _MISSING)
+                if value is _MISSING:
+                    value = self._cache[key] = build()
+        return value
+
+    def json(self, filename: str) -> Optional[Any]:
+        """JSON 파일 (없으면 None), 기본 지역은 시작 스냅샷 우선"""
+        return self.cached(f"json:{filename}", lambda: self._read_json(filename))
+
+    def _read_json(self, filename: str) -> Optional[Any]:
+        filepath = self.path(filename)
+        if self.use_snapshot:
+            # 스냅샷 생성 후 수정된 파일은 파일에서 읽음
+            snapshot = get_snapshot()
+            name = f"data/{filename}"
+            if snapshot is not None and snapshot.has_blob(name) and snapshot.blob_current(name, filepath):
+                return json_loads(snapshot.blob(name))
+
+        if not filepath.exists() or filepath.stat().st_size == 0:
+            return None
+        if orjson is None:
+            return json_loads(filepath.read_bytes())
+        # orjson은 메모리 매핑 버퍼를 복사 없이 파싱
+        with open(filepath, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as view:
+                return orjson.loads(view)
+
+    def array(self, filename: str):
+        """.npy 배열 (읽기 전용 메모리 매핑, 없으면 None)"""
+        def load():
+            filepath = self.path(filename)
+            if not filepath.exists():
+                return None
+            import numpy as np
+            return np.load(filepath, mmap_mode="r")
+
+        return self.cached(f"array:{filename}", load)
+
+    @property
+    def loaded(self) -> List[str]:
+        """지금까지 읽은 파일/파생 데이터 키"""
+        return sorted(self._cache)
+
+
+def region_directory(region: str) -> Path:
+    return DATA_DIR if region == DEFAULT_REGION else REGIONS_DIR / region
+
+
+def available_regions() -> List[str]:
+    """기본 지역 + data/regions/ 아래 디렉터리 (파일은 읽지 않음)"""
+    regions = [DEFAULT_REGION]
+    if REGIONS_DIR.is_dir():
+        regions += sorted(
+            p.name for p in REGIONS_DIR.iterdir()
+            if p.is_dir() and p.name != DEFAULT_REGION and re.match(REGION_PATTERN, p.name)
+        )
+    return regions
+
+
+_PARTITIONS: Dict[str, DataPartition] = {}
+_PARTITIONS_LOCK = threading.Lock()
+
+
+def get_partition(region: str = DEFAULT_REGION) -> Optional[DataPartition]:
+    """지역 파티션 (처음 요청될 때 생성), 없는 지역이면 None"""
+    partition = _PARTITIONS.get(region)
+    if partition is not None:
+        return partition
+    if not re.match(REGION_PATTERN, region):
+        return None
+    directory = region_directory(region)
+    if region != DEFAULT_REGION and not directory.is_dir():
+        return None
+    with _PARTITIONS_LOCK:
+        return _PARTITIONS.setdefault(
+            region, DataPartition(region, directory, use_snapshot=region == DEFAULT_REGION)
+        )
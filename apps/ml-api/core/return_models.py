@@ -0,0 +1,206 @@
+"""
+기금 수익률 확률 모델
+모든 모델은 (경로 수 × 연도 수) 균등난수/표준정규난수 행렬을 받아
+경로 전체 수익률 행렬을 한 번에 생성 (core.sampling의 분산 감소 기법과 호환)
+"""
+import json
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+
+DEFAULT_MEAN_RETURN = 0.055
+DEFAULT_STD_RETURN = 0.08
+
+# 국민연금기금 연도별 운용수익률 (bootstrap 모델용)
+HISTORY_PATH = Path(__file__).parent.parent / "data" / "fund_returns_history.json"
+
+RETURN_MODELS: Dict[str, Callable[..., "ReturnModel"]] = {}
+
+
+def register_return_model(name: str):
+    """수익률 모델 등록 데코레이터"""
+    def decorator(cls):
+        cls.name = name
+        RETURN_MODELS[name] = cls
+        return cls
+    return decorator
+
+
+def get_return_model(
+    name: str,
+    mean_return: float = DEFAULT_MEAN_RETURN,
+    std_return: float = DEFAULT_STD_RETURN,
+) -> "ReturnModel":
+    """이름으로 수익률 모델 생성 (평균/표준편차로 보정)"""
+    if name not in RETURN_MODELS:
+        raise ValueError(f"Unknown return model: {name} (available: {', '.join(RETURN_MODELS)})")
+    return RETURN_MODELS[name](mean_return=mean_return, std_return=std_return)
+
+
+class ReturnModel:
+    """수익률 모델 기본 클래스"""
+    name = "base"
+
+    def __init__(self, mean_return: float = DEFAULT_MEAN_RETURN, std_return: float = DEFAULT_STD_RETURN):
+        self.mean_return = mean_return
+        self.std_return = std_return
+        # 연도별 평균 이동 (기금 수익률 일정의 기간 평균 대비 편차, (연도 수,)), 상수 수익률이면 0
+        self.offsets: np.ndarray = np.zeros(())
+
+    def with_offsets(self, offsets: np.ndarray) -> "ReturnModel":
+        self.offsets = np.asarray(offsets, dtype=float)
+        return self
+
+    def sample(self, uniforms: np.ndarray, normals: np.ndarray) -> np.ndarray:
+        """
+        uniforms, normals: (n_paths × n_years) 표준 입력
+        Returns: (n_paths × n_years) 수익률 행렬
+        """
+        raise NotImplementedError
+
+
+@register_return_model("normal")
+class NormalReturnModel(ReturnModel):
+    """독립 정규분포 수익률"""
+
+    def sample(self, uniforms: np.ndarray, normals: np.ndarray) -> np.ndarray:
+        return self.mean_return + self.std_return * normals
+
+
+@register_return_model("regime_iid")
+class IIDRegimeReturnModel(ReturnModel):
+    """
+    기존 Regime-switching 모델 (매년 독립적으로 국면 추첨)
+    호황: 평균 7%, 표준편차 5% / 불황: 평균 2%, 표준편차 12%
+    하위 호환을 위해 고정 파라미터 사용 (mean/std 무시)
+    """
+
+    def sample(self, uniforms: np.ndarray, normals: np.ndarray) -> np.ndarray:
+        crisis = uniforms < 0.3  # 70% 호황, 30% 불황
+        means = np.where(crisis, 0.02, 0.07)
+        stds = np.where(crisis, 0.12, 0.05)
+        return means + stds * normals
+
+
+@register_return_model("markov_regime")
+class MarkovRegimeReturnModel(ReturnModel):
+    """
+    Markov 국면 전환 모델 (국면 지속성 반영)
+
+    기본 전이행렬의 정상분포는 호황 70% / 불황 30%로 기존 모델과 같고,
+    평균 국면 지속 기간은 호황 약 6.7년, 불황 약 2.9년.
+    국면별 평균은 정상분포 평균이 mean_return이 되도록 평행이동하고,
+    표준편차는 std_return / 0.08 배율로 조정
+    """
+    TRANSITION = np.array([
+        [0.85, 0.15],  # 호황 → 호황, 불황
+        [0.35, 0.65],  # 불황 → 호황, 불황
+    ])
+    REGIME_MEANS = np.array([0.07, 0.02])
+    REGIME_STDS = np.array([0.05, 0.12])
+
+    def __init__(
+        self,
+        mean_return: float = DEFAULT_MEAN_RETURN,
+        std_return: float = DEFAULT_STD_RETURN,
+        transition: Optional[np.ndarray] = None,
+    ):
+        super().__init__(mean_return, std_return)
+        self.transition = np.asarray(transition if transition is not None else self.TRANSITION, dtype=float)
+        p_enter, p_leave = self.transition[0, 1], self.transition[1, 0]
+        self.stationary_crisis = p_enter / (p_enter + p_leave)
+
+        stationary_mean = (
+            (1 - self.stationary_crisis) * self.REGIME_MEANS[0]
+            + self.stationary_crisis * self.REGIME_MEANS[1]
+        )
+        self.means = self.REGIME_MEANS + (mean_return - stationary_mean)
+        self.stds = self.REGIME_STDS * (std_return / DEFAULT_STD_RETURN)
+
+    def regimes(self, uniforms: np.ndarray) -> np.ndarray:
+        """
+        국면 경로 (0: 호황, 1: 불황)
+        연 단위 전이는 순차적이지만 경로 방향으로 벡터화 (연도 수만큼 배열 연산)
+        """
+        states = np.empty(uniforms.shape, dtype=np.int8)
+        states[:, 0] = uniforms[:, 0] < self.stationary_crisis
+        crisis_prob = self.transition[:, 1]
+        for t in range(1, uniforms.shape[1]):
+            states[:, t] = uniforms[:, t] < crisis_prob[states[:, t - 1]]
+        return states
+
+    def sample(self, uniforms: np.ndarray, normals: np.ndarray) -> np.ndarray:
+        states = self.regimes(uniforms)
+        return self.means[states] + self.stds[states] * normals
+
+
+@register_return_model("ar1")
+class AR1ReturnModel(ReturnModel):
+    """
+    AR(1) 수익률: r_t = mean + phi * (r_{t-1} - mean) + e_t
+    정상분포 표준편차가 std_return이 되도록 충격 크기 조정.
+    재귀식을 하삼각 감쇠 행렬 곱으로 풀어 전체 경로를 한 번에 계산
+    """
+    PHI = 0.3
+
+    def __init__(
+        self,
+        mean_return: float = DEFAULT_MEAN_RETURN,
+        std_return: float = DEFAULT_STD_RETURN,
+        phi: float = PHI,
+    ):
+        super().__init__(mean_return, std_return)
+        self.phi = phi
+
+    def sample(self, uniforms: np.ndarray, normals: np.ndarray) -> np.ndarray:
+        n_years = normals.shape[1]
+        shocks = normals * (self.std_return * np.sqrt(1 - self.phi ** 2))
+        shocks[:, 0] = normals[:, 0] * self.std_return  # 정상분포에서 시작
+
+        lags = np.arange(n_years)[:, np.newaxis] - np.arange(n_years)[np.newaxis, :]
+        decay = np.where(lags >= 0, self.phi ** np.maximum(lags, 0), 0.0)
+        return self.mean_return + shocks @ decay.T
+
+
+@register_return_model("bootstrap")
+class BootstrapReturnModel(ReturnModel):
+    """
+    과거 운용수익률 블록 부트스트랩
+    연속된 BLOCK_SIZE년 단위로 재표집하여 자기상관 보존,
+    표본 평균이 mean_return이 되도록 평행이동 (std_return 무시)
+    """
+    BLOCK_SIZE = 3
+
+    def __init__(
+        self,
+        mean_return: float = DEFAULT_MEAN_RETURN,
+        std_return: float = DEFAULT_STD_RETURN,
+        history: Optional[np.ndarray] = None,
+        block_size: int = BLOCK_SIZE,
+    ):
+        super().__init__(mean_return, std_return)
+        if history is None:
+            history = load_return_history()
+        self.history = np.asarray(history, dtype=float)
+        self.block_size = min(block_size, len(self.history))
+        self.centered = self.history - self.history.mean() + mean_return
+
+    def sample(self, uniforms: np.ndarray, normals: np.ndarray) -> np.ndarray:
+        n_paths, n_years = uniforms.shape
+        n_blocks = -(-n_years // self.block_size)
+        n_starts = len(self.history) - self.block_size + 1
+
+        # 블록 시작점은 각 블록 첫 해의 균등난수로 결정
+        block_u = uniforms[:, ::self.block_size][:, :n_blocks]
+        starts = np.minimum((block_u * n_starts).astype(int), n_starts - 1)
+        index = (starts[:, :, np.newaxis] + np.arange(self.block_size)).reshape(n_paths, -1)[:, :n_years]
+        return self.centered[index]
+
+
+def load_return_history(path: Path = HISTORY_PATH) -> np.ndarray:
+    """연도별 운용수익률 (소수) 로드"""
+    with open(path, "r", encoding="utf-8") as f:
+        records = json.load(f)
+    return np.array([r["return_rate"] for r in records], dtype=float)
@@ -0,0 +1,203 @@
+"""
+일별 승하차 큐브
+역 × 날짜 × 시간대 × (승차, 하차) int32 배열을 메모리 매핑으로 읽고,
+요일 / 월 / 기간 조건의 평균 승하차를 누적합(prefix sum) 차이로 계산
+
+- ridership_daily.npy: (역 수, 날짜 수, 시간대 수, 2) int32 (scripts/parse_voter_data.py)
+- ridership_daily_index.json: station_ids, station_names, dates (YYYY-MM-DD), hours
+- ridership_daily_prefix.npy: (날짜 수 + 1, 역 수, 시간대 수, 2) int64 누적합
+  (parse_voter_data.py가 큐브와 함께 생성, 큐브만 있으면 python -m core.ridership_cube build [region])
+
+날짜 축을 (요일, 날짜) 순으로 정렬해 누적합을 만들어 두므로 요일 하나 × 연속 기간 하나가
+누적합 두 행의 차이가 되고, 조회 비용은 데이터 기간이 아닌 (요일 수 × 기간 조각 수)에 비례
+누적합 파일도 메모리 매핑으로 읽으므로 조회에 필요한 행만 페이지 단위로 읽음
+(파일이 없거나 큐브보다 오래됐으면 첫 조회 때 메모리에서 계산)
+"""
+import json
+import sys
+from dataclasses import dataclass
+from datetime import date
+from functools import cached_property
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+CUBE_FILE = "ridership_daily.npy"
+INDEX_FILE = "ridership_daily_index.json"
+PREFIX_FILE = "ridership_daily_prefix.npy"
+
+# 누적합 파일 생성 시 한 번에 처리할 역 수 (메모리 사용량 상한)
+PREFIX_STATION_CHUNK = 32
+
+BOARDING, ALIGHTING = 0, 1
+
+# 1970-01-01 (datetime64 기준일)은 목요일 → 월요일 = 0
+_EPOCH_WEEKDAY = 3
+
+
+@dataclass(frozen=True)
+class DayFilter:
+    """날짜 조건 (None = 제한 없음), 요일은 월요일 = 0"""
+    days_of_week: Optional[Tuple[int, ...]] = None
+    months: Optional[Tuple[int, ...]] = None
+    start: Optional[date] = None
+    end: Optional[date] = None
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.days_of_week and not self.months and self.start is None and self.end is None
+
+
+def weekday_order(dates: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """날짜 축 정렬 순서 (요일별로 묶고 그 안에서 날짜순)와 날짜별 요일"""
+    days = np.asarray(dates, dtype="datetime64[D]")
+    weekday = (days.astype(np.int64) + _EPOCH_WEEKDAY) % 7
+    return np.lexsort((days, weekday)), weekday
+
+
+def build_prefix_file(cube: np.ndarray, dates: Sequence[str], path: Path) -> Path:
+    """
+    (요일, 날짜) 순 누적합을 .npy로 저장 (역 PREFIX_STATION_CHUNK개씩 계산해 출력 파일에 바로 기록)
+    임시 파일에 쓴 뒤 교체
+    """
+    order, _ = weekday_order(dates)
+    n_stations, n_days = cube.shape[:2]
+    tmp = path.with_suffix(".tmp.npy")
+    shape = (n_days + 1, n_stations) + tuple(cube.shape[2:])
+    prefix = np.lib.format.open_memmap(tmp, mode="w+", dtype=np.int64, shape=shape)
+    prefix[0] = 0
+    for start in range(0, n_stations, PREFIX_STATION_CHUNK):
+        stop = min(start + PREFIX_STATION_CHUNK, n_stations)
+        reordered = np.moveaxis(np.asarray(cube[start:stop]), 1, 0)[order]
+        np.cumsum(reordered, axis=0, dtype=np.int64, out=prefix[1:, start:stop])
+    prefix.flush()
+    del prefix
+    tmp.replace(path)
+    return path
+
+
+def prefix_current(cube_path: Path, prefix_path: Path) -> bool:
+    """누적합 파일이 있고 큐브 파일 이후에 만들어졌는지"""
+    return prefix_path.exists() and cube_path.exists() and prefix_path.stat().st_mtime_ns >= cube_path.stat().st_mtime_ns
+
+
+class RidershipCube:
+    """메모리 매핑된 일별 승하차 큐브 + 요일별 누적합"""
+
+    def __init__(
+        self,
+        cube: np.ndarray,
+        station_ids: Sequence[str],
+        station_names: Sequence[str],
+        dates: Sequence[str],
+        hours: Sequence[int],
+        prefix: Optional[np.ndarray] = None,
+    ):
+        self.cube = cube
+        self.station_ids = [str(s) for s in station_ids]
+        self.station_names = list(station_names)
+        self.station_index: Dict[str, int] = {s: i for i, s in enumerate(self.station_ids)}
+        self.hours = list(hours)
+        self.hour_index: Dict[int, int] = {h: i for i, h in enumerate(self.hours)}
+
+        self._order, weekday = weekday_order(dates)
+        self._days = np.asarray(dates, dtype="datetime64[D]")[self._order]
+        self._group = np.searchsorted(weekday[self._order], np.arange(8))  # 요일 w = [_group[w], _group[w+1])
+
+        # 미리 만든 누적합 (메모리 매핑), 모양이 큐브와 맞지 않으면 사용하지 않음
+        expected = (cube.shape[1] + 1, cube.shape[0]) + tuple(cube.shape[2:])
+        if prefix is not None and tuple(prefix.shape) == expected:
+            self.__dict__["prefix"] = prefix
+
+    @cached_property
+    def prefix(self) -> np.ndarray:
+        """
+        (날짜 수 + 1, 역 수, 시간대 수, 2) int64 누적합, 날짜 축은 (요일, 날짜) 순
+        누적합 파일이 없으면 첫 조건 조회 때 메모리에서 한 번 계산
+        """
+        reordered = np.moveaxis(self.cube, 1, 0)[self._order]
+        prefix = np.zeros((reordered.shape[0] + 1,) + reordered.shape[1:], dtype=np.int64)
+        np.cumsum(reordered, axis=0, out=prefix[1:])
+        return prefix
+
+    @property
+    def first_date(self) -> date:
+        return self._days.min().item()
+
+    @property
+    def last_date(self) -> date:
+        return self._days.max().item()
+
+    def _date_ranges(self, selection: DayFilter) -> List[Tuple[np.datetime64, np.datetime64]]:
+        """조건의 날짜 구간 목록 [시작, 끝] (월 조건은 해마다 한 구간)"""
+        start = np.datetime64(selection.start or self.first_date, "D")
+        end = np.datetime64(selection.end or self.last_date, "D")
+        if not selection.months:
+            return [(start, end)] if start <= end else []
+
+        ranges = []
+        first_year = start.astype("datetime64[Y]").astype(int) + 1970
+        last_year = end.astype("datetime64[Y]").astype(int) + 1970
+        for year in range(first_year, last_year + 1):
+            for month in sorted(set(selection.months)):
+                month_start = np.datetime64(f"{year:04d}-{month:02d}", "M")
+                lo = max(start, month_start.astype("datetime64[D]"))
+                hi = min(end, (month_start + 1).astype("datetime64[D]") - 1)
+                if lo <= hi:
+                    ranges.append((lo, hi))
+        return ranges
+
+    def totals(self, selection: DayFilter, hour: Optional[int] = None) -> Tuple[np.ndarray, int]:
+        """
+        조건에 맞는 날짜들의 (역, 시간대, 2) 합계와 날짜 수
+        hour를 주면 그 시간대만 (역, 2), 큐브에 없는 시간대면 0
+        """
+        prefix = self.prefix
+        if hour is not None:
+            if hour not in self.hour_index:
+                return np.zeros((len(self.station_ids), 2), dtype=np.int64), 0
+            prefix = prefix[:, :, self.hour_index[hour]]
+
+        weekdays = sorted(set(selection.days_of_week)) if selection.days_of_week else range(7)
+        total = np.zeros(prefix.shape[1:], dtype=np.int64)
+        n_days = 0
+        for lo_date, hi_date in self._date_ranges(selection):
+            for w in weekdays:
+                group_start, group_end = self._group[w], self._group[w + 1]
+                group_days = self._days[group_start:group_end]
+                lo = group_start + np.searchsorted(group_days, lo_date, side="left")
+                hi = group_start + np.searchsorted(group_days, hi_date, side="right")
+                if hi > lo:
+                    total += prefix[hi] - prefix[lo]
+                    n_days += int(hi - lo)
+        return total, n_days
+
+    def averages(self, selection: DayFilter, hour: Optional[int] = None) -> Tuple[np.ndarray, int]:
+        """조건에 맞는 날짜들의 일평균 승하차와 날짜 수 (totals와 같은 모양)"""
+        total, n_days = self.totals(selection, hour)
+        return (total / n_days if n_days else np.zeros(total.shape)), n_days
+
+
+def main(argv=None):
+    """python -m core.ridership_cube build [region]: 큐브 옆에 누적합 파일 생성"""
+    from .partitions import DEFAULT_REGION, region_directory
+
+    argv = argv if argv is not None else sys.argv[1:]
+    if not argv or argv[0] != "build":
+        print("usage: python -m core.ridership_cube build [region]")
+        sys.exit(1)
+    directory = region_directory(argv[1] if len(argv) > 1 else DEFAULT_REGION)
+    cube_path = directory / CUBE_FILE
+    if not cube_path.exists():
+        print(f"{cube_path} not found (scripts/parse_voter_data.py)")
+        sys.exit(1)
+    with open(directory / INDEX_FILE, encoding="utf-8") as f:
+        dates = json.load(f)["dates"]
+    path = build_prefix_file(np.load(cube_path, mmap_mode="r"), dates, directory / PREFIX_FILE)
+    print(f"Prefix sums saved to {path} ({path.stat().st_size / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
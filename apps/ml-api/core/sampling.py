@@ -0,0 +1,246 @@
+"""
+Monte Carlo 표본 추출 전략
+분산 감소 기법 (antithetic, quasi-Monte Carlo, control variate)와
+요청 파라미터에 맞춘 수익률 / 현금흐름 경로 표본
+"""
+import warnings
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .return_models import DEFAULT_STD_RETURN, ReturnModel, get_return_model
+from .schemas import SimulationParams
+from .simulation import policy_mean, policy_path
+from .stochastic_paths import N_SHOCKS, DemographicUncertainty, scenario_cashflows
+
+
+SAMPLING_METHODS = ("pseudo", "antithetic", "sobol", "halton")
+
+# QMC 분산 추정을 위한 독립 스크램블 반복 수
+QMC_REPLICATES = 8
+
+
+def draw_standard_inputs(
+    n_paths: int,
+    n_years: int,
+    method: str = "pseudo",
+    rng: Optional[np.random.Generator] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    경로별 국면 결정용 균등난수와 표준정규난수 생성
+
+    Returns:
+        (uniforms, normals, groups)
+        - uniforms, normals: (n_paths × n_years)
+        - groups: 경로별 그룹 번호. 그룹 평균끼리는 서로 독립이므로
+          effective_sample_size 계산에 사용
+          (pseudo: 경로마다 1개, antithetic: 대칭 쌍, QMC: 스크램블 반복)
+    """
+    if method not in SAMPLING_METHODS:
+        raise ValueError(f"Unknown sampling method: {method}")
+    rng = rng or np.random.default_rng()
+
+    if method == "pseudo":
+        return (
+            rng.random((n_paths, n_years)),
+            rng.standard_normal((n_paths, n_years)),
+            np.arange(n_paths),
+        )
+
+    if method == "antithetic":
+        half = n_paths // 2
+        uniforms = rng.random((half, n_years))
+        normals = rng.standard_normal((half, n_years))
+        groups = np.arange(half)
+        # 홀수 개 요청 시 마지막 경로는 일반 표본
+        extra_u = rng.random((n_paths - 2 * half, n_years))
+        extra_z = rng.standard_normal((n_paths - 2 * half, n_years))
+        return (
+            np.concatenate([uniforms, 1.0 - uniforms, extra_u]),
+            np.concatenate([normals, -normals, extra_z]),
+            np.concatenate([groups, groups, np.arange(half, half + len(extra_u))]),
+        )
+
+    # Quasi-Monte Carlo: 독립 스크램블 시퀀스 여러 개로 분산 추정
+    from scipy.stats import qmc
+    from scipy.special import ndtri
+
+    engine_cls = qmc.Sobol if method == "sobol" else qmc.Halton
+    n_replicates = max(1, min(QMC_REPLICATES, n_paths // 2))
+    sizes = np.diff(np.linspace(0, n_paths, n_replicates + 1).astype(int))
+
+    points = []
+    for size in sizes:
+        engine = engine_cls(d=2 * n_years, scramble=True, seed=rng)
+        with warnings.catch_warnings():
+            # Sobol 균형 조건(2의 거듭제곱) 경고 무시
+            warnings.simplefilter("ignore", UserWarning)
+            points.append(engine.random(size))
+    u = np.clip(np.concatenate(points), 1e-12, 1 - 1e-12)
+
+    return u[:, :n_years], ndtri(u[:, n_years:]), np.repeat(np.arange(n_replicates), sizes)
+
+
+def effective_sample_size(values: np.ndarray, groups: np.ndarray) -> float:
+    """
+    평균 추정량 기준 유효 표본 수
+    ESS = Var(Y) / Var(추정량), 추정량 분산은 독립 그룹 평균의 분산으로 추정
+    """
+    values = np.asarray(values, dtype=float)
+    _, inverse, counts = np.unique(groups, return_inverse=True, return_counts=True)
+    n_groups = len(counts)
+    total_var = values.var(ddof=1) if len(values) > 1 else 0.0
+    if n_groups < 2 or total_var == 0:
+        return float(len(values))
+
+    group_means = np.bincount(inverse, weights=values) / counts
+    estimator_var = group_means.var(ddof=1) / n_groups
+    if estimator_var == 0:
+        return float(len(values))
+    return float(total_var / estimator_var)
+
+
+def interpolated_quantiles(
+    levels: np.ndarray,
+    counts: np.ndarray,
+    probabilities: np.ndarray,
+    censored_from: Optional[int] = None,
+) -> np.ndarray:
+    """
+    정수 값 (levels)별 개수에서 누적 비율 probabilities의 분위수
+    값 v의 표본은 [v, v + 1) 구간에 고르게 퍼진 것으로 보고 보간 (censored_from 이상 값은 한 점)
+    """
+    cumulative = np.cumsum(counts)
+    targets = np.asarray(probabilities, dtype=float) * cumulative[-1]
+    index = np.minimum(np.searchsorted(cumulative, targets, side="left"), len(levels) - 1)
+    below = cumulative[index] - counts[index]
+    fraction = np.clip((targets - below) / counts[index], 0.0, 1.0)
+    if censored_from is not None:
+        fraction[levels[index] >= censored_from] = 0.0
+    return levels[index] + fraction
+
+
+def quantile_margins(
+    values: np.ndarray,
+    percentiles: Tuple[float, ...],
+    z: float = 1.96,
+    censored_from: Optional[int] = None,
+) -> np.ndarray:
+    """
+    정수 값 표본 (고갈 연도) 백분위수 추정량의 신뢰구간 반폭 (백분위별)
+    분포 무관 순서통계량 구간: 누적 비율 q ± z·sqrt(q(1-q)/n) 위치의 보간 분위수
+    (보간으로 연속 추정량이 되어 경계 연도에서 0으로 무너지지 않고, 폭은 표본 수의 제곱근에 반비례)
+    경로가 독립이라고 가정하므로 antithetic / QMC 표본에는 보수적
+    """
+    levels, counts = np.unique(np.asarray(values), return_counts=True)
+    q = np.asarray(percentiles, dtype=float) / 100
+    delta = z * np.sqrt(q * (1 - q) / counts.sum())
+    lower = interpolated_quantiles(levels, counts, np.clip(q - delta, 0.0, 1.0), censored_from)
+    upper = interpolated_quantiles(levels, counts, np.clip(q + delta, 0.0, 1.0), censored_from)
+    return (upper - lower) / 2
+
+
+def apply_control_variate(
+    values: np.ndarray,
+    control: np.ndarray,
+    control_reference: np.ndarray,
+    base_sample_size: Optional[float] = None,
+) -> Tuple[float, float]:
+    """
+    Control variate 보정 평균
+
+    control: 경로별 통제변수 값
+    control_reference: 통제변수 기댓값 추정용 독립 보조 표본
+    base_sample_size: 보정 전 유효 표본 수 (없으면 len(values))
+
+    Returns:
+        (보정된 평균, 유효 표본 수)
+        보조 표본의 추정 오차까지 포함한 분산으로 계산
+    """
+    values = np.asarray(values, dtype=float)
+    control = np.asarray(control, dtype=float)
+    control_reference = np.asarray(control_reference, dtype=float)
+    base_sample_size = base_sample_size or float(len(values))
+
+    value_var = values.var(ddof=1) if len(values) > 1 else 0.0
+    control_var = control.var(ddof=1) if len(control) > 1 else 0.0
+    if value_var == 0 or control_var == 0:
+        return float(values.mean()), base_sample_size
+
+    cov = np.cov(values, control, ddof=1)[0, 1]
+    beta = cov / control_var
+    rho_sq = min(cov ** 2 / (value_var * control_var), 1.0)
+    adjusted_mean = values.mean() - beta * (control.mean() - control_reference.mean())
+
+    estimator_var = (
+        value_var / base_sample_size * (1.0 - rho_sq)
+        + beta ** 2 * control_reference.var(ddof=1) / len(control_reference)
+    )
+    if estimator_var <= 0:
+        return float(adjusted_mean), base_sample_size
+    return float(adjusted_mean), float(value_var / estimator_var)
+
+
+def default_model_name(regime_switching: bool) -> str:
+    """use_regime_switching 플래그에 대응하는 기존 모델 이름"""
+    return "regime_iid" if regime_switching else "normal"
+
+
+def resolve_return_model(
+    params: SimulationParams,
+    return_model: Optional[str],
+    use_regime_switching: bool,
+    std_return: float = DEFAULT_STD_RETURN,
+) -> ReturnModel:
+    """
+    요청 파라미터로 수익률 모델 생성 (이름이 없으면 use_regime_switching 기준, 모르는 이름이면 ValueError)
+    기금 수익률 일정이면 기간 평균으로 모델을 보정하고 연도별 편차만큼 평균을 이동
+    """
+    name = return_model or default_model_name(use_regime_switching)
+    mean_return = policy_mean(params, "fund_return_rate")
+    model = get_return_model(name, mean_return, std_return)
+    return model.with_offsets(policy_path(params, "fund_return_rate") - mean_return)
+
+
+def sample_return_paths(
+    n_paths: int,
+    n_years: int,
+    model: ReturnModel,
+    rng: Optional[np.random.Generator] = None,
+    sampling: str = "pseudo",
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    수익률 경로 행렬과 경로별 독립 그룹 번호 생성
+
+    sampling: pseudo | antithetic | sobol | halton
+    (QMC는 균등 점을 역누적분포로 변환하여 국면과 정규난수에 사용)
+    """
+    uniforms, normals, groups = draw_standard_inputs(n_paths, n_years, sampling, rng)
+    returns = model.sample(uniforms, normals) + model.offsets
+    return np.clip(returns, -0.30, 0.30), groups  # -30% ~ +30% 제한
+
+
+def resolve_demography(stochastic_demography: bool, correlation: float = 0.0) -> Optional[DemographicUncertainty]:
+    """요청 파라미터로 인구 / 임금 변동 설정 (확률 인구 모드가 아니면 None)"""
+    return DemographicUncertainty(return_correlation=correlation) if stochastic_demography else None
+
+
+def sample_cashflows(
+    params: SimulationParams,
+    returns: np.ndarray,
+    model: ReturnModel,
+    demography: Optional[DemographicUncertainty],
+    rng: Optional[np.random.Generator] = None,
+    sampling: str = "pseudo",
+) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """
+    수익률 경로와 짝을 이루는 경로별 보험료 수입 / 급여 지출 (demography가 None이면 결정론적, None 반환)
+    출산 / 사망 / 임금 충격은 수익률과 같은 표본 추출 방식으로 (3 × 연도 수) 차원을 한 번에 생성
+    """
+    if demography is None:
+        return None
+    n_paths, n_years = returns.shape
+    _, normals, _ = draw_standard_inputs(n_paths, N_SHOCKS * n_years, sampling, rng)
+    normals = normals.reshape(n_paths, N_SHOCKS, n_years).transpose(1, 0, 2)
+    return_shocks = (returns - model.mean_return - model.offsets) / model.std_return
+    return scenario_cashflows(params, normals, return_shocks, demography)
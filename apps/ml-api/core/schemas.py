@@ -1,16 +1,122 @@
 """Pydantic schemas for API"""
-from pydantic import BaseModel, Field
-from typing import Optional, List, Dict
+import math
+from bisect import bisect_right
+
+from pydantic import BaseModel, Field, PrivateAttr, model_validator
+from typing import Annotated, Any, Optional, List, Dict, Literal, Tuple, Union
+
+
+class SchedulePoint(BaseModel):
+    """정책 일정의 기준점 (해당 연도부터 적용되는 값)"""
+    year: int
+    value: float
+
+
+class PolicySchedule(BaseModel):
+    """
+    연도별 정책 변수 일정 (단계적 개혁)
+    - step: 기준점 연도부터 다음 기준점 전까지 같은 값
+    - linear: 기준점 사이 선형 보간
+    첫 기준점 이전은 첫 값, 마지막 기준점 이후는 마지막 값 유지
+    예: 보험료율 2025년 9% → 2033년 13% {"points": [{"year": 2025, "value": 0.09}, {"year": 2033, "value": 0.13}]}
+    """
+    points: List[SchedulePoint] = Field(..., min_length=1)
+    interpolation: Literal["step", "linear"] = "linear"
+    _expanded: Dict[Tuple[int, int, bool], Tuple[float, ...]] = PrivateAttr(default_factory=dict)
+
+    @model_validator(mode="after")
+    def check_points(self):
+        years = [point.year for point in self.points]
+        if any(a >= b for a, b in zip(years, years[1:])):
+            raise ValueError("schedule years must be strictly increasing")
+        return self
+
+    def value_at(self, year: int) -> float:
+        points = self.points
+        index = bisect_right([point.year for point in points], year)
+        if index == 0:
+            return points[0].value
+        if index == len(points) or self.interpolation == "step":
+            return points[index - 1].value
+        left, right = points[index - 1], points[index]
+        weight = (year - left.year) / (right.year - left.year)
+        return left.value + weight * (right.value - left.value)
+
+    def expand(self, start_year: int, end_year: int, integer: bool = False) -> Tuple[float, ...]:
+        """start_year~end_year 연도별 값 (기간별로 한 번만 계산), integer면 내림한 정수"""
+        key = (start_year, end_year, integer)
+        if key not in self._expanded:
+            values = [self.value_at(year) for year in range(start_year, end_year + 1)]
+            self._expanded[key] = tuple(math.floor(v + 1e-9) for v in values) if integer else tuple(values)
+        return self._expanded[key]
+
+    def shifted(self, delta: float) -> "PolicySchedule":
+        """모든 기준점 값에 delta를 더한 일정"""
+        return PolicySchedule(
+            points=[SchedulePoint(year=point.year, value=point.value + delta) for point in self.points],
+            interpolation=self.interpolation,
+        )
+
+
+# 정책 변수 입력 범위 (일정 값도 연도별로 같은 범위 적용)
+POLICY_BOUNDS = {
+    "contribution_rate": (0.05, 0.20),
+    "replacement_rate": (0.20, 0.60),
+    "pension_age": (60, 70),
+    "fund_return_rate": (0.01, 0.10),
+}
+
+
+def shift_policy(value: Union[float, PolicySchedule], delta: float) -> Union[float, PolicySchedule]:
+    """상수 또는 일정 정책 값에 delta를 더함 (일정은 모든 연도)"""
+    return value.shifted(delta) if isinstance(value, PolicySchedule) else value + delta
 
 
 class SimulationParams(BaseModel):
-    """시뮬레이션 입력 파라미터"""
-    contribution_rate: float = Field(0.09, ge=0.05, le=0.20, description="보험료율 (0.09 = 9%)")
-    replacement_rate: float = Field(0.40, ge=0.20, le=0.60, description="소득대체율 (0.40 = 40%)")
-    pension_age: int = Field(65, ge=60, le=70, description="수급 개시 연령")
-    fund_return_rate: float = Field(0.055, ge=0.01, le=0.10, description="기금 수익률 (0.055 = 5.5%)")
+    """
+    시뮬레이션 입력 파라미터
+    정책 변수 4개는 상수 또는 연도별 일정 (PolicySchedule), 일정은 검증 시점에 연도별 값으로 펼침
+    """
+    contribution_rate: Union[Annotated[float, Field(ge=0.05, le=0.20)], PolicySchedule] = Field(
+        0.09, description="보험료율 (0.09 = 9%) 또는 연도별 일정"
+    )
+    replacement_rate: Union[Annotated[float, Field(ge=0.20, le=0.60)], PolicySchedule] = Field(
+        0.40, description="소득대체율 (0.40 = 40%) 또는 연도별 일정"
+    )
+    pension_age: Union[Annotated[int, Field(ge=60, le=70)], PolicySchedule] = Field(
+        65, description="수급 개시 연령 또는 연도별 일정 (선형 보간은 정수로 내림)"
+    )
+    fund_return_rate: Union[Annotated[float, Field(ge=0.01, le=0.10)], PolicySchedule] = Field(
+        0.055, description="기금 수익률 (0.055 = 5.5%) 또는 연도별 일정"
+    )
     start_year: int = Field(2024, description="시작 연도")
     end_year: int = Field(2093, description="종료 연도")
+    fertility_rate: float = Field(1.08, ge=0.5, le=2.5, description="장기 합계출산율 (2050년 도달)")
+    mortality_improvement: float = Field(0.01, ge=0.0, le=0.03, description="연간 사망률 개선율")
+    net_migration: float = Field(50.0, ge=-200, le=500, description="연간 국제 순이동 (천명)")
+
+    @model_validator(mode="after")
+    def expand_schedules(self):
+        for name, (low, high) in POLICY_BOUNDS.items():
+            value = getattr(self, name)
+            if not isinstance(value, PolicySchedule):
+                continue
+            if name == "pension_age" and any(point.value != int(point.value) for point in value.points):
+                raise ValueError("pension_age schedule values must be integers")
+            for year, v in zip(range(self.start_year, self.end_year + 1), self.yearly(name)):
+                if not low <= v <= high:
+                    raise ValueError(f"{name} schedule value {v} in {year} is out of range [{low}, {high}]")
+        return self
+
+    def yearly(self, name: str) -> Union[float, Tuple[float, ...]]:
+        """정책 변수의 상수 값 또는 start_year~end_year 연도별 값"""
+        value = getattr(self, name)
+        if isinstance(value, PolicySchedule):
+            return value.expand(self.start_year, self.end_year, integer=name == "pension_age")
+        return value
+
+    def has_schedules(self) -> bool:
+        return any(isinstance(getattr(self, name), PolicySchedule) for name in POLICY_BOUNDS)
 
 
 class YearlyResult(BaseModel):
@@ -35,12 +141,53 @@ class SimulationResult(BaseModel):
     max_fund_balance: Optional[float] = None
 
 
+class SurrogateUsage(BaseModel):
+    """대리 모델 모드 사용 내역"""
+    version: str  # 모델 버전 (pickle sha1 앞 12자리)
+    tolerance: float  # 허용 오차 상한 (년)
+    served: int  # 대리 모델 예측으로 답한 시나리오 수
+    fallback: int  # 오차 상한 초과 / 대상 아님으로 정확한 시뮬레이션을 사용한 시나리오 수
+    max_error_bound: Optional[float] = None  # 대리 모델로 답한 시나리오의 최대 오차 상한 (년)
+
+
+class SurrogatePrediction(BaseModel):
+    """대리 모델 고갈 연도 예측"""
+    depletion_year: int  # 응답 값 (대리 모델 반올림 또는 정확한 시뮬레이션, 미고갈 end_year + 1)
+    predicted_year: Optional[float] = None  # 대리 모델 예측 (대상이 아니면 None)
+    error_bound: Optional[float] = None  # 영역별 보류 오차 상한 (년, 없으면 None)
+    source: Literal["surrogate", "simulation"]
+    version: str
+
+
 class ShapResult(BaseModel):
     """SHAP 분석 결과"""
     feature_importance: Dict[str, float]
     feature_effects: Dict[str, float]  # 각 변수가 고갈연도에 미치는 영향 (년)
     base_depletion_year: int
     current_depletion_year: int
+    marginal_effects: Optional[Dict[str, float]] = None  # 연속 고갈 시점 미분 × 단위 변화 (년, 고갈되지 않으면 None)
+    surrogate: Optional[SurrogateUsage] = None  # 대리 모델 모드일 때 사용 내역
+
+
+class FundGradients(BaseModel):
+    """
+    기금 궤적의 정책 변수 미분 (forward-mode, 변수 1단위당)
+    보험료율 / 소득대체율 / 기금 수익률은 1.0 (= 100%p), 수급 연령은 1세, 일정은 모든 연도를 같이 이동
+    """
+    depletion_year: Optional[int] = None
+    depletion_time: Optional[float] = None  # 연속 고갈 시점 (올림하면 depletion_year)
+    depletion_time_gradient: Optional[Dict[str, float]] = None  # 변수별 d고갈시점 / d변수 (년)
+    years: List[int]
+    fund_balance: List[float]  # 연말 기금 잔액 (조원, 고갈 후 0에서 다시 누적)
+    fund_balance_gradient: Dict[str, List[float]]  # 변수별 연도별 d잔액 / d변수 (조원)
+
+
+class FundBands(BaseModel):
+    """연도별 기금 잔액 분포 (팬 차트)"""
+    years: List[int]
+    percentiles: Dict[str, List[float]]  # p5 | p25 | p50 | p75 | p95 → 연도별 기금 잔액 (조원, 고갈 후 0)
+    survival: List[float]  # 연도별 P(해당 연도 말 기금 > 0)
+    sketch_size: int  # KLL 스케치 크기 k (분위수 순위 오차 약 1.7 / k)
 
 
 class MonteCarloResult(BaseModel):
@@ -52,6 +199,92 @@ class MonteCarloResult(BaseModel):
     ci_50_upper: int
     distribution: List[int]  # 히스토그램용 데이터
     n_simulations: int
+    mean_depletion_year: Optional[float] = None
+    sampling: str = "pseudo"  # pseudo | antithetic | sobol | halton
+    return_model: Optional[str] = None  # core.return_models 레지스트리 이름
+    control_variate: bool = False
+    effective_sample_size: Optional[float] = None  # 평균 추정 정밀도 기준 유효 표본 수
+    stochastic_demography: bool = False  # 출산 / 사망 / 임금 경로도 확률적으로 생성했는지 여부
+    histogram_bin_years: int = 5  # distribution 구간 폭 (년)
+    fund_bands: Optional[FundBands] = None
+
+
+class MonteCarloProgress(MonteCarloResult):
+    """스트리밍 Monte Carlo 중간 결과 (배치 단위 누적)"""
+    batch: int
+    ci_90_width: float
+    ci_50_width: float
+    histogram_start: int  # 첫 히스토그램 구간 시작 연도 (histogram_bin_years 단위)
+    convergence_margin: Optional[float] = None  # 중앙값 / 구간 폭 추정량 오차 범위 최댓값 (년, tolerance > 0일 때)
+    converged: bool = False
+    done: bool = False
+
+
+SensitivityParameter = Literal["contribution_rate", "replacement_rate", "pension_age", "fund_return_rate"]
+
+
+class ParameterRange(BaseModel):
+    """민감도 분석 변수 범위 [low, high] (pension_age는 정수 연령 low~high 균등)"""
+    low: float
+    high: float
+
+    @model_validator(mode="after")
+    def check_order(self):
+        if self.low > self.high:
+            raise ValueError("low must not exceed high")
+        return self
+
+
+# 대리 모델 학습 시나리오와 같은 범위
+DEFAULT_SENSITIVITY_RANGES = {
+    "contribution_rate": ParameterRange(low=0.09, high=0.15),
+    "replacement_rate": ParameterRange(low=0.35, high=0.50),
+    "pension_age": ParameterRange(low=63, high=69),
+    "fund_return_rate": ParameterRange(low=0.03, high=0.08),
+}
+
+
+class SobolRequest(BaseModel):
+    """Sobol 민감도 분석 요청"""
+    params: SimulationParams = Field(default_factory=SimulationParams, description="범위를 주지 않은 변수, 기간, 인구 가정")
+    ranges: Dict[SensitivityParameter, ParameterRange] = Field(
+        default_factory=lambda: dict(DEFAULT_SENSITIVITY_RANGES), min_length=1,
+    )
+    n_samples: int = Field(1024, ge=64, le=16384, description="기본 표본 수 N (평가 수 N × (변수 수 + 2))")
+    sampling: Literal["sobol", "pseudo"] = "sobol"
+    n_bootstrap: int = Field(200, ge=10, le=2000, description="신뢰구간 bootstrap 반복 수")
+    confidence: float = Field(0.95, gt=0.5, lt=1.0)
+    seed: Optional[int] = Field(None, ge=0)
+    workers: int = Field(1, ge=1, le=8, description="평가 청크 병렬 스레드 수")
+
+    @model_validator(mode="after")
+    def check_ranges(self):
+        # 범위 양 끝이 SimulationParams 입력 범위 안인지 확인
+        for name, bounds in self.ranges.items():
+            for value in (bounds.low, bounds.high):
+                if name == "pension_age" and value != int(value):
+                    raise ValueError("pension_age range must be integers")
+                self.params.model_validate({**self.params.model_dump(), name: int(value) if name == "pension_age" else value})
+        return self
+
+
+class SobolIndex(BaseModel):
+    """변수 하나의 Sobol 지수와 bootstrap 신뢰구간"""
+    first_order: float
+    first_order_ci: List[float]
+    total: float
+    total_ci: List[float]
+
+
+class SobolResult(BaseModel):
+    """Sobol 민감도 분석 결과"""
+    indices: Dict[str, Dict[str, SobolIndex]]  # 출력 (depletion_year | equity_index) → 변수 → 지수
+    variance: Dict[str, float]  # 출력별 분산
+    parameters: List[str]
+    n_samples: int
+    n_evaluations: int
+    sampling: str
+    confidence: float
 
 
 class GenerationData(BaseModel):
@@ -71,3 +304,38 @@ class GenerationAnalysisResult(BaseModel):
     generations: List[GenerationData]
     clusters: Dict[int, str]  # cluster_id -> cluster_name
     equity_index: float  # 세대간 형평성 지수 (0~1, 1이 가장 공평)
+
+
+class CohortRoiDistribution(BaseModel):
+    """세대별 수익비 분포 (Monte Carlo 수익률 경로별 고갈 연도 기준)"""
+    birth_year: int
+    roi_mean: float
+    roi_percentiles: Dict[str, float]  # p5 | p25 | p50 | p75 | p95
+    roi_spread: float  # 90% 구간 폭 (p95 - p5)
+    reduction_probability: float  # 기금 소진으로 급여가 줄어드는 (은퇴 전 / 수급 중 소진) 경로 비율
+
+
+class StochasticGenerationResult(BaseModel):
+    """확률적 수익률 하의 세대별 분석 결과"""
+    cohorts: List[CohortRoiDistribution]
+    equity_index_mean: float
+    equity_index_percentiles: Dict[str, float]  # p5 | p25 | p50 | p75 | p95
+    depletion_probability: float  # 시뮬레이션 기간 안에 기금이 고갈되는 경로 비율
+    highest_risk_birth_year: int  # roi_spread가 가장 큰 (수익률 위험을 가장 많이 지는) 세대
+    n_simulations: int
+    sampling: str = "pseudo"
+    return_model: Optional[str] = None
+    stochastic_demography: bool = False
+
+
+class JobStatus(BaseModel):
+    """비동기 작업 상태"""
+    job_id: str
+    kind: str  # monte-carlo | scenarios | retrain
+    status: str  # queued | running | succeeded | failed
+    created_at: float  # Unix time
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    deduplicated: bool = False  # 실행 중인 동일 작업에 합류했는지 여부
+    result: Optional[Any] = None
+    error: Optional[str] = None
@@ -0,0 +1,105 @@
+"""
+응답 직렬화
+- orjson 기반 기본 JSON 응답
+- Accept 헤더에 따른 msgpack 응답
+- 필드별 배열(columnar) 레이아웃
+서버가 생성하거나 검증된 파일에서 읽은 데이터는 response_model 재검증 없이 바로 직렬화
+"""
+import json
+from typing import Any, Iterable, Optional, Sequence
+
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+
+try:
+    import orjson
+except ImportError:  # orjson 미설치 시 표준 json
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack", "application/vnd.msgpack")
+LAYOUTS = ("rows", "columnar")
+
+
+class ORJSONResponse(JSONResponse):
+    """orjson 기반 JSON 응답 (numpy 배열/스칼라 직접 직렬화)"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+
+
+DefaultResponse = ORJSONResponse if orjson is not None else JSONResponse
+
+
+def json_loads(data: bytes | str) -> Any:
+    """JSON 파싱 (orjson 우선)"""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+class MsgpackResponse(Response):
+    """application/msgpack 응답"""
+    media_type = "application/msgpack"
+
+    def render(self, content: Any) -> bytes:
+        return msgpack.packb(content, use_bin_type=True)
+
+
+def wants_msgpack(request: Request) -> bool:
+    """Accept 헤더가 msgpack을 요청하는지 확인 (msgpack 미설치 시 항상 False)"""
+    if msgpack is None:
+        return False
+    accept = request.headers.get("accept", "")
+    return any(media_type in accept for media_type in MSGPACK_MEDIA_TYPES)
+
+
+def to_columnar(rows: Sequence[dict], fields: Optional[Iterable[str]] = None) -> dict:
+    """
+    행 목록을 필드별 배열로 변환
+    [{"a": 1, "b": 2}, {"a": 3, "b": 4}] -> {"a": [1, 3], "b": [2, 4]}
+    """
+    if fields is None:
+        fields = list(rows[0].keys()) if rows else []
+    return {field: [row.get(field) for row in rows] for field in fields}
+
+
+def negotiated_response(
+    request: Request,
+    content: Any,
+    layout: str = "rows",
+    fields: Optional[Iterable[str]] = None,
+) -> Response:
+    """
+    요청에 맞는 인코딩/레이아웃으로 응답 생성
+
+    - Accept: application/msgpack → msgpack, 그 외 JSON
+    - layout=columnar → 행 목록을 필드별 배열로 변환 (content가 list일 때)
+    반환된 Response는 FastAPI response_model 검증을 거치지 않음
+    """
+    if layout == "columnar" and isinstance(content, list):
+        content = to_columnar(content, fields)
+
+    if wants_msgpack(request):
+        return MsgpackResponse(content)
+    return DefaultResponse(content)
+
+
+def add_compression_middleware(app, minimum_size: int = 1000) -> str:
+    """
+    응답 압축 미들웨어 등록
+    brotli-asgi가 설치되어 있으면 brotli (gzip 대체 지원), 아니면 gzip
+
+    Returns: 등록된 압축 방식 이름
+    """
+    try:
+        from brotli_asgi import BrotliMiddleware
+        app.add_middleware(BrotliMiddleware, minimum_size=minimum_size, gzip_fallback=True)
+        return "br"
+    except ImportError:
+        from fastapi.middleware.gzip import GZipMiddleware
+        app.add_middleware(GZipMiddleware, minimum_size=minimum_size)
+        return "gzip"
@@ -1,142 +1,347 @@
 """
 시뮬레이션 핵심 로직
-JS 버전과 동일한 로직을 Python으로 구현
+재정 수지 계산은 JS 버전(packages/core)과 같고, 인구는 코호트 요인법 추계 (core.demography)를 사용
 """
 import numpy as np
-from typing import Tuple, Dict, List, Optional
+from functools import lru_cache
+from typing import Tuple, Dict, List, Optional, Sequence
+from .demography import BASELINE, DEFAULT_HORIZON, PROJECTIONS, DemographicAssumptions, pension_population
+from .instrumentation import timed
+from .kernels import fund_recursion
 from .schemas import SimulationParams, SimulationResult, YearlyResult
 
+# 스냅샷 추계 테이블의 인구 모델 (바뀌면 이전 스냅샷의 테이블은 사용하지 않음)
+POPULATION_MODEL = "cohort-component-v2"
+
 
 INITIAL_FUND_BALANCE = 1036  # 조원 (2024년 기준)
 AVERAGE_CONTRIBUTION_YEARS = 25
+AVERAGE_INCOME = 4200  # 만원 (2024년 기준)
+WAGE_GROWTH = 0.02
+
+
+def demographic_assumptions(params: SimulationParams) -> DemographicAssumptions:
+    """시뮬레이션 파라미터의 인구 추계 가정 (추계 캐시 키)"""
+    return DemographicAssumptions(
+        total_fertility_rate=params.fertility_rate,
+        mortality_improvement=params.mortality_improvement,
+        net_migration=params.net_migration,
+    )
+
+
+def policy_path(params: SimulationParams, name: str) -> np.ndarray:
+    """
+    정책 변수의 연도별 값: 상수면 0차원 배열, 일정이면 (연도 수,) 배열 (검증 시점에 펼친 값)
+    어느 쪽이든 (연도,) / (경로 수 × 연도 수) 행렬과 그대로 브로드캐스트
+    """
+    return np.asarray(params.yearly(name))
+
 
+def policy_mean(params: SimulationParams, name: str) -> float:
+    """정책 변수의 기간 평균 (상수면 그 값)"""
+    return float(np.mean(policy_path(params, name)))
 
-def get_population_estimates(year: int, pension_age: int = 65) -> Dict[str, float]:
+
+def get_population_estimates(
+    year: int,
+    pension_age: int = 65,
+    assumptions: DemographicAssumptions = BASELINE,
+) -> Dict[str, float]:
     """
     인구 추정 함수
-    통계청 장래인구추계(2022) 기반 간소화 모델
+    코호트 요인법 추계 (core.demography)의 해당 연도 값
+    가입자는 18~59세 인구 × 가입률, 수급자는 수급 개시 연령 이상 인구 × 수급률
     """
-    year_diff = year - 2024
+    estimates = pension_population(pension_age, year, year, assumptions)
+    return {name: float(values[0]) for name, values in estimates.items()}
 
-    # 생산가능인구 (15-64세): 2024년 3,600만명 → 2070년 1,700만명
-    if year_diff <= 10:
-        working_age_pop = 36000 - year_diff * 150
-    elif year_diff <= 30:
-        working_age_pop = 34500 - (year_diff - 10) * 400
-    else:
-        working_age_pop = 26500 - (year_diff - 30) * 200
-    working_age_pop = max(working_age_pop, 17000)
-
-    # 고령인구 (65세 이상)
-    if year_diff <= 10:
-        elderly_pop = 9500 + year_diff * 350
-    elif year_diff <= 25:
-        elderly_pop = 13000 + (year_diff - 10) * 400
-    else:
-        elderly_pop = 19000 + (year_diff - 25) * 50
-    elderly_pop = min(elderly_pop, 20000)
-
-    # 국민연금 가입자
-    participation_rate = max(0.50, 0.58 - year_diff * 0.001)
-    contributors = working_age_pop * participation_rate
-
-    # 수급자
-    pension_age_effect = (pension_age - 65) * 0.04
-    if year_diff <= 0:
-        beneficiary_rate = 0.70
-    elif year_diff <= 10:
-        beneficiary_rate = 0.70 + (year_diff * 0.015)
-    elif year_diff <= 25:
-        beneficiary_rate = 0.85 + ((year_diff - 10) * 0.003)
+
+@lru_cache(maxsize=256)
+def population_projection(
+    pension_age: int,
+    start_year: int,
+    end_year: int,
+    assumptions: DemographicAssumptions = BASELINE,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    연도별 가입자 수, 수급자 수 (천명)
+    기본 가정이면 시작 스냅샷의 추계 테이블을 사용하고, 없으면 계산 후 캐시 (읽기 전용)
+    """
+    from .snapshot import get_snapshot, PROJECTION_PENSION_AGES, PROJECTION_YEARS
+
+    snapshot = get_snapshot()
+    if (
+        assumptions == BASELINE
+        and snapshot is not None
+        and snapshot.meta.get("population_model") == POPULATION_MODEL
+        and snapshot.has_array("projection/contributors")
+        and pension_age in PROJECTION_PENSION_AGES
+        and start_year in PROJECTION_YEARS
+        and end_year in PROJECTION_YEARS
+    ):
+        row = pension_age - PROJECTION_PENSION_AGES.start
+        cols = slice(start_year - PROJECTION_YEARS.start, end_year - PROJECTION_YEARS.start + 1)
+        contributors = np.array(snapshot.array("projection/contributors")[cols])
+        beneficiaries = np.array(snapshot.array("projection/beneficiaries")[row, cols])
     else:
-        beneficiary_rate = 0.90
-    beneficiary_rate = max(0, beneficiary_rate - pension_age_effect)
+        estimates = pension_population(pension_age, start_year, end_year, assumptions)
+        contributors = estimates["contributors"]
+        beneficiaries = estimates["beneficiaries"]
 
-    beneficiaries = elderly_pop * beneficiary_rate
+    contributors.flags.writeable = False
+    beneficiaries.flags.writeable = False
+    return contributors, beneficiaries
 
-    return {
-        "working_age_pop": working_age_pop,
-        "elderly_pop": elderly_pop,
-        "contributors": contributors,
-        "beneficiaries": beneficiaries,
-    }
 
+def policy_population(params: SimulationParams) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    연도별 가입자 수, 수급자 수 (천명)
+    수급 연령 일정이면 연도마다 그 해 수급 연령의 추계 값 사용 (연령별 추계는 population_projection 캐시)
+    """
+    ages = policy_path(params, "pension_age")
+    assumptions = demographic_assumptions(params)
+    if ages.ndim == 0:
+        return population_projection(int(ages), params.start_year, params.end_year, assumptions)
 
-def run_simulation(params: SimulationParams) -> SimulationResult:
+    unique, index = np.unique(ages, return_inverse=True)
+    projections = [
+        population_projection(int(age), params.start_year, params.end_year, assumptions) for age in unique
+    ]
+    beneficiaries = np.stack([b for _, b in projections])[index.reshape(-1), np.arange(len(ages))]
+    return projections[0][0], beneficiaries
+
+
+def warm_projections(params_list: Sequence[SimulationParams]) -> None:
+    """여러 시나리오의 인구 추계 가정 중 캐시에 없는 것들을 한 번에 (시나리오 축 벡터화) 추계"""
+    end_year = max((params.end_year for params in params_list), default=DEFAULT_HORIZON)
+    PROJECTIONS.get_many({demographic_assumptions(params) for params in params_list}, end_year)
+
+
+def cashflows(
+    params: SimulationParams,
+    contributors: np.ndarray,
+    beneficiaries: np.ndarray,
+    wage_index: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
     """
-    연금 재정 시뮬레이션 실행
+    가입자 / 수급자 수 (천명)와 2024년 대비 평균소득 배율로 보험료 수입과 급여 지출 (조원) 계산
+    (연도,) 또는 (경로 수 × 연도 수) 배열 모두 가능, 일정 정책 변수는 연도 축으로 브로드캐스트
     """
-    yearly_results: List[YearlyResult] = []
-    fund_balance = INITIAL_FUND_BALANCE
-    deficit_year: Optional[int] = None
-    depletion_year: Optional[int] = None
-    max_fund_balance = fund_balance
-    max_fund_year = params.start_year
-
-    for year in range(params.start_year, params.end_year + 1):
-        year_diff = year - 2024
-
-        # 인구 추정
-        pop = get_population_estimates(year, params.pension_age)
-        contributors = pop["contributors"]
-        beneficiaries = pop["beneficiaries"]
-
-        # 경제 지표 추정
-        average_income = 4200 * (1.02 ** year_diff)  # 만원
-
-        # 보험료 수입 (조원)
-        contribution_income = (
-            (contributors * 1000) *  # 천명 → 명
-            (average_income * 10000) *  # 만원 → 원
-            params.contribution_rate /
-            1e12  # 원 → 조원
-        )
+    average_income = AVERAGE_INCOME * wage_index  # 만원
+
+    # 보험료 수입 (조원): 천명 → 명, 만원 → 원, 원 → 조원
+    contribution_rate = policy_path(params, "contribution_rate")
+    contribution_income = (contributors * 1000) * (average_income * 10000) * contribution_rate / 1e12
 
-        # 급여 지출 (조원)
-        average_pension = (
-            average_income * 10000 *
-            params.replacement_rate *
-            (AVERAGE_CONTRIBUTION_YEARS / 40)
+    # 급여 지출 (조원)
+    replacement_rate = policy_path(params, "replacement_rate")
+    average_pension = average_income * 10000 * replacement_rate * (AVERAGE_CONTRIBUTION_YEARS / 40)
+    benefit_expenditure = (beneficiaries * 1000) * average_pension / 1e12
+
+    return contribution_income, benefit_expenditure
+
+
+def project_cashflows(params: SimulationParams) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    연도별 보험료 수입과 급여 지출 (조원) 계산
+    기금 수익률과 무관하므로 Monte Carlo 경로 간에 한 번만 계산해 공유
+    """
+    contributors, beneficiaries = policy_population(params)
+    year_diff = np.arange(params.start_year, params.end_year + 1) - 2024
+    return cashflows(params, contributors, beneficiaries, (1 + WAGE_GROWTH) ** year_diff)
+
+
+@timed()
+def simulate_depletion_years(
+    params: SimulationParams,
+    returns: np.ndarray,
+    flows: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+    balances: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    수익률 경로 행렬 (경로 수 × 연도 수)에 대한 고갈 연도 계산
+    연도 방향 점화식은 core.kernels 백엔드 (numpy / numba)
+    고갈되지 않은 경로는 end_year + 1
+    flows: 경로별 (경로 수 × 연도 수) 보험료 수입 / 급여 지출 (없으면 결정론적 project_cashflows)
+    balances: 주면 (경로 수 × 연도 수) 연말 기금 잔액을 기록
+    """
+    contribution_income, benefit_expenditure = flows if flows is not None else project_cashflows(params)
+    depletion = fund_recursion(
+        contribution_income, benefit_expenditure, np.atleast_2d(returns), INITIAL_FUND_BALANCE, balances
+    )
+    return params.start_year + depletion
+
+
+def _period_batches(params_list: Sequence[SimulationParams]):
+    """
+    시뮬레이션 기간이 같은 시나리오끼리 묶어
+    (시나리오 번호, 보험료 수입, 급여 지출, 기금 수익률) 행렬을 차례로 반환
+    """
+    warm_projections(params_list)
+    periods: Dict[Tuple[int, int], List[int]] = {}
+    for index, params in enumerate(params_list):
+        periods.setdefault((params.start_year, params.end_year), []).append(index)
+
+    for (start_year, end_year), indices in periods.items():
+        flows = [project_cashflows(params_list[i]) for i in indices]
+        contribution_income = np.stack([income for income, _ in flows])
+        benefit_expenditure = np.stack([expenditure for _, expenditure in flows])
+        n_years = end_year - start_year + 1
+        if any(params_list[i].has_schedules() for i in indices):
+            return_rates = np.stack([
+                np.broadcast_to(policy_path(params_list[i], "fund_return_rate"), n_years) for i in indices
+            ])
+        else:
+            return_rates = np.array([params_list[i].fund_return_rate for i in indices])[:, np.newaxis]
+        yield indices, contribution_income, benefit_expenditure, return_rates
+
+
+@timed()
+def batch_depletion_years(params_list: Sequence[SimulationParams]) -> np.ndarray:
+    """
+    서로 다른 파라미터 조합들의 고정 수익률 고갈 연도 (run_simulation_simple과 동일한 값)
+    시뮬레이션 기간이 같은 시나리오끼리 (시나리오 수 × 연도 수) 행렬로 한 번에 계산
+    """
+    depletion_years = np.empty(len(params_list), dtype=np.int64)
+    for indices, contribution_income, benefit_expenditure, return_rates in _period_batches(params_list):
+        start_year = params_list[indices[0]].start_year
+        years = start_year + fund_recursion(
+            contribution_income, benefit_expenditure, return_rates, INITIAL_FUND_BALANCE
         )
-        benefit_expenditure = (
-            (beneficiaries * 1000) *
-            average_pension /
-            1e12
+        depletion_years[indices] = years
+
+    return depletion_years
+
+
+@timed()
+def batch_fund_summaries(params_list: Sequence[SimulationParams]) -> List[dict]:
+    """
+    시나리오별 적자 전환 / 고갈 / 최대 적립금 연도와 최대 적립금 (run_simulation 결과와 동일한 값)
+    batch_depletion_years처럼 기간이 같은 시나리오끼리 행렬로 계산하고, 연도별 결과는 만들지 않음
+    """
+    summaries: List[Optional[dict]] = [None] * len(params_list)
+    for indices, contribution_income, benefit_expenditure, return_rates in _period_batches(params_list):
+        start_year = params_list[indices[0]].start_year
+        fund_balance = np.empty_like(contribution_income)
+        investment_income = np.empty_like(contribution_income)
+        depletion = fund_recursion(
+            contribution_income, benefit_expenditure, return_rates,
+            INITIAL_FUND_BALANCE, fund_balance, investment_income,
         )
+        n_years = fund_balance.shape[1]
+        deficit = contribution_income + investment_income - benefit_expenditure < 0
+        has_deficit = deficit.any(axis=1)
+        first_deficit = deficit.argmax(axis=1)
+        peak = fund_balance.argmax(axis=1)
+        peak_balance = fund_balance[np.arange(len(indices)), peak]
+        for row, index in enumerate(indices):
+            grew = peak_balance[row] > INITIAL_FUND_BALANCE
+            summaries[index] = {
+                "deficit_year": start_year + int(first_deficit[row]) if has_deficit[row] else None,
+                "depletion_year": start_year + int(depletion[row]) if depletion[row] < n_years else None,
+                "max_fund_year": start_year + int(peak[row]) if grew else start_year,
+                "max_fund_balance": round(float(peak_balance[row] if grew else INITIAL_FUND_BALANCE) * 10) / 10,
+            }
+
+    return summaries
 
-        # 기금 운용 수익
-        investment_income = fund_balance * params.fund_return_rate if fund_balance > 0 else 0
 
-        # 수지 차액
-        net_balance = contribution_income + investment_income - benefit_expenditure
+@timed()
+def policy_depletion_years(
+    base: SimulationParams,
+    contribution_rate: np.ndarray,
+    replacement_rate: np.ndarray,
+    pension_age: np.ndarray,
+    fund_return_rate: np.ndarray,
+) -> np.ndarray:
+    """
+    정책 변수 4개만 다른 시나리오들의 고정 수익률 고갈 연도 (batch_depletion_years와 동일한 값)
+    나머지 설정 (기간, 인구 가정)은 base 공유, 입력은 시나리오별 (시나리오 수,) 상수 또는
+    (시나리오 수 × 연도 수) 연도별 값
+
+    보험료 수입 / 급여 지출은 보험료율 / 소득대체율에 비례하므로 수급 연령별 단위 현금흐름만
+    계산하고, SimulationParams 생성 없이 (시나리오 수 × 연도 수) 행렬로 한 번에 계산
+    """
+    pension_age = np.asarray(pension_age, dtype=np.int64)
+    ages, age_index = np.unique(pension_age, return_inverse=True)
+    age_index = age_index.reshape(pension_age.shape)
+    unit = [
+        project_cashflows(base.model_copy(update={
+            "pension_age": int(age), "contribution_rate": 1.0, "replacement_rate": 1.0,
+        }))
+        for age in ages
+    ]
+    # 연도별 수급 연령이면 (시나리오, 연도)마다 해당 연령의 단위 현금흐름 선택
+    rows = (age_index,) if age_index.ndim == 1 else (age_index, np.arange(age_index.shape[1]))
+    unit_income = np.stack([income for income, _ in unit])[rows]
+    unit_expenditure = np.stack([expenditure for _, expenditure in unit])[rows]
+    contribution_income = unit_income * scenario_rows(contribution_rate)
+    benefit_expenditure = unit_expenditure * scenario_rows(replacement_rate)
+    return base.start_year + fund_recursion(
+        contribution_income, benefit_expenditure, scenario_rows(fund_return_rate), INITIAL_FUND_BALANCE
+    )
+
 
-        # 기금 잔액 업데이트
-        fund_balance += net_balance
+def scenario_rows(values: np.ndarray) -> np.ndarray:
+    """시나리오별 상수 (시나리오 수,)는 (시나리오 수, 1) 열로, 2차원 (시나리오 수, 연도 / 세대 수) 값은 그대로"""
+    values = np.asarray(values, dtype=float)
+    return values[:, np.newaxis] if values.ndim == 1 else values
 
-        # 최대 기금 추적
-        if fund_balance > max_fund_balance:
-            max_fund_balance = fund_balance
-            max_fund_year = year
 
-        # 적자/소진 체크
-        if net_balance < 0 and deficit_year is None:
-            deficit_year = year
-        if fund_balance <= 0 and depletion_year is None:
-            depletion_year = year
-            fund_balance = 0
+@timed()
+def run_simulation(params: SimulationParams) -> SimulationResult:
+    """
+    연금 재정 시뮬레이션 실행
+    """
+    # 인구 추계 (코호트 요인법, 가정 조합별 캐시)
+    contributors_by_year, beneficiaries_by_year = policy_population(params)
+    contribution_income, benefit_expenditure = project_cashflows(params)
 
-        yearly_results.append(YearlyResult(
+    # 기금 잔액 / 운용 수익 (첫 고갈 연도에 잔액 0으로 조정)
+    n_years = params.end_year - params.start_year + 1
+    fund_balance = np.empty((1, n_years))
+    investment_income = np.empty((1, n_years))
+    depletion = int(fund_recursion(
+        contribution_income, benefit_expenditure, np.atleast_2d(policy_path(params, "fund_return_rate")),
+        INITIAL_FUND_BALANCE, fund_balance, investment_income,
+    )[0])
+    fund_balance, investment_income = fund_balance[0], investment_income[0]
+
+    # 수지 차액
+    net_balance = contribution_income + investment_income - benefit_expenditure
+
+    years = np.arange(params.start_year, params.end_year + 1)
+    deficits = np.flatnonzero(net_balance < 0)
+    deficit_year = int(years[deficits[0]]) if len(deficits) else None
+    depletion_year = int(years[depletion]) if depletion < n_years else None
+
+    # 최대 기금 (초기 잔액보다 커진 첫 최대 연도)
+    peak = int(np.argmax(fund_balance))
+    if fund_balance[peak] > INITIAL_FUND_BALANCE:
+        max_fund_balance, max_fund_year = float(fund_balance[peak]), int(years[peak])
+    else:
+        max_fund_balance, max_fund_year = float(INITIAL_FUND_BALANCE), params.start_year
+
+    # 서버에서 계산한 값이므로 검증 생략 (model_construct)
+    yearly_results: List[YearlyResult] = [
+        YearlyResult.model_construct(
             year=year,
             contributors=round(contributors),
             beneficiaries=round(beneficiaries),
-            contribution_income=round(contribution_income * 10) / 10,
-            benefit_expenditure=round(benefit_expenditure * 10) / 10,
-            investment_income=round(investment_income * 10) / 10,
-            fund_balance=round(fund_balance * 10) / 10,
-            net_balance=round(net_balance * 10) / 10,
-        ))
-
-    return SimulationResult(
+            contribution_income=round(income * 10) / 10,
+            benefit_expenditure=round(expenditure * 10) / 10,
+            investment_income=round(investment * 10) / 10,
+            fund_balance=round(balance * 10) / 10,
+            net_balance=round(net * 10) / 10,
+        )
+        for year, contributors, beneficiaries, income, expenditure, investment, balance, net in zip(
+            years.tolist(), np.asarray(contributors_by_year).tolist(), np.asarray(beneficiaries_by_year).tolist(),
+            contribution_income.tolist(), benefit_expenditure.tolist(), investment_income.tolist(),
+            fund_balance.tolist(), net_balance.tolist(),
+        )
+    ]
+
+    return SimulationResult.model_construct(
         params=params,
         yearly_results=yearly_results,
         deficit_year=deficit_year,
@@ -0,0 +1,144 @@
+"""
+스트리밍 분위수 스케치
+Monte Carlo 경로를 배치 단위로 받아 연도별 기금 잔액 분포를 O(연도 수) 메모리로 요약
+(경로 수와 무관), 병렬 샤드에서 만든 스케치는 merge로 합침
+
+- QuantileSketch: 여러 열(연도)의 KLL 스케치. 모든 열이 같은 개수의 값을 받으므로 레벨 구조를 공유하고
+  레벨마다 (열 수 × 항목 수) 배열 하나로 저장해 압축 / 조회를 열 방향으로 벡터화
+- FundBandAccumulator: 연도별 기금 잔액 스케치 + 생존 경로 수 (정확한 값)
+"""
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from .schemas import FundBands
+
+DEFAULT_SKETCH_SIZE = 200  # KLL k (순위 오차 약 1.7 / k)
+BAND_PERCENTILES = (5, 25, 50, 75, 95)
+
+# 레벨별 용량 감소율 (KLL 기본값)
+_CAPACITY_DECAY = 2 / 3
+
+
+class QuantileSketch:
+    """
+    KLL 분위수 스케치 (열마다 독립 스트림, 열 수만큼 함께 갱신)
+    레벨 h의 항목은 가중치 2^h, 레벨 용량을 넘으면 정렬 후 한 칸 건너 절반을 다음 레벨로 올림
+    """
+
+    def __init__(self, n_columns: int, k: int = DEFAULT_SKETCH_SIZE, rng: Optional[np.random.Generator] = None):
+        self.n_columns = n_columns
+        self.k = k
+        self.n = 0  # 열당 누적 값 개수
+        self.levels: List[np.ndarray] = []
+        self._rng = rng or np.random.default_rng()
+
+    def capacity(self, level: int) -> int:
+        depth = len(self.levels) - 1 - level
+        return max(int(np.ceil(self.k * _CAPACITY_DECAY ** depth)), 2)
+
+    def update(self, values: np.ndarray) -> "QuantileSketch":
+        """values: (열 수 × 값 개수) 한 배치"""
+        values = np.asarray(values, dtype=float).reshape(self.n_columns, -1)
+        if values.shape[1] == 0:
+            return self
+        self._append(0, values)
+        self.n += values.shape[1]
+        self._compress()
+        return self
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """같은 열 수의 다른 스케치를 합침 (샤드 결과 병합)"""
+        if other.n_columns != self.n_columns:
+            raise ValueError(f"column count mismatch: {self.n_columns} != {other.n_columns}")
+        for level, items in enumerate(other.levels):
+            self._append(level, items)
+        self.n += other.n
+        self._compress()
+        return self
+
+    def _append(self, level: int, items: np.ndarray) -> None:
+        while len(self.levels) <= level:
+            self.levels.append(np.empty((self.n_columns, 0)))
+        self.levels[level] = np.concatenate([self.levels[level], items], axis=1)
+
+    def _compress(self) -> None:
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if items.shape[1] > self.capacity(level):
+                items = np.sort(items, axis=1)
+                # 홀수 개면 한 항목 (양 끝 중 임의)은 현재 레벨에 남김
+                if items.shape[1] % 2:
+                    keep_last = bool(self._rng.integers(2))
+                    kept = items[:, -1:] if keep_last else items[:, :1]
+                    items = items[:, :-1] if keep_last else items[:, 1:]
+                else:
+                    kept = items[:, :0]
+                offset = int(self._rng.integers(2))
+                self.levels[level] = kept
+                self._append(level + 1, items[:, offset::2])
+            level += 1
+
+    def quantiles(self, qs: Sequence[float]) -> np.ndarray:
+        """(열 수 × len(qs)) 분위수 추정값, 값이 없으면 nan"""
+        qs = np.asarray(qs, dtype=float)
+        if self.n == 0:
+            return np.full((self.n_columns, len(qs)), np.nan)
+        items = np.concatenate(self.levels, axis=1)
+        weights = np.concatenate([np.full(level.shape[1], 2.0 ** h) for h, level in enumerate(self.levels)])
+        order = np.argsort(items, axis=1)
+        sorted_items = np.take_along_axis(items, order, axis=1)
+        cumulative = np.cumsum(weights[order], axis=1)
+        total = cumulative[:, -1:]
+        # 누적 가중치가 q · 전체 이상이 되는 첫 항목
+        index = (cumulative[:, :, np.newaxis] < qs * total[:, :, np.newaxis]).sum(axis=1)
+        index = np.minimum(index, items.shape[1] - 1)
+        return np.take_along_axis(sorted_items, index, axis=1)
+
+    @property
+    def size(self) -> int:
+        """열당 보관 항목 수"""
+        return sum(items.shape[1] for items in self.levels)
+
+
+class FundBandAccumulator:
+    """
+    연도별 기금 잔액 분위수 밴드와 생존 곡선 누적기
+    잔액은 고갈 후 0으로 보고, 생존 경로 수는 정확히 집계 (연도 수 크기 정수 배열)
+    """
+
+    def __init__(self, start_year: int, end_year: int, k: int = DEFAULT_SKETCH_SIZE, rng: Optional[np.random.Generator] = None):
+        self.start_year = start_year
+        self.end_year = end_year
+        n_years = end_year - start_year + 1
+        self.sketch = QuantileSketch(n_years, k, rng)
+        self.survivors = np.zeros(n_years, dtype=np.int64)
+        self.n_paths = 0
+
+    def update(self, balances: np.ndarray, depletion_years: np.ndarray) -> "FundBandAccumulator":
+        """balances: (경로 수 × 연도 수) 연말 기금 잔액, depletion_years: 경로별 고갈 연도 (미고갈 end_year + 1)"""
+        self.sketch.update(np.maximum(balances, 0.0).T)
+        n_years = len(self.survivors)
+        depleted = np.bincount(np.asarray(depletion_years) - self.start_year, minlength=n_years + 1)[:n_years]
+        self.survivors += len(depletion_years) - np.cumsum(depleted)
+        self.n_paths += len(depletion_years)
+        return self
+
+    def merge(self, other: "FundBandAccumulator") -> "FundBandAccumulator":
+        if (other.start_year, other.end_year) != (self.start_year, self.end_year):
+            raise ValueError("cannot merge fund bands over different periods")
+        self.sketch.merge(other.sketch)
+        self.survivors += other.survivors
+        self.n_paths += other.n_paths
+        return self
+
+    def bands(self, percentiles: Sequence[int] = BAND_PERCENTILES) -> FundBands:
+        values = self.sketch.quantiles([p / 100 for p in percentiles])
+        survival = self.survivors / self.n_paths if self.n_paths else np.zeros(len(self.survivors))
+        return FundBands(
+            years=list(range(self.start_year, self.end_year + 1)),
+            percentiles={f"p{p}": np.round(values[:, i], 1).tolist() for i, p in enumerate(percentiles)},
+            survival=np.round(survival, 4).tolist(),
+            sketch_size=self.sketch.k,
+        )
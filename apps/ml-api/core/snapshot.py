@@ -0,0 +1,215 @@
+"""
+시작 스냅샷
+데이터 파일, 학습된 모델, 인구 추계 테이블(기본 가정)을 배포 시점에 하나의 mmap 가능한 파일로 저장
+
+    python -m core.snapshot build   # models/startup_snapshot.bin 생성
+    python -m core.snapshot info    # 내용 확인
+
+파일 형식:
+    MAGIC (8바이트) | 헤더 길이 (8바이트, little endian) | JSON 헤더 | 64바이트 정렬된 데이터 영역
+배열은 mmap 위에서 복사 없이 numpy 배열로 읽고, blob(JSON/pickle)은 필요할 때 잘라 읽음
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional
+
+APP_DIR = Path(__file__).parent.parent
+DEFAULT_PATH = APP_DIR / "models" / "startup_snapshot.bin"
+
+MAGIC = b"NPFSSNP1"
+ALIGN = 64
+
+# 인구 추계 테이블 범위
+PROJECTION_PENSION_AGES = range(60, 71)
+PROJECTION_YEARS = range(2024, 2094)
+
+
+def snapshot_path() -> Optional[Path]:
+    """NPFS_SNAPSHOT 환경변수 (경로 또는 off)"""
+    value = os.getenv("NPFS_SNAPSHOT", "")
+    if value.lower() in ("off", "0", "false"):
+        return None
+    return Path(value) if value else DEFAULT_PATH
+
+
+class Snapshot:
+    """mmap된 스냅샷 파일"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:8] != MAGIC:
+            raise ValueError(f"Not a snapshot file: {path}")
+        (header_len,) = struct.unpack("<Q", self._mm[8:16])
+        self.header = json.loads(self._mm[16:16 + header_len])
+
+    @property
+    def meta(self) -> dict:
+        return self.header.get("meta", {})
+
+    def has_blob(self, name: str) -> bool:
+        return name in self.header["blobs"]
+
+    def blob_current(self, name: str, path: Path) -> bool:
+        """
+        blob이 원본 파일과 같은지 (원본이 없으면 True)
+        기록된 크기 / 수정 시각이 같으면 그대로, 다르면 sha1 (meta.sources)로 확인
+        """
+        if not path.exists():
+            return True
+        stat = path.stat()
+        recorded = self.meta.get("files", {}).get(name)
+        if recorded and recorded["size"] == stat.st_size and recorded["mtime_ns"] == stat.st_mtime_ns:
+            return True
+        digest = self.meta.get("sources", {}).get(name)
+        return digest is not None and hashlib.sha1(path.read_bytes()).hexdigest() == digest
+
+    def blob(self, name: str) -> bytes:
+        entry = self.header["blobs"][name]
+        return self._mm[entry["offset"]:entry["offset"] + entry["length"]]
+
+    def has_array(self, name: str) -> bool:
+        return name in self.header["arrays"]
+
+    def array(self, name: str):
+        """읽기 전용 numpy 배열 (mmap 위 zero-copy)"""
+        import numpy as np
+        entry = self.header["arrays"][name]
+        dtype = np.dtype(entry["dtype"])
+        count = int(np.prod(entry["shape"]))
+        return np.frombuffer(self._mm, dtype=dtype, count=count, offset=entry["offset"]).reshape(entry["shape"])
+
+
+@lru_cache(maxsize=1)
+def get_snapshot() -> Optional[Snapshot]:
+    """스냅샷이 있으면 로드 (없거나 비활성화면 None)"""
+    path = snapshot_path()
+    if path is None or not path.exists():
+        return None
+    try:
+        return Snapshot(path)
+    except (OSError, ValueError) as e:
+        print(f"Ignoring snapshot {path}: {e}")
+        return None
+
+
+def write_snapshot(path: Path, arrays: Dict[str, object], blobs: Dict[str, bytes], meta: dict) -> Path:
+    """배열과 blob을 정렬된 단일 파일로 저장"""
+    entries_arrays, entries_blobs, chunks = {}, {}, []
+    offset = 0
+
+    def place(data: bytes) -> int:
+        nonlocal offset
+        start = offset
+        padding = (-len(data)) % ALIGN
+        chunks.append(data + b"\0" * padding)
+        offset += len(data) + padding
+        return start
+
+    for name, array in arrays.items():
+        start = place(array.tobytes(order="C"))
+        entries_arrays[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": start}
+    for name, data in blobs.items():
+        entries_blobs[name] = {"offset": place(data), "length": len(data)}
+
+    # 헤더 길이가 데이터 시작 위치에 영향을 주므로 정렬 후 절대 오프셋으로 변환
+    def render(base: int) -> bytes:
+        header = {
+            "arrays": {k: {**v, "offset": v["offset"] + base} for k, v in entries_arrays.items()},
+            "blobs": {k: {**v, "offset": v["offset"] + base} for k, v in entries_blobs.items()},
+            "meta": meta,
+        }
+        return json.dumps(header, ensure_ascii=False).encode()
+
+    base = 0
+    while True:
+        header = render(base)
+        data_start = 16 + len(header)
+        data_start += (-data_start) % ALIGN
+        if data_start == base:
+            break
+        base = data_start
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "wb") as f:
+        f.write(MAGIC + struct.pack("<Q", len(header)) + header)
+        f.write(b"\0" * (base - 16 - len(header)))
+        for chunk in chunks:
+            f.write(chunk)
+    tmp.replace(path)
+    return path
+
+
+def build_snapshot(path: Path = DEFAULT_PATH) -> Path:
+    """데이터 파일, 학습된 모델, 인구 추계 테이블로 스냅샷 생성"""
+    import numpy as np
+    from core.demography import BASELINE, PROJECTIONS, pension_counts, year_slice
+    from core.simulation import POPULATION_MODEL
+    from .model_store import MODEL_PATH, train_model_if_needed
+    from .partitions import DATA_DIR
+
+    blobs: Dict[str, bytes] = {}
+    sources: Dict[str, str] = {}
+    files: Dict[str, dict] = {}
+
+    def add_file(name: str, source: Path) -> None:
+        # 원본 크기 / 수정 시각 (blob_current가 파일 변경 여부 확인에 사용)
+        stat = source.stat()
+        data = source.read_bytes()
+        blobs[name] = data
+        sources[name] = hashlib.sha1(data).hexdigest()
+        files[name] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    for data_file in sorted(DATA_DIR.glob("*.json")):
+        add_file(f"data/{data_file.name}", data_file)
+
+    train_model_if_needed()
+    add_file(f"models/{MODEL_PATH.name}", MODEL_PATH)
+
+    # 기본 가정 인구 추계: 가입자는 수급 연령과 무관 (연도,), 수급자는 (수급 연령, 연도)
+    years = np.array(PROJECTION_YEARS)
+    population = year_slice(PROJECTIONS.get(BASELINE, int(years[-1])), years[0], years[-1])
+    contributors, beneficiaries = pension_counts(population, years, list(PROJECTION_PENSION_AGES))
+
+    arrays = {
+        "projection/contributors": contributors,
+        "projection/beneficiaries": beneficiaries,
+    }
+    meta = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "pension_ages": [PROJECTION_PENSION_AGES.start, PROJECTION_PENSION_AGES.stop - 1],
+        "years": [PROJECTION_YEARS.start, PROJECTION_YEARS.stop - 1],
+        "population_model": POPULATION_MODEL,
+        "sources": sources,
+        "files": files,
+    }
+    return write_snapshot(path, arrays, blobs, meta)
+
+
+def main(argv=None):
+    argv = argv if argv is not None else sys.argv[1:]
+    command = argv[0] if argv else "info"
+    path = Path(argv[1]) if len(argv) > 1 else (snapshot_path() or DEFAULT_PATH)
+
+    if command == "build":
+        build_snapshot(path)
+        print(f"Snapshot saved to {path} ({path.stat().st_size / 1e6:.1f} MB)")
+    elif command == "info":
+        snapshot = Snapshot(path)
+        print(json.dumps(snapshot.header, ensure_ascii=False, indent=2))
+    else:
+        print("usage: python -m core.snapshot [build|info] [path]")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+인구 / 임금 확률 경로
+Monte Carlo에서 기금 수익률과 함께 출산율, 사망력, 임금상승률을 (경로 수 × 연도 수) 행렬로 생성하고
+경로별 가입자 / 수급자 / 평균소득을 한 번의 벡터화 추계로 계산
+
+- 출산: log 합계출산율 = 가정 경로 (core.demography) + AR(1) 편차
+- 사망: log 사망력 수준 = 가정 개선율을 표류항으로 하는 랜덤워크 (Lee-Carter의 k_t)
+- 임금: 연 상승률 = 2% + AR(1) 편차
+- return_correlation: 표준화한 연도별 수익률 충격과 임금 / 출산 충격의 상관계수
+  (호황 국면에 임금과 출산이 함께 오르는 관계), 사망 충격은 독립
+"""
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .demography import BASE_YEAR, project_pension_paths, tfr_path
+from .schemas import SimulationParams
+from .simulation import WAGE_GROWTH, cashflows, demographic_assumptions, policy_path
+
+# 경로 행렬 순서: 출산, 사망, 임금
+N_SHOCKS = 3
+
+
+@dataclass(frozen=True)
+class DemographicUncertainty:
+    """경로별 인구 / 임금 변동 크기"""
+    fertility_sigma: float = 0.05  # log 합계출산율 연간 충격
+    fertility_phi: float = 0.9  # 출산율 편차 지속성 (정상 표준편차 약 11%)
+    mortality_sigma: float = 0.02  # log 사망력 연간 충격
+    wage_sigma: float = 0.01  # 임금상승률 연간 충격 (%p / 100)
+    wage_phi: float = 0.5
+    return_correlation: float = 0.0
+
+
+@dataclass
+class ScenarioPaths:
+    """(경로, 연도) 인구 / 임금 경로, 연도 축은 params.start_year ~ params.end_year"""
+    contributors: np.ndarray  # 천명
+    beneficiaries: np.ndarray  # 천명
+    wage_index: np.ndarray  # 2024년 평균소득 대비 배율
+
+
+def ar1_paths(shocks: np.ndarray, phi: float) -> np.ndarray:
+    """x_t = phi · x_{t-1} + shock_t (x_{-1} = 0), 하삼각 감쇠 행렬 곱으로 전체 경로를 한 번에 계산"""
+    n_years = shocks.shape[1]
+    lags = np.arange(n_years)[:, np.newaxis] - np.arange(n_years)[np.newaxis, :]
+    decay = np.where(lags >= 0, phi ** np.maximum(lags, 0), 0.0)
+    return shocks @ decay.T
+
+
+def correlate(normals: np.ndarray, reference: Optional[np.ndarray], rho: float) -> np.ndarray:
+    """reference와 상관계수 rho를 갖는 표준정규 행렬"""
+    if reference is None or rho == 0:
+        return normals
+    return rho * reference + np.sqrt(1.0 - rho ** 2) * normals
+
+
+def projection_axis(values: np.ndarray, start_year: int, end_year: int) -> np.ndarray:
+    """시뮬레이션 연도 축 (start_year~) 충격을 추계 연도 축 (BASE_YEAR~)으로 옮김, 시작 전 연도는 0"""
+    columns = np.arange(end_year - BASE_YEAR + 1) + BASE_YEAR - start_year
+    shifted = np.zeros((values.shape[0], len(columns)))
+    valid = (columns >= 0) & (columns < values.shape[1])
+    shifted[:, valid] = values[:, columns[valid]]
+    return shifted
+
+
+def sample_scenario_paths(
+    params: SimulationParams,
+    normals: np.ndarray,
+    return_shocks: Optional[np.ndarray] = None,
+    uncertainty: DemographicUncertainty = DemographicUncertainty(),
+) -> ScenarioPaths:
+    """
+    normals: (N_SHOCKS, 경로, 연도) 표준정규 충격 (출산, 사망, 임금)
+    return_shocks: (경로, 연도) 표준화된 수익률 충격 (return_correlation 적용 대상)
+    """
+    start_year, end_year = params.start_year, params.end_year
+    rho = uncertainty.return_correlation
+    fertility = projection_axis(correlate(normals[0], return_shocks, rho), start_year, end_year)
+    mortality = projection_axis(normals[1], start_year, end_year)
+    wage = projection_axis(correlate(normals[2], return_shocks, rho), start_year, end_year)
+
+    assumptions = demographic_assumptions(params)
+    years = np.arange(BASE_YEAR, end_year + 1)
+    tfr = tfr_path([assumptions], years) * np.exp(ar1_paths(uncertainty.fertility_sigma * fertility, uncertainty.fertility_phi))
+
+    # 기준 연도 사망력은 고정, 이후 개선율 + 누적 충격
+    log_scale = np.arange(len(years)) * np.log1p(-assumptions.mortality_improvement)
+    walk = np.cumsum(uncertainty.mortality_sigma * mortality, axis=1)
+    mortality_scale = np.exp(log_scale + walk - walk[:, :1])
+
+    # 연도별 수급 연령 일정은 추계 연도 축으로 (시작 전 연도는 첫 해 연령)
+    ages = policy_path(params, "pension_age")
+    if ages.ndim:
+        ages = ages[np.clip(years - start_year, 0, len(ages) - 1)]
+    contributors, beneficiaries = project_pension_paths(
+        tfr, mortality_scale, np.full(len(tfr), assumptions.net_migration), ages
+    )
+
+    growth = WAGE_GROWTH + ar1_paths(uncertainty.wage_sigma * wage, uncertainty.wage_phi)
+    growth[:, 0] = 0.0
+    wage_index = np.cumprod(1.0 + growth, axis=1)
+
+    # 기준 연도 이전 시뮬레이션 연도는 기준 연도 값 사용
+    rows = np.clip(np.arange(start_year, end_year + 1) - BASE_YEAR, 0, len(years) - 1)
+    return ScenarioPaths(contributors[:, rows], beneficiaries[:, rows], wage_index[:, rows])
+
+
+def scenario_cashflows(
+    params: SimulationParams,
+    normals: np.ndarray,
+    return_shocks: Optional[np.ndarray] = None,
+    uncertainty: DemographicUncertainty = DemographicUncertainty(),
+) -> Tuple[np.ndarray, np.ndarray]:
+    """경로별 (경로, 연도) 보험료 수입과 급여 지출 (조원)"""
+    paths = sample_scenario_paths(params, normals, return_shocks, uncertainty)
+    return cashflows(params, paths.contributors, paths.beneficiaries, paths.wage_index)
@@ -0,0 +1,237 @@
+"""
+대리 모델 (고갈 연도 예측) 서빙과 오차 프로파일
+학습 범위 안의 보류(hold-out) 시나리오를 정확한 배치 시뮬레이션과 비교해
+파라미터 영역별 오차 상한 (split conformal 분위수)을 만들고, 예측값과 함께 상한을 반환
+
+- 영역: 학습 범위 (DEFAULT_SENSITIVITY_RANGES)의 변수별 REGION_BINS 등분 격자
+- 상한: 영역 보류 오차의 ceil((n + 1) · coverage)번째 값 (표본이 부족하면 무한대)
+- 학습 범위 밖, 정책 일정, 기본값이 아닌 기간 / 인구 가정은 대리 모델 대상이 아님 (상한 무한대)
+- 상한이 허용 오차를 넘는 시나리오만 정확한 배치 시뮬레이션으로 대체
+
+오차 리포트는 모델 버전 (pickle sha1)별로 models/surrogate_reports.json에 누적
+    python -m core.surrogate validate   # 현재 모델 검증 리포트 생성 / 갱신
+    python -m core.surrogate history    # 버전별 오차 요약
+"""
+import json
+import math
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .schemas import DEFAULT_SENSITIVITY_RANGES, POLICY_BOUNDS, SimulationParams
+from .sensitivity import scale_design
+from .simulation import policy_depletion_years
+
+REPORT_PATH = Path(__file__).parent.parent / "models" / "surrogate_reports.json"
+
+# 모델 입력 순서 (대리 모델 학습 / SHAP / Sobol 분석 공통)
+SURROGATE_FEATURES = tuple(POLICY_BOUNDS)
+
+HOLDOUT_SAMPLES = 4096
+HOLDOUT_SEED = 2024  # 학습 시나리오 (seed 42)와 다른 시드
+REGION_BINS = 3
+COVERAGE = 0.95
+
+# 허용 오차 (년): 상한이 이보다 크면 정확한 시뮬레이션
+DEFAULT_TOLERANCE = float(os.getenv("SURROGATE_TOLERANCE", "1.0"))
+
+
+@dataclass
+class SurrogateEstimate:
+    """시나리오별 대리 모델 예측 (대상이 아니면 predicted는 None, error_bound는 inf)"""
+    predicted: Optional[float]
+    error_bound: float
+
+    def within(self, tolerance: float) -> bool:
+        return self.predicted is not None and self.error_bound <= tolerance
+
+
+def region_index(columns: Dict[str, np.ndarray]) -> np.ndarray:
+    """변수별 값 배열 → 영역 번호 (학습 범위 밖이면 -1)"""
+    index = np.zeros(len(next(iter(columns.values()))), dtype=np.int64)
+    inside = np.ones(len(index), dtype=bool)
+    for name in SURROGATE_FEATURES:
+        low, high = DEFAULT_SENSITIVITY_RANGES[name].low, DEFAULT_SENSITIVITY_RANGES[name].high
+        values = np.asarray(columns[name], dtype=float)
+        inside &= (values >= low - 1e-12) & (values <= high + 1e-12)
+        # pension_age는 정수 연령 low~high를 균등 분할 (scale_design과 같은 규칙)
+        width = high - low + 1 if name == "pension_age" else high - low
+        position = np.clip((values - low) / width, 0.0, 1.0 - 1e-12)
+        index = index * REGION_BINS + np.floor(position * REGION_BINS).astype(np.int64)
+    return np.where(inside, index, -1)
+
+
+def conformal_bound(errors: np.ndarray, coverage: float = COVERAGE) -> float:
+    """split conformal 상한: 정렬된 오차의 ceil((n + 1) · coverage)번째 (n이 부족하면 inf)"""
+    rank = math.ceil((len(errors) + 1) * coverage)
+    if rank > len(errors):
+        return math.inf
+    return float(np.sort(errors)[rank - 1])
+
+
+def holdout_errors(model, n_samples: int = HOLDOUT_SAMPLES, seed: int = HOLDOUT_SEED):
+    """학습 범위의 스크램블 Sobol 보류 시나리오에 대한 (변수별 값, 정확한 고갈 연도, 예측값)"""
+    from scipy.stats import qmc
+
+    points = qmc.Sobol(d=len(SURROGATE_FEATURES), scramble=True, seed=seed).random(n_samples)
+    columns = scale_design(points, list(SURROGATE_FEATURES), DEFAULT_SENSITIVITY_RANGES)
+    exact = policy_depletion_years(SimulationParams(), **columns).astype(float)
+    predicted = model.predict(np.column_stack([columns[name] for name in SURROGATE_FEATURES]))
+    return columns, exact, predicted
+
+
+def validate_model(model, version: str, n_samples: int = HOLDOUT_SAMPLES, seed: int = HOLDOUT_SEED) -> dict:
+    """보류 시나리오로 전체 / 영역별 오차 리포트 생성"""
+    columns, exact, predicted = holdout_errors(model, n_samples, seed)
+    errors = np.abs(predicted - exact)
+    regions = region_index(columns)
+
+    region_reports = []
+    for region in range(REGION_BINS ** len(SURROGATE_FEATURES)):
+        region_errors = errors[regions == region]
+        region_reports.append({
+            "region": region,
+            "n": int(len(region_errors)),
+            "mae": round(float(region_errors.mean()), 4) if len(region_errors) else None,
+            "error_bound": conformal_bound(region_errors),
+        })
+
+    return {
+        "version": version,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "n_samples": n_samples,
+        "seed": seed,
+        "coverage": COVERAGE,
+        "region_bins": REGION_BINS,
+        "ranges": {name: [r.low, r.high] for name, r in DEFAULT_SENSITIVITY_RANGES.items()},
+        "overall": {
+            "mae": round(float(errors.mean()), 4),
+            "rmse": round(float(np.sqrt((errors ** 2).mean())), 4),
+            "p95": round(float(np.percentile(errors, 95)), 4),
+            "max": round(float(errors.max()), 4),
+            "rounded_exact": round(float((np.round(predicted) == exact).mean()), 4),
+            "error_bound": conformal_bound(errors),
+        },
+        "regions": region_reports,
+    }
+
+
+def load_reports(path: Path = REPORT_PATH) -> Dict[str, dict]:
+    """버전별 검증 리포트 (파일이 없으면 빈 dict)"""
+    if not path.exists():
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+_REPORT_LOCK = threading.Lock()
+
+
+def save_report(report: dict, path: Path = REPORT_PATH) -> None:
+    """버전별 리포트 파일에 추가 / 갱신 (쓰다 만 파일을 읽지 않도록 교체)"""
+    with _REPORT_LOCK:
+        reports = load_reports(path)
+        reports[report["version"]] = report
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            # inf 상한은 JSON 표준이 아니므로 null로 저장
+            json.dump(json_safe(reports), f, ensure_ascii=False, indent=2)
+        tmp_path.replace(path)
+
+
+def json_safe(value):
+    """inf / nan을 None으로 바꾼 리포트 (JSON 표준 호환)"""
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if isinstance(value, dict):
+        return {k: json_safe(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [json_safe(v) for v in value]
+    return value
+
+
+class ErrorProfile:
+    """모델 버전의 영역별 오차 상한 (리포트 파일에 없으면 보류 시나리오로 계산 후 저장)"""
+
+    def __init__(self, report: dict):
+        self.report = report
+        self.version = report["version"]
+        self.bounds = np.array(
+            [math.inf if r["error_bound"] is None else r["error_bound"] for r in report["regions"]]
+        )
+
+    @classmethod
+    def for_model(cls, model, version: str, path: Path = REPORT_PATH) -> "ErrorProfile":
+        report = load_reports(path).get(version)
+        if report is None or report.get("region_bins") != REGION_BINS:
+            report = validate_model(model, version)
+            save_report(report, path)
+        return cls(report)
+
+    def bound(self, regions: np.ndarray) -> np.ndarray:
+        return np.where(regions >= 0, self.bounds[np.maximum(regions, 0)], math.inf)
+
+
+_PROFILES: Dict[str, ErrorProfile] = {}
+
+
+def error_profile(model, version: str) -> ErrorProfile:
+    """버전별 오차 프로파일 (프로세스 캐시)"""
+    if version not in _PROFILES:
+        _PROFILES[version] = ErrorProfile.for_model(model, version)
+    return _PROFILES[version]
+
+
+def surrogate_eligible(params: SimulationParams) -> bool:
+    """대리 모델 학습 조건 (상수 정책 변수, 기본 기간 / 인구 가정)과 같은 시나리오인지"""
+    if params.has_schedules():
+        return False
+    defaults = SimulationParams()
+    return all(getattr(params, name) == getattr(defaults, name) for name in SimulationParams.model_fields if name not in POLICY_BOUNDS)
+
+
+def surrogate_estimates(model, version: str, params_list: Sequence[SimulationParams]) -> List[SurrogateEstimate]:
+    """시나리오들의 예측 고갈 연도와 오차 상한 (대상 시나리오만 한 번의 predict로)"""
+    eligible = [i for i, params in enumerate(params_list) if surrogate_eligible(params)]
+    estimates = [SurrogateEstimate(None, math.inf) for _ in params_list]
+    if not eligible:
+        return estimates
+
+    columns = {name: np.array([getattr(params_list[i], name) for i in eligible], dtype=float) for name in SURROGATE_FEATURES}
+    predicted = model.predict(np.column_stack([columns[name] for name in SURROGATE_FEATURES]))
+    bounds = error_profile(model, version).bound(region_index(columns))
+    for i, value, bound in zip(eligible, predicted, bounds):
+        estimates[i] = SurrogateEstimate(float(value), float(bound))
+    return estimates
+
+
+def main(argv=None):
+    argv = argv if argv is not None else sys.argv[1:]
+    command = argv[0] if argv else "validate"
+
+    if command == "validate":
+        from .model_store import load_model, model_version
+
+        report = validate_model(load_model(), model_version())
+        save_report(report)
+        print(json.dumps({"version": report["version"], **report["overall"]}, ensure_ascii=False, indent=2))
+        uncovered = sum(1 for r in report["regions"] if not math.isfinite(r["error_bound"]))
+        print(f"regions: {len(report['regions'])} (no bound: {uncovered}), saved to {REPORT_PATH}")
+    elif command == "history":
+        for version, report in sorted(load_reports().items(), key=lambda item: item[1]["created_at"]):
+            overall = report["overall"]
+            print(f"{report['created_at']}  {version}  mae={overall['mae']}  p95={overall['p95']}  max={overall['max']}")
+    else:
+        print("usage: python -m core.surrogate [validate|history]")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
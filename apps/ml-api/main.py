@@ -6,6 +6,10 @@ import os
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from core.instrumentation import add_instrumentation
+from core.lazy import LazyMount, analysis_dependencies, merge_lazy_openapi, modules_available
+from core.serialization import DefaultResponse, add_compression_middleware
+
 # Always available routers
 from routers import health
 from routers import voter_reach
@@ -14,6 +18,7 @@ app = FastAPI(
     title="NPFS ML API",
     description="국민연금 재정 시뮬레이터 ML 분석 API",
     version="0.1.0",
+    default_response_class=DefaultResponse,
 )
 
 # CORS 설정
@@ -27,25 +32,61 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 응답 압축 (brotli-asgi 설치 시 brotli, 아니면 gzip)
+COMPRESSION = add_compression_middleware(app)
+
+# 요청 지연시간 계측 (/metrics), ENABLE_PROFILING=1 이면 ?profile=1 프로파일러
+add_instrumentation(app)
+
 # 라우터 등록 - Always available
 app.include_router(health.router, tags=["Health"])
 app.include_router(voter_reach.router, prefix="/api/voter-reach", tags=["Voter Reach"])
 
 # Optional routers (require numpy, sklearn, etc.)
-try:
-    from routers import shap_analysis, monte_carlo, generation
-    app.include_router(shap_analysis.router, prefix="/analysis", tags=["SHAP Analysis"])
-    app.include_router(monte_carlo.router, prefix="/analysis", tags=["Monte Carlo"])
-    app.include_router(generation.router, prefix="/analysis", tags=["Generation Analysis"])
-    ML_ENDPOINTS_AVAILABLE = True
-except ImportError:
-    ML_ENDPOINTS_AVAILABLE = False
+# LAZY_ROUTERS=1 이면 /analysis 라우터를 첫 요청 시 import (서버리스 콜드 스타트용)
+LAZY_ROUTERS = os.getenv(
+    "LAZY_ROUTERS", "1" if os.getenv("AWS_LAMBDA_FUNCTION_NAME") else "0"
+).lower() in ("1", "true", "yes")
+
+
+def include_analysis_routers(target: FastAPI, prefix: str = "") -> None:
+    from routers import shap_analysis, monte_carlo, generation, jobs, sensitivity
+    target.include_router(shap_analysis.router, prefix=prefix, tags=["SHAP Analysis"])
+    target.include_router(sensitivity.router, prefix=prefix, tags=["Sensitivity Analysis"])
+    target.include_router(monte_carlo.router, prefix=prefix, tags=["Monte Carlo"])
+    target.include_router(generation.router, prefix=prefix, tags=["Generation Analysis"])
+    target.include_router(jobs.router, prefix=prefix, tags=["Jobs"])
+
+
+def build_analysis_app() -> FastAPI:
+    analysis_app = FastAPI(default_response_class=DefaultResponse)
+    include_analysis_routers(analysis_app)
+    return analysis_app
+
+
+ANALYSIS_APP = None
+if LAZY_ROUTERS:
+    # import 없이 의존성 설치 여부로 시작 시 판단 (eager 경로의 ImportError 폴백과 같은 기준)
+    ML_ENDPOINTS_AVAILABLE = modules_available(*analysis_dependencies())
+    if ML_ENDPOINTS_AVAILABLE:
+        ANALYSIS_APP = LazyMount(build_analysis_app)
+        app.mount("/analysis", ANALYSIS_APP)
+        merge_lazy_openapi(app, "/analysis", ANALYSIS_APP)
+else:
+    # 요청 처리 중에만 import하는 의존성 (scipy 등)도 시작 시 확인
+    ML_ENDPOINTS_AVAILABLE = modules_available(*analysis_dependencies())
+    if ML_ENDPOINTS_AVAILABLE:
+        try:
+            include_analysis_routers(app, prefix="/analysis")
+        except ImportError:
+            ML_ENDPOINTS_AVAILABLE = False
 
 
 @app.get("/")
 async def root():
     endpoints = {
         "health": "/health",
+        "metrics": "/metrics",
         "voter_reach": {
             "stations": "/api/voter-reach/stations",
             "ridership": "/api/voter-reach/ridership",
@@ -55,16 +96,23 @@ async def root():
         },
     }
 
-    if ML_ENDPOINTS_AVAILABLE:
+    # 지연 로딩 중 import에 실패했으면 사용 불가로 표시
+    ml_available = ML_ENDPOINTS_AVAILABLE and (ANALYSIS_APP is None or ANALYSIS_APP.error is None)
+    if ml_available:
         endpoints.update({
             "shap": "/analysis/shap",
+            "sobol": "/analysis/sobol",
+            "gradients": "/analysis/gradients",
+            "surrogate": "/analysis/surrogate/predict",
             "monte_carlo": "/analysis/monte-carlo",
             "generations": "/analysis/generations",
+            "generations_stochastic": "/analysis/generations/stochastic",
+            "jobs": "/analysis/jobs/{job_id}",
         })
 
     return {
         "service": "NPFS ML API",
         "version": "0.1.0",
-        "ml_endpoints_available": ML_ENDPOINTS_AVAILABLE,
+        "ml_endpoints_available": ml_available,
         "endpoints": endpoints
     }
@@ -2,14 +2,27 @@
 세대별 분석 엔드포인트
 세대별 수익비 및 클러스터링
 """
-import numpy as np
-from fastapi import APIRouter
-from typing import List, Dict
-from sklearn.cluster import KMeans
-from sklearn.preprocessing import StandardScaler
+import asyncio
 
-from core.schemas import SimulationParams, GenerationData, GenerationAnalysisResult
-from core.simulation import run_simulation
+import numpy as np
+from fastapi import APIRouter, HTTPException, Query
+from typing import List, Optional
+
+from core.schemas import (
+    SimulationParams,
+    GenerationData,
+    GenerationAnalysisResult,
+    CohortRoiDistribution,
+    StochasticGenerationResult,
+)
+from core.batching import DEPLETION_BATCHER
+from core.generations import BIRTH_YEARS, cohort_policy, equity_index_matrix, generation_roi_matrix
+from core.instrumentation import timed
+from core.return_models import DEFAULT_STD_RETURN, ReturnModel
+from core.sampling import resolve_demography, resolve_return_model, sample_cashflows, sample_return_paths
+from core.simulation import simulate_depletion_years
+from core.sketches import BAND_PERCENTILES
+from core.stochastic_paths import DemographicUncertainty
 
 router = APIRouter()
 
@@ -32,32 +45,37 @@ def calculate_generation_data(
 
     가정:
     - 22세부터 납부 시작
-    - params.pension_age 세까지 납부
+    - 수급 개시 연령까지 납부 (정책 일정이면 cohort_policy의 세대별 값)
     - 기대수명 85세까지 수급
     """
+    policy = cohort_policy(params, [birth_year])
+    pension_age = int(policy["pension_age"][0])
+    contribution_rate = float(policy["contribution_rate"][0])
+    replacement_rate = float(policy["replacement_rate"][0])
+
     # 납부 기간
     contribution_start_year = birth_year + 22
-    contribution_end_year = birth_year + params.pension_age
+    contribution_end_year = birth_year + pension_age
     contribution_years = max(0, min(contribution_end_year, 2093) - max(contribution_start_year, 2024))
 
     # 수급 기간
-    benefit_start_year = birth_year + params.pension_age
+    benefit_start_year = birth_year + pension_age
     benefit_end_year = birth_year + 85  # 기대수명
 
     # 기금 소진 시 부과방식 전환 가정 (급여 50% 수준으로 가정)
     if depletion_year and benefit_start_year >= depletion_year:
         # 기금 소진 후 은퇴 → 부과방식, 급여 감소
-        effective_replacement = params.replacement_rate * 0.5
+        effective_replacement = replacement_rate * 0.5
         benefit_years = max(0, benefit_end_year - benefit_start_year)
     elif depletion_year and benefit_start_year < depletion_year < benefit_end_year:
         # 은퇴 중 기금 소진 → 일부 기간만 정상 급여
         normal_years = depletion_year - benefit_start_year
         reduced_years = benefit_end_year - depletion_year
         benefit_years = normal_years + reduced_years * 0.5  # 가중 평균
-        effective_replacement = params.replacement_rate
+        effective_replacement = replacement_rate
     else:
         # 기금 정상
-        effective_replacement = params.replacement_rate
+        effective_replacement = replacement_rate
         benefit_years = max(0, benefit_end_year - benefit_start_year)
 
     # 평균 소득 추정 (출생연도 기준 경력 중반 소득)
@@ -66,7 +84,7 @@ def calculate_generation_data(
     average_income = 4200 * (1.02 ** year_diff)  # 만원
 
     # 총 납부액 (만원)
-    annual_contribution = average_income * params.contribution_rate * 12
+    annual_contribution = average_income * contribution_rate * 12
     total_contribution = annual_contribution * contribution_years
 
     # 총 수령액 (만원)
@@ -93,6 +111,10 @@ def cluster_generations(generations: List[GenerationData], n_clusters: int = 4)
     if len(generations) < n_clusters:
         return generations
 
+    # sklearn은 import 비용이 커서 첫 호출 시 로드
+    from sklearn.cluster import KMeans
+    from sklearn.preprocessing import StandardScaler
+
     # 클러스터링 특성
     features = np.array([
         [g.roi, g.contribution_years, g.benefit_years]
@@ -156,16 +178,14 @@ async def analyze_generations(params: SimulationParams):
     - K-means 클러스터링으로 세대 유형 분류
     - 세대간 형평성 지수 계산
     """
-    # 시뮬레이션으로 고갈 연도 확인
-    sim_result = run_simulation(params)
-    depletion_year = sim_result.depletion_year
-
-    # 1950년생 ~ 2020년생 (10년 단위)
-    birth_years = list(range(1950, 2030, 5))
+    # 시뮬레이션으로 고갈 연도 확인 (동시 요청과 함께 배치 계산)
+    (depletion_year,) = await DEPLETION_BATCHER.submit([params])
+    if depletion_year > params.end_year:
+        depletion_year = None
 
     generations = [
         calculate_generation_data(birth_year, params, depletion_year)
-        for birth_year in birth_years
+        for birth_year in BIRTH_YEARS
     ]
 
     # 클러스터링
@@ -181,6 +201,97 @@ async def analyze_generations(params: SimulationParams):
     )
 
 
+@timed("stochastic_generations")
+def stochastic_generation_summary(
+    params: SimulationParams,
+    n_simulations: int,
+    model: ReturnModel,
+    sampling: str = "pseudo",
+    rng: Optional[np.random.Generator] = None,
+    demography: Optional[DemographicUncertainty] = None,
+) -> StochasticGenerationResult:
+    """
+    Monte Carlo 수익률 경로별 고갈 연도로 (경로 수 × 세대 수) 수익비 행렬을 한 번에 계산하고
+    세대별 수익비 / 형평성 지수 분포로 요약 (경로별 calculate_generation_data 호출 없음)
+    """
+    rng = rng or np.random.default_rng()
+    n_years = params.end_year - params.start_year + 1
+    returns, _ = sample_return_paths(n_simulations, n_years, model, rng, sampling)
+    flows = sample_cashflows(params, returns, model, demography, rng, sampling)
+    years = simulate_depletion_years(params, returns, flows)
+    depletion_year = np.where(years > params.end_year, np.inf, years)
+
+    policy = cohort_policy(params, BIRTH_YEARS)
+    rois = generation_roi_matrix(
+        BIRTH_YEARS,
+        policy["contribution_rate"][np.newaxis, :],
+        policy["replacement_rate"][np.newaxis, :],
+        policy["pension_age"][np.newaxis, :],
+        depletion_year,
+    )
+    equity = equity_index_matrix(rois)
+
+    # 수급 종료 (85세) 전에 소진되면 급여 감소
+    benefit_end_year = np.asarray(BIRTH_YEARS)[np.newaxis, :] + 85
+    reduced = depletion_year[:, np.newaxis] < benefit_end_year
+
+    percentiles = np.percentile(rois, BAND_PERCENTILES, axis=0)
+    cohorts = [
+        CohortRoiDistribution(
+            birth_year=birth_year,
+            roi_mean=round(float(rois[:, i].mean()), 3),
+            roi_percentiles={f"p{p}": round(float(percentiles[k, i]), 3) for k, p in enumerate(BAND_PERCENTILES)},
+            roi_spread=round(float(percentiles[-1, i] - percentiles[0, i]), 3),
+            reduction_probability=round(float(reduced[:, i].mean()), 4),
+        )
+        for i, birth_year in enumerate(BIRTH_YEARS)
+    ]
+    equity_percentiles = np.percentile(equity, BAND_PERCENTILES)
+
+    return StochasticGenerationResult(
+        cohorts=cohorts,
+        equity_index_mean=round(float(equity.mean()), 3),
+        equity_index_percentiles={f"p{p}": round(float(v), 3) for p, v in zip(BAND_PERCENTILES, equity_percentiles)},
+        depletion_probability=round(float(np.isfinite(depletion_year).mean()), 4),
+        highest_risk_birth_year=max(cohorts, key=lambda cohort: cohort.roi_spread).birth_year,
+        n_simulations=n_simulations,
+        sampling=sampling,
+        return_model=model.name,
+        stochastic_demography=demography is not None,
+    )
+
+
+@router.post("/generations/stochastic", response_model=StochasticGenerationResult)
+async def analyze_generations_stochastic(
+    params: SimulationParams,
+    n_simulations: int = Query(1000, ge=100, le=10000, description="시뮬레이션 횟수"),
+    use_regime_switching: bool = Query(True, description="경제 상황 전환 모델 사용"),
+    return_model: Optional[str] = Query(None, description="수익률 모델 (normal | regime_iid | markov_regime | ar1 | bootstrap)"),
+    std_return: float = Query(DEFAULT_STD_RETURN, gt=0, le=0.30, description="수익률 표준편차"),
+    sampling: str = Query("pseudo", pattern="^(pseudo|antithetic|sobol|halton)$", description="표본 추출 방식"),
+    stochastic_demography: bool = Query(False, description="출산율 / 사망력 / 임금상승률도 경로별로 변동"),
+    seed: Optional[int] = Query(None, ge=0, description="난수 시드"),
+):
+    """
+    확률적 세대별 분석
+
+    결정론적 고갈 연도 하나 대신 Monte Carlo 수익률 경로(/monte-carlo와 같은 모델 / 옵션)별 고갈 연도로
+    세대별 수익비 분포를 계산합니다.
+
+    - cohorts: 세대별 수익비 평균 / 5·25·50·75·95 백분위 / 90% 구간 폭 / 급여 감소 확률
+    - equity_index_*: 경로별 세대간 형평성 지수의 분포
+    - highest_risk_birth_year: 수익비 90% 구간이 가장 넓은 세대
+    """
+    try:
+        model = resolve_return_model(params, return_model, use_regime_switching, std_return)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    demography = resolve_demography(stochastic_demography)
+    return stochastic_generation_summary(
+        params, n_simulations, model, sampling, np.random.default_rng(seed), demography,
+    )
+
+
 @router.get("/generations/summary")
 async def get_generation_summary():
     """
@@ -201,9 +312,11 @@ async def compare_scenarios():
         "balanced": SimulationParams(contribution_rate=0.12, replacement_rate=0.43),  # 균형안
     }
 
+    # 시나리오들의 고갈 연도가 한 배치로 계산되도록 동시에 실행
+    analyses = await asyncio.gather(*(analyze_generations(params) for params in scenarios.values()))
+
     results = {}
-    for name, params in scenarios.items():
-        analysis = await analyze_generations(params)
+    for name, analysis in zip(scenarios, analyses):
         results[name] = {
             "equity_index": analysis.equity_index,
             "avg_roi": round(np.mean([g.roi for g in analysis.generations]), 2),
@@ -1,8 +1,15 @@
 """Health check endpoint"""
+import time
+
 from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from core.instrumentation import REGISTRY
 
 router = APIRouter()
 
+STARTED_AT = time.time()
+
 
 @router.get("/health")
 async def health_check():
@@ -10,4 +17,15 @@ async def health_check():
     return {
         "status": "healthy",
         "service": "npfs-ml-api",
+        "uptime_seconds": round(time.time() - STARTED_AT, 1),
     }
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """
+    Prometheus 텍스트 포맷 메트릭
+    - npfs_http_request_duration_seconds: 라우트별 요청 지연시간
+    - npfs_span_duration_seconds: 시뮬레이션/모델 로드/JSON 파싱/Monte Carlo 구간 시간
+    """
+    return PlainTextResponse(REGISTRY.render_prometheus(), media_type="text/plain; version=0.0.4")
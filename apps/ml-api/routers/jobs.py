@@ -0,0 +1,150 @@
+"""
+비동기 작업 엔드포인트
+POST로 작업을 등록하면 job_id를 바로 반환하고, GET /jobs/{job_id}로 상태와 결과를 조회
+동일한 입력의 작업이 실행 중이면 새로 계산하지 않고 기존 작업에 합류 (single-flight)
+"""
+from typing import List, Optional
+
+import numpy as np
+from fastapi import APIRouter, Body, HTTPException, Query
+
+from core.jobs import get_job_manager
+from core.monte_carlo import monte_carlo_summary
+from core.return_models import DEFAULT_STD_RETURN
+from core.sampling import resolve_demography, resolve_return_model
+from core.schemas import JobStatus, SimulationParams
+from core.simulation import batch_fund_summaries
+
+router = APIRouter()
+
+# 시나리오 일괄 계산 최대 개수
+MAX_SCENARIOS = 5000
+
+
+def run_monte_carlo_job(payload: dict) -> dict:
+    params = SimulationParams(**payload["params"])
+    options = payload["options"]
+    model = resolve_return_model(params, options["return_model"], options["use_regime_switching"], options["std_return"])
+    rng = np.random.default_rng(options["seed"])
+    summary = monte_carlo_summary(
+        params,
+        options["n_simulations"],
+        model,
+        sampling=options["sampling"],
+        control_variate=options["control_variate"],
+        rng=rng,
+        demography=resolve_demography(
+            options.get("stochastic_demography", False), options.get("demographic_correlation", 0.0)
+        ),
+        bin_years=options.get("histogram_bin_years", 5),
+        fund_bands=options.get("fund_bands", False),
+    )
+    return summary.model_dump()
+
+
+def run_scenarios_job(payload: dict) -> dict:
+    """시나리오별 고갈 연도 / 최대 적립금 요약 (기간이 같은 시나리오끼리 한 번에 계산)"""
+    scenarios = payload["scenarios"]
+    summaries = batch_fund_summaries([SimulationParams(**scenario) for scenario in scenarios])
+    results = [{"params": scenario, **summary} for scenario, summary in zip(scenarios, summaries)]
+    return {"n_scenarios": len(results), "scenarios": results}
+
+
+def run_retrain_job(payload: dict) -> dict:
+    from core.model_store import train_model
+    return train_model(n_samples=payload["n_samples"], seed=payload["seed"])
+
+
+JOB_HANDLERS = {
+    "monte-carlo": run_monte_carlo_job,
+    "scenarios": run_scenarios_job,
+    "retrain": run_retrain_job,
+}
+
+
+def job_manager():
+    """전역 JobManager (이 모듈의 작업 종류 등록)"""
+    manager = get_job_manager()
+    for kind, handler in JOB_HANDLERS.items():
+        if kind not in manager.kinds:
+            manager.register(kind, handler)
+    return manager
+
+
+def submit_job(kind: str, payload: dict) -> JobStatus:
+    manager = job_manager()
+    submitted = manager.submit(kind, payload)
+    status = manager.get(submitted["job_id"])
+    return JobStatus(**status, deduplicated=submitted["deduplicated"])
+
+
+@router.post("/jobs/monte-carlo", response_model=JobStatus, status_code=202)
+async def submit_monte_carlo_job(
+    params: SimulationParams,
+    n_simulations: int = Query(10000, ge=100, le=200000, description="시뮬레이션 횟수"),
+    use_regime_switching: bool = Query(True, description="경제 상황 전환 모델 사용"),
+    return_model: Optional[str] = Query(None, description="수익률 모델 이름"),
+    std_return: float = Query(DEFAULT_STD_RETURN, gt=0, le=0.30, description="수익률 표준편차"),
+    sampling: str = Query("pseudo", pattern="^(pseudo|antithetic|sobol|halton)$", description="표본 추출 방식"),
+    control_variate: bool = Query(False, description="결정론적 고갈 연도 기반 control variate 적용"),
+    seed: Optional[int] = Query(None, ge=0, description="난수 시드 (지정 시 재현 가능)"),
+    stochastic_demography: bool = Query(False, description="출산율 / 사망력 / 임금상승률도 경로별로 변동"),
+    demographic_correlation: float = Query(0.0, ge=-1, le=1, description="수익률 충격과 임금 / 출산 충격의 상관계수"),
+    histogram_bin_years: int = Query(5, ge=1, le=20, description="고갈 연도 히스토그램 구간 폭 (년)"),
+    fund_bands: bool = Query(False, description="연도별 기금 잔액 백분위 밴드 / 생존 곡선 포함"),
+):
+    """
+    대규모 Monte Carlo 작업 등록
+    """
+    # 잘못된 모델 이름은 등록 시점에 400
+    try:
+        resolve_return_model(params, return_model, use_regime_switching, std_return)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    payload = {
+        "params": params.model_dump(),
+        "options": {
+            "n_simulations": n_simulations,
+            "use_regime_switching": use_regime_switching,
+            "return_model": return_model,
+            "std_return": std_return,
+            "sampling": sampling,
+            "control_variate": control_variate,
+            "seed": seed,
+            "stochastic_demography": stochastic_demography,
+            "demographic_correlation": demographic_correlation,
+            "histogram_bin_years": histogram_bin_years,
+            "fund_bands": fund_bands,
+        },
+    }
+    return submit_job("monte-carlo", payload)
+
+
+@router.post("/jobs/scenarios", response_model=JobStatus, status_code=202)
+async def submit_scenarios_job(scenarios: List[SimulationParams] = Body(..., min_length=1, max_length=MAX_SCENARIOS)):
+    """
+    시나리오 일괄 계산 작업 등록 (시나리오별 고갈 연도, 최대 적립금)
+    """
+    return submit_job("scenarios", {"scenarios": [s.model_dump() for s in scenarios]})
+
+
+@router.post("/jobs/retrain", response_model=JobStatus, status_code=202)
+async def submit_retrain_job(
+    n_samples: int = Query(5000, ge=500, le=50000, description="학습 시나리오 수"),
+    seed: int = Query(42, ge=0, description="시나리오 생성 시드"),
+):
+    """
+    대리 모델 (SHAP 분석용 GradientBoosting) 재학습 작업 등록 (균등 무작위 시나리오 n_samples개)
+    """
+    return submit_job("retrain", {"n_samples": n_samples, "seed": seed})
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatus)
+async def get_job(job_id: str):
+    """
+    작업 상태 조회 (queued | running | succeeded | failed), 완료 시 result 포함
+    """
+    status = job_manager().get(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return JobStatus(**status)
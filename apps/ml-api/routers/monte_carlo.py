@@ -3,14 +3,30 @@ Monte Carlo 시뮬레이션 엔드포인트
 불확실성 분석
 """
 import numpy as np
-from fastapi import APIRouter, Query
-from typing import List
-
-from core.schemas import SimulationParams, MonteCarloResult
-from core.simulation import run_simulation, INITIAL_FUND_BALANCE, AVERAGE_CONTRIBUTION_YEARS, get_population_estimates
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from typing import Iterator, List, Optional
+
+from core.schemas import SimulationParams, MonteCarloResult, MonteCarloProgress
+from core.return_models import RETURN_MODELS, DEFAULT_STD_RETURN, ReturnModel, get_return_model
+from core.monte_carlo import monte_carlo_summary, run_monte_carlo_batch, summarize_depletion_years
+from core.sampling import (
+    default_model_name,
+    quantile_margins,
+    resolve_demography,
+    resolve_return_model,
+    sample_return_paths,
+)
+from core.sketches import FundBandAccumulator
+from core.simulation import policy_path, simulate_depletion_years
+from core.stochastic_paths import DemographicUncertainty
 
 router = APIRouter()
 
+# 스트리밍 조기 종료: 추정량 신뢰구간의 표준오차 배수
+# 배치마다 반복 판정하므로 (순차 검정) 한 번 판정하는 95% 구간 (1.96)보다 넓게 잡음
+CONVERGENCE_Z = 3.0
+
 
 def run_simulation_with_variable_returns(
     params: SimulationParams,
@@ -18,50 +34,12 @@ def run_simulation_with_variable_returns(
 ) -> int:
     """
     변동 수익률로 시뮬레이션 실행
-    return_series: 연도별 수익률 리스트
+    return_series: 연도별 수익률 리스트 (부족한 연도는 params.fund_return_rate 적용, 일정이면 해당 연도 값)
     """
-    fund_balance = INITIAL_FUND_BALANCE
-
-    for i, year in enumerate(range(params.start_year, params.end_year + 1)):
-        year_diff = year - 2024
-
-        pop = get_population_estimates(year, params.pension_age)
-        contributors = pop["contributors"]
-        beneficiaries = pop["beneficiaries"]
-
-        average_income = 4200 * (1.02 ** year_diff)
-
-        # 보험료 수입
-        contribution_income = (
-            (contributors * 1000) *
-            (average_income * 10000) *
-            params.contribution_rate /
-            1e12
-        )
-
-        # 급여 지출
-        average_pension = (
-            average_income * 10000 *
-            params.replacement_rate *
-            (AVERAGE_CONTRIBUTION_YEARS / 40)
-        )
-        benefit_expenditure = (
-            (beneficiaries * 1000) *
-            average_pension /
-            1e12
-        )
-
-        # 변동 수익률 적용
-        current_return = return_series[i] if i < len(return_series) else params.fund_return_rate
-        investment_income = fund_balance * current_return if fund_balance > 0 else 0
-
-        net_balance = contribution_income + investment_income - benefit_expenditure
-        fund_balance += net_balance
-
-        if fund_balance <= 0:
-            return year
-
-    return params.end_year + 1  # 고갈 안됨
+    n_years = params.end_year - params.start_year + 1
+    returns = np.broadcast_to(policy_path(params, "fund_return_rate"), n_years).copy()
+    returns[:min(len(return_series), n_years)] = return_series[:n_years]
+    return int(simulate_depletion_years(params, returns[np.newaxis, :])[0])
 
 
 def generate_return_series(
@@ -75,25 +53,25 @@ def generate_return_series(
 
     - regime_switching: True면 경제 상황(호황/불황) 전환 반영
     """
-    if regime_switching:
-        # Regime-switching model
-        # 호황: 평균 7%, 표준편차 5%
-        # 불황: 평균 2%, 표준편차 12%
-        regimes = np.random.choice([0, 1], size=n_years, p=[0.7, 0.3])  # 70% 호황, 30% 불황
+    return generate_return_matrix(1, n_years, mean_return, std_return, regime_switching)[0].tolist()
 
-        returns = []
-        for regime in regimes:
-            if regime == 0:  # 호황
-                r = np.random.normal(0.07, 0.05)
-            else:  # 불황
-                r = np.random.normal(0.02, 0.12)
-            returns.append(max(-0.30, min(0.30, r)))  # -30% ~ +30% 제한
 
-        return returns
-    else:
-        # 단순 정규분포
-        returns = np.random.normal(mean_return, std_return, n_years)
-        return [max(-0.30, min(0.30, r)) for r in returns]
+def generate_return_matrix(
+    n_paths: int,
+    n_years: int,
+    mean_return: float = 0.055,
+    std_return: float = 0.08,
+    regime_switching: bool = True,
+    rng: Optional[np.random.Generator] = None,
+    sampling: str = "pseudo",
+) -> np.ndarray:
+    """
+    수익률 경로 행렬 (n_paths × n_years) 생성
+    경로별 Python 반복 없이 한 번에 샘플링
+    """
+    model = get_return_model(default_model_name(regime_switching), mean_return, std_return)
+    returns, _ = sample_return_paths(n_paths, n_years, model, rng, sampling)
+    return returns
 
 
 @router.post("/monte-carlo", response_model=MonteCarloResult)
@@ -101,6 +79,14 @@ async def run_monte_carlo(
     params: SimulationParams,
     n_simulations: int = Query(1000, ge=100, le=10000, description="시뮬레이션 횟수"),
     use_regime_switching: bool = Query(True, description="경제 상황 전환 모델 사용"),
+    return_model: Optional[str] = Query(None, description="수익률 모델 (normal | regime_iid | markov_regime | ar1 | bootstrap)"),
+    std_return: float = Query(DEFAULT_STD_RETURN, gt=0, le=0.30, description="수익률 표준편차"),
+    sampling: str = Query("pseudo", pattern="^(pseudo|antithetic|sobol|halton)$", description="표본 추출 방식"),
+    control_variate: bool = Query(False, description="결정론적 고갈 연도 기반 control variate 적용"),
+    stochastic_demography: bool = Query(False, description="출산율 / 사망력 / 임금상승률도 경로별로 변동"),
+    demographic_correlation: float = Query(0.0, ge=-1, le=1, description="수익률 충격과 임금 / 출산 충격의 상관계수"),
+    histogram_bin_years: int = Query(5, ge=1, le=20, description="고갈 연도 히스토그램 구간 폭 (년)"),
+    fund_bands: bool = Query(False, description="연도별 기금 잔액 백분위 밴드 / 생존 곡선 포함"),
 ):
     """
     Monte Carlo 시뮬레이션
@@ -108,50 +94,157 @@ async def run_monte_carlo(
     기금 수익률의 변동성을 반영하여 고갈 시점의 분포를 계산합니다.
 
     - n_simulations: 시뮬레이션 횟수 (기본 1000, 최대 10000)
-    - use_regime_switching: True면 호황/불황 전환 모델 사용
+    - use_regime_switching: True면 호황/불황 전환 모델 사용 (return_model 미지정 시)
+    - return_model: 수익률 모델 이름 (core.return_models 레지스트리)
+    - sampling: pseudo(기본) | antithetic | sobol | halton (분산 감소)
+    - control_variate: 평균 고갈 연도를 control variate로 보정
+    - effective_sample_size: 평균 추정 정밀도 기준 유효 표본 수
+    - stochastic_demography: 수익률과 함께 출산율, 사망력, 임금상승률 경로도 확률적으로 생성
+    - demographic_correlation: 호황/불황 수익률 충격과 임금 / 출산 충격의 상관계수
+    - histogram_bin_years: distribution 히스토그램 구간 폭 (기본 5년)
+    - fund_bands: 연도별 기금 잔액 5/25/50/75/95 백분위 (KLL 스케치)와 생존 곡선 P(기금 > 0)
     """
-    np.random.seed(None)  # 매번 다른 결과
+    try:
+        model = resolve_return_model(params, return_model, use_regime_switching, std_return)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    demography = resolve_demography(stochastic_demography, demographic_correlation)
+    return monte_carlo_summary(
+        params, n_simulations, model, sampling, control_variate,
+        demography=demography, bin_years=histogram_bin_years, fund_bands=fund_bands,
+    )
+
+
+@router.get("/monte-carlo/models")
+async def list_return_models():
+    """
+    사용 가능한 수익률 모델 목록
+    """
+    return {name: (cls.__doc__ or "").strip().splitlines()[0] for name, cls in RETURN_MODELS.items()}
 
-    n_years = params.end_year - params.start_year + 1
-    results = []
 
-    for _ in range(n_simulations):
-        return_series = generate_return_series(
-            n_years,
-            mean_return=params.fund_return_rate,
-            regime_switching=use_regime_switching,
+def iter_monte_carlo_progress(
+    params: SimulationParams,
+    n_simulations: int,
+    batch_size: int,
+    model: ReturnModel,
+    tolerance: float = 0.0,
+    patience: int = 2,
+    rng: Optional[np.random.Generator] = None,
+    sampling: str = "pseudo",
+    demography: Optional[DemographicUncertainty] = None,
+    bin_years: int = 5,
+    fund_bands: bool = False,
+) -> Iterator[MonteCarloProgress]:
+    """
+    배치 단위로 경로를 실행하며 누적 결과를 순차적으로 반환
+
+    tolerance > 0이면 중앙값과 90%/50% 신뢰구간 폭 추정량의 오차 범위
+    (CONVERGENCE_Z 배 quantile_margins, 표본 수의 제곱근에 반비례, 구간 폭은 양 끝 오차의 제곱합 제곱근)가
+    patience번 연속으로 tolerance(년) 미만일 때 조기 종료
+    fund_bands면 배치마다 기금 잔액 스케치를 갱신 (메모리는 경로 수와 무관하게 연도 수에 비례)
+    """
+    rng = rng or np.random.default_rng()
+    bands = FundBandAccumulator(params.start_year, params.end_year, rng=rng) if fund_bands else None
+    results = np.empty(0, dtype=np.int64)
+    groups = np.empty(0, dtype=np.int64)
+    stable_batches = 0
+    batch = 0
+
+    while len(results) < n_simulations:
+        n_paths = min(batch_size, n_simulations - len(results))
+        batch_results, batch_groups = run_monte_carlo_batch(params, n_paths, model, rng, sampling, demography, bands)
+        # 배치 간 그룹 번호가 겹치지 않도록 오프셋
+        offset = groups.max() + 1 if len(groups) else 0
+        results = np.concatenate([results, batch_results])
+        groups = np.concatenate([groups, batch_groups + offset])
+        batch += 1
+
+        p5, p25, p50, p75, p95 = np.percentile(results, [5, 25, 50, 75, 95])
+        margin = None
+        if tolerance > 0:
+            m5, m25, m50, m75, m95 = quantile_margins(
+                results, (5, 25, 50, 75, 95), CONVERGENCE_Z, censored_from=params.end_year + 1
+            )
+            margin = float(max(m50, np.hypot(m5, m95), np.hypot(m25, m75)))
+            stable_batches = stable_batches + 1 if margin < tolerance else 0
+
+        converged = tolerance > 0 and stable_batches >= patience
+        summary = summarize_depletion_years(results, groups, sampling, model.name, demography is not None, bin_years)
+        if bands is not None:
+            summary.fund_bands = bands.bands()
+        yield MonteCarloProgress(
+            **summary.model_dump(),
+            batch=batch,
+            ci_90_width=round(float(p95 - p5), 3),
+            ci_50_width=round(float(p75 - p25), 3),
+            histogram_start=max(2030, int(np.min(results))),
+            convergence_margin=None if margin is None else round(margin, 3),
+            converged=converged,
+            done=converged or len(results) >= n_simulations,
         )
-        depletion_year = run_simulation_with_variable_returns(params, return_series)
-        results.append(depletion_year)
-
-    results = np.array(results)
-
-    # 히스토그램 데이터 (10년 단위 bins)
-    min_year = max(2030, int(np.min(results)))
-    max_year = min(2100, int(np.max(results)))
-    bins = list(range(min_year, max_year + 5, 5))
-
-    hist, _ = np.histogram(results, bins=bins)
-    distribution = hist.tolist()
-
-    return MonteCarloResult(
-        median_depletion_year=int(np.median(results)),
-        ci_90_lower=int(np.percentile(results, 5)),
-        ci_90_upper=int(np.percentile(results, 95)),
-        ci_50_lower=int(np.percentile(results, 25)),
-        ci_50_upper=int(np.percentile(results, 75)),
-        distribution=distribution,
+        if converged:
+            return
+
+
+@router.post("/monte-carlo/stream")
+def stream_monte_carlo(
+    params: SimulationParams,
+    n_simulations: int = Query(10000, ge=100, le=100000, description="최대 시뮬레이션 횟수"),
+    batch_size: int = Query(500, ge=100, le=10000, description="배치당 경로 수"),
+    use_regime_switching: bool = Query(True, description="경제 상황 전환 모델 사용"),
+    return_model: Optional[str] = Query(None, description="수익률 모델 이름"),
+    std_return: float = Query(DEFAULT_STD_RETURN, gt=0, le=0.30, description="수익률 표준편차"),
+    tolerance: float = Query(0.0, ge=0, description="추정량 오차 범위 허용오차 (년, 0이면 조기 종료 없음)"),
+    sampling: str = Query("pseudo", pattern="^(pseudo|antithetic|sobol|halton)$", description="표본 추출 방식"),
+    format: str = Query("ndjson", pattern="^(ndjson|sse)$", description="ndjson 또는 sse"),
+    stochastic_demography: bool = Query(False, description="출산율 / 사망력 / 임금상승률도 경로별로 변동"),
+    demographic_correlation: float = Query(0.0, ge=-1, le=1, description="수익률 충격과 임금 / 출산 충격의 상관계수"),
+    histogram_bin_years: int = Query(5, ge=1, le=20, description="고갈 연도 히스토그램 구간 폭 (년)"),
+    fund_bands: bool = Query(False, description="연도별 기금 잔액 백분위 밴드 / 생존 곡선 포함"),
+):
+    """
+    스트리밍 Monte Carlo 시뮬레이션
+
+    배치마다 누적 중앙값, 50%/90% 신뢰구간, 히스토그램을 전송합니다.
+
+    - format=ndjson: 배치당 JSON 한 줄 (application/x-ndjson)
+    - format=sse: Server-Sent Events (progress 이벤트, 마지막은 result 이벤트)
+    - tolerance: 중앙값 / 신뢰구간 폭 추정량의 오차 범위 (convergence_margin)가 tolerance(년) 미만이면 n_simulations 전에 종료
+    동기 함수라 threadpool에서 실행되고, 배치 계산도 응답 스트림의 threadpool 반복에서 진행 (이벤트 루프를 막지 않음)
+    """
+    try:
+        model = resolve_return_model(params, return_model, use_regime_switching, std_return)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    progress = iter_monte_carlo_progress(
+        params,
         n_simulations=n_simulations,
+        batch_size=batch_size,
+        model=model,
+        tolerance=tolerance,
+        sampling=sampling,
+        demography=resolve_demography(stochastic_demography, demographic_correlation),
+        bin_years=histogram_bin_years,
+        fund_bands=fund_bands,
     )
 
+    def encode() -> Iterator[str]:
+        for event in progress:
+            payload = event.model_dump_json()
+            if format == "sse":
+                yield f"event: {'result' if event.done else 'progress'}\ndata: {payload}\n\n"
+            else:
+                yield payload + "\n"
+
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(encode(), media_type=media_type, headers={"Cache-Control": "no-cache"})
+
 
 @router.get("/monte-carlo/quick")
 async def quick_monte_carlo():
     """
     빠른 Monte Carlo (기본 설정, 500회)
     """
-    return await run_monte_carlo(
-        params=SimulationParams(),
-        n_simulations=500,
-        use_regime_switching=True,
-    )
+    params = SimulationParams()
+    return monte_carlo_summary(params, 500, resolve_return_model(params, None, use_regime_switching=True))
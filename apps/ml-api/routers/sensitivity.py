@@ -0,0 +1,154 @@
+"""
+전역 민감도 분석 엔드포인트
+정책 변수 범위에 대한 고갈 연도 / 세대간 형평성 지수의 Sobol 지수
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Tuple
+
+import numpy as np
+from fastapi import APIRouter
+
+from core.generations import BIRTH_YEARS, cohort_policy, equity_index_matrix, generation_roi_matrix
+from core.gradients import GRADIENT_PARAMETERS, fund_tangents
+from core.instrumentation import timed
+from core.schemas import FundGradients, SimulationParams, SobolIndex, SobolRequest, SobolResult
+from core.sensitivity import saltelli_design, scale_design, sobol_indices
+from core.simulation import policy_depletion_years, policy_path
+from core.surrogate import SURROGATE_FEATURES as FEATURE_NAMES
+
+router = APIRouter()
+
+SENSITIVITY_OUTPUTS = ("depletion_year", "equity_index")
+
+# 평가 청크 크기 (병렬 단위, 청크당 현금흐름 행렬 약 청크 × 연도 수 × 2)
+EVALUATION_CHUNK = 8192
+
+
+def evaluate_outputs(base: SimulationParams, columns: Dict[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    시나리오별 (고갈 연도, 형평성 지수), 범위에 없는 변수는 base 값 고정
+    (base가 정책 일정이면 연도별 값 / 세대별 적용 값)
+    """
+    n = len(next(iter(columns.values())))
+    inputs, cohort_inputs = {}, {}
+    cohort = cohort_policy(base, BIRTH_YEARS)
+    for name in FEATURE_NAMES:
+        if name in columns:
+            inputs[name] = cohort_inputs[name] = columns[name]
+            continue
+        path = policy_path(base, name)
+        inputs[name] = np.full(n, path) if path.ndim == 0 else np.broadcast_to(path, (n, len(path)))
+        cohort_inputs[name] = cohort.get(name, np.zeros(len(BIRTH_YEARS)))[np.newaxis, :]
+    years = policy_depletion_years(base, **inputs)
+    depletion_year = np.where(years > base.end_year, np.inf, years)
+    rois = generation_roi_matrix(
+        BIRTH_YEARS,
+        cohort_inputs["contribution_rate"],
+        cohort_inputs["replacement_rate"],
+        cohort_inputs["pension_age"],
+        depletion_year,
+    )
+    return years.astype(float), equity_index_matrix(rois)
+
+
+@timed("sobol")
+def run_sobol_analysis(request: SobolRequest) -> SobolResult:
+    """Saltelli 설계 전체 (A, B, A_B)를 청크 단위로 평가하고 출력별 Sobol 지수 계산"""
+    rng = np.random.default_rng(request.seed)
+    names = [name for name in FEATURE_NAMES if name in request.ranges]
+    d, n = len(names), request.n_samples
+
+    a, b, ab = saltelli_design(n, d, request.sampling, rng)
+    points = np.concatenate([a, b, ab.reshape(-1, d)])
+    columns = scale_design(points, names, request.ranges)
+
+    chunks = [slice(start, start + EVALUATION_CHUNK) for start in range(0, len(points), EVALUATION_CHUNK)]
+    evaluate = lambda rows: evaluate_outputs(request.params, {name: col[rows] for name, col in columns.items()})
+    if request.workers > 1 and len(chunks) > 1:
+        # numpy 연산은 GIL을 놓으므로 스레드로 청크 병렬 평가
+        with ThreadPoolExecutor(max_workers=request.workers) as executor:
+            results = list(executor.map(evaluate, chunks))
+    else:
+        results = [evaluate(rows) for rows in chunks]
+
+    indices, variance = {}, {}
+    for k, output in enumerate(SENSITIVITY_OUTPUTS):
+        values = np.concatenate([result[k] for result in results])
+        estimate = sobol_indices(
+            values[:n], values[n:2 * n], values[2 * n:].reshape(d, n),
+            request.n_bootstrap, request.confidence, rng,
+        )
+        variance[output] = round(estimate["variance"], 6)
+        indices[output] = {
+            name: SobolIndex(
+                first_order=round(float(estimate["first_order"][i]), 4),
+                first_order_ci=np.round(estimate["first_order_ci"][i], 4).tolist(),
+                total=round(float(estimate["total"][i]), 4),
+                total_ci=np.round(estimate["total_ci"][i], 4).tolist(),
+            )
+            for i, name in enumerate(names)
+        }
+
+    return SobolResult(
+        indices=indices,
+        variance=variance,
+        parameters=names,
+        n_samples=n,
+        n_evaluations=len(points),
+        sampling=request.sampling,
+        confidence=request.confidence,
+    )
+
+
+@router.post("/sobol", response_model=SobolResult)
+def get_sobol_indices(request: SobolRequest = SobolRequest()):
+    """
+    Sobol 전역 민감도 분석
+
+    ranges의 변수들을 균등분포로 두고 고갈 연도와 세대간 형평성 지수의 분산 분해
+
+    - first_order: 변수 단독 기여 (Saltelli 2010), total: 상호작용 포함 기여 (Jansen)
+    - *_ci: bootstrap 신뢰구간 (confidence 수준)
+    - 평가 수: n_samples × (변수 수 + 2), 정책 변수만 다른 시나리오를 행렬로 한 번에 계산
+    - workers > 1이면 평가 청크를 스레드로 병렬 실행
+
+    동기 함수로 두어 threadpool에서 실행 (평가가 길어도 이벤트 루프를 막지 않음)
+    """
+    return run_sobol_analysis(request)
+
+
+@timed("gradients")
+def fund_gradients(params: SimulationParams) -> FundGradients:
+    """기금 궤적 / 연속 고갈 시점과 정책 변수 4개에 대한 미분 (한 번의 forward-mode 시뮬레이션)"""
+    tangents = fund_tangents(params)
+    years = list(range(params.start_year, params.end_year + 1))
+    depletion_time = float(tangents.depletion_time[0])
+    depleted = not np.isnan(depletion_time)
+    return FundGradients(
+        depletion_year=params.start_year + int(np.ceil(depletion_time)) if depleted else None,
+        depletion_time=round(params.start_year + depletion_time, 4) if depleted else None,
+        depletion_time_gradient={
+            name: round(float(value), 4) for name, value in zip(GRADIENT_PARAMETERS, tangents.depletion_gradients[0])
+        } if depleted else None,
+        years=years,
+        fund_balance=np.round(tangents.balances[0], 1).tolist(),
+        fund_balance_gradient={
+            name: np.round(tangents.balance_gradients[0, :, i], 2).tolist()
+            for i, name in enumerate(GRADIENT_PARAMETERS)
+        },
+    )
+
+
+@router.post("/gradients", response_model=FundGradients)
+async def get_fund_gradients(params: SimulationParams):
+    """
+    정책 변수 미분
+
+    - depletion_time: 고갈 연도 안에서 잔액을 선형 보간한 연속 고갈 시점 (올림하면 depletion_year)
+    - depletion_time_gradient: 연속 고갈 시점의 변수별 미분 (년 / 변수 1단위)
+    - fund_balance_gradient: 연도별 기금 잔액의 변수별 미분 (조원 / 변수 1단위)
+
+    변수마다 ±변화 시뮬레이션을 따로 돌리지 않고 잔액 점화식과 함께 접선을 전파 (forward-mode)
+    수급 연령은 정수 연령 사이를 선형 보간한 미분
+    """
+    return fund_gradients(params)
@@ -3,78 +3,73 @@ SHAP 분석 엔드포인트
 변수 중요도 및 영향도 분석
 """
 import numpy as np
-from fastapi import APIRouter
-from typing import Optional
-import pickle
-from pathlib import Path
+from fastapi import APIRouter, Query
+from typing import List, Optional, Sequence, Tuple
 
-from core.schemas import SimulationParams, ShapResult
-from core.simulation import run_simulation_simple
+from core.batching import DEPLETION_BATCHER
+from core.gradients import GRADIENT_PARAMETERS, fund_tangents
+from core.model_store import load_model, model_version
+from core.schemas import SimulationParams, ShapResult, SurrogatePrediction, SurrogateUsage, shift_policy
+from core.surrogate import DEFAULT_TOLERANCE, SURROGATE_FEATURES, SurrogateEstimate, error_profile, json_safe, surrogate_estimates
+from core.simulation import batch_depletion_years
 
 router = APIRouter()
 
-# 모델 경로
-MODEL_PATH = Path(__file__).parent.parent / "models" / "xgb_depletion.pkl"
 
+FEATURE_NAMES = list(SURROGATE_FEATURES)
 
-def train_model_if_needed():
-    """
-    모델이 없으면 학습하여 저장
-    실제로는 별도 스크립트로 학습하지만, 데모용으로 on-demand 학습
-    """
-    if MODEL_PATH.exists():
-        return
-
-    from sklearn.ensemble import GradientBoostingRegressor
-
-    print("Training model...")
 
-    # 시나리오 생성
-    np.random.seed(42)
-    n_samples = 5000
+def compute_feature_importance(model, feature_names: list) -> dict:
+    """특성 중요도 계산"""
+    importance = model.feature_importances_
+    return {name: float(imp) for name, imp in zip(feature_names, importance)}
 
-    scenarios = []
-    targets = []
 
-    for _ in range(n_samples):
-        params = {
-            "contribution_rate": np.random.uniform(0.09, 0.15),
-            "replacement_rate": np.random.uniform(0.35, 0.50),
-            "pension_age": np.random.randint(63, 70),
-            "fund_return_rate": np.random.uniform(0.03, 0.08),
-        }
-        scenarios.append(list(params.values()))
-        targets.append(run_simulation_simple(**params))
+# 변수별 단위 변화 (효과 이름, 파라미터, 변화량)
+FEATURE_STEPS = [
+    ("contribution_rate_1pp", "contribution_rate", 0.01),  # 보험료율 1%p 증가
+    ("replacement_rate_1pp_down", "replacement_rate", -0.01),  # 소득대체율 1%p 감소
+    ("pension_age_1yr", "pension_age", 1),  # 수급연령 1세 상향
+    ("fund_return_rate_1pp", "fund_return_rate", 0.01),  # 기금수익률 1%p 증가
+]
 
-    X = np.array(scenarios)
-    y = np.array(targets)
 
-    model = GradientBoostingRegressor(
-        n_estimators=100,
-        max_depth=5,
-        random_state=42
+def shap_scenarios(params: SimulationParams) -> List[SimulationParams]:
+    """
+    SHAP 응답에 필요한 고정 수익률 시나리오
+    [현재 설정, 변수별 단위 변화 4개, 기본 설정 (현행 유지)]
+    정책 일정은 모든 연도에 같은 단위 변화를 더함
+    """
+    base = SimulationParams(
+        contribution_rate=params.contribution_rate,
+        replacement_rate=params.replacement_rate,
+        pension_age=params.pension_age,
+        fund_return_rate=params.fund_return_rate,
     )
-    model.fit(X, y)
-
-    # 저장
-    MODEL_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with open(MODEL_PATH, "wb") as f:
-        pickle.dump(model, f)
-
-    print(f"Model saved to {MODEL_PATH}")
+    # 단위 변화는 입력 범위 경계를 넘을 수 있으므로 검증 없이 복사
+    changed = [
+        base.model_copy(update={field: shift_policy(getattr(base, field), delta)})
+        for _, field, delta in FEATURE_STEPS
+    ]
+    return [base, *changed, SimulationParams()]
 
 
-def load_model():
-    """학습된 모델 로드"""
-    train_model_if_needed()
-    with open(MODEL_PATH, "rb") as f:
-        return pickle.load(f)
+def feature_effects_from_years(years: List[int]) -> dict:
+    """shap_scenarios 순서의 고갈 연도로 변수별 효과 (년) 계산"""
+    base_year = years[0]
+    return {name: year - base_year for (name, _, _), year in zip(FEATURE_STEPS, years[1:])}
 
 
-def compute_feature_importance(model, feature_names: list) -> dict:
-    """특성 중요도 계산"""
-    importance = model.feature_importances_
-    return {name: float(imp) for name, imp in zip(feature_names, importance)}
+def marginal_feature_effects(params: SimulationParams) -> Optional[dict]:
+    """
+    연속 고갈 시점의 정책 변수 미분 × 단위 변화 (년), 한 번의 forward-mode 시뮬레이션으로 계산
+    정수 연도 차이 (feature_effects)와 달리 0 / 계단 없이 매끄러움, 기간 안에 고갈되지 않으면 None
+    """
+    tangents = fund_tangents(shap_scenarios(params)[0])
+    if np.isnan(tangents.depletion_time[0]):
+        return None
+    gradient = dict(zip(GRADIENT_PARAMETERS, tangents.depletion_gradients[0]))
+    return {name: round(float(gradient[field] * delta), 3) for name, field, delta in FEATURE_STEPS}
 
 
 def compute_feature_effects(params: SimulationParams) -> dict:
@@ -82,94 +77,124 @@ def compute_feature_effects(params: SimulationParams) -> dict:
     각 변수를 변화시켰을 때 고갈 연도에 미치는 영향 계산
     (단위 변화당 연도 변화)
     """
-    base_year = run_simulation_simple(
-        contribution_rate=params.contribution_rate,
-        replacement_rate=params.replacement_rate,
-        pension_age=params.pension_age,
-        fund_return_rate=params.fund_return_rate,
-    )
+    scenarios = shap_scenarios(params)[:-1]
+    return feature_effects_from_years(batch_depletion_years(scenarios).tolist())
 
-    effects = {}
 
-    # 보험료율 1%p 증가 효과
-    year_with_change = run_simulation_simple(
-        contribution_rate=params.contribution_rate + 0.01,
-        replacement_rate=params.replacement_rate,
-        pension_age=params.pension_age,
-        fund_return_rate=params.fund_return_rate,
-    )
-    effects["contribution_rate_1pp"] = year_with_change - base_year
+def surrogate_year(params: SimulationParams, estimate: SurrogateEstimate) -> int:
+    """대리 모델 예측을 고갈 연도로 반올림 (시뮬레이션 기간, 미고갈 end_year + 1 안으로)"""
+    return int(np.clip(round(estimate.predicted), params.start_year, params.end_year + 1))
 
-    # 소득대체율 1%p 감소 효과
-    year_with_change = run_simulation_simple(
-        contribution_rate=params.contribution_rate,
-        replacement_rate=params.replacement_rate - 0.01,
-        pension_age=params.pension_age,
-        fund_return_rate=params.fund_return_rate,
-    )
-    effects["replacement_rate_1pp_down"] = year_with_change - base_year
-
-    # 수급연령 1세 상향 효과
-    year_with_change = run_simulation_simple(
-        contribution_rate=params.contribution_rate,
-        replacement_rate=params.replacement_rate,
-        pension_age=params.pension_age + 1,
-        fund_return_rate=params.fund_return_rate,
-    )
-    effects["pension_age_1yr"] = year_with_change - base_year
 
-    # 기금수익률 1%p 증가 효과
-    year_with_change = run_simulation_simple(
-        contribution_rate=params.contribution_rate,
-        replacement_rate=params.replacement_rate,
-        pension_age=params.pension_age,
-        fund_return_rate=params.fund_return_rate + 0.01,
+async def scenario_depletion_years(
+    scenarios: Sequence[SimulationParams],
+    surrogate: bool = False,
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> Tuple[List[int], Optional[SurrogateUsage]]:
+    """
+    시나리오들의 고정 수익률 고갈 연도
+    surrogate면 오차 상한이 tolerance 이하인 시나리오는 대리 모델 예측 (반올림)으로 답하고
+    나머지만 동시 요청들과 함께 배치 시뮬레이션
+    """
+    if not surrogate:
+        return await DEPLETION_BATCHER.submit(list(scenarios)), None
+
+    version = model_version()
+    estimates = surrogate_estimates(load_model(), version, scenarios)
+    served = [estimate.within(tolerance) for estimate in estimates]
+    fallback = [params for params, ok in zip(scenarios, served) if not ok]
+    exact = iter(await DEPLETION_BATCHER.submit(fallback) if fallback else [])
+
+    years = [
+        surrogate_year(params, estimate) if ok else next(exact)
+        for params, estimate, ok in zip(scenarios, estimates, served)
+    ]
+    bounds = [estimate.error_bound for estimate, ok in zip(estimates, served) if ok]
+    return years, SurrogateUsage(
+        version=version,
+        tolerance=tolerance,
+        served=len(bounds),
+        fallback=len(fallback),
+        max_error_bound=round(max(bounds), 3) if bounds else None,
     )
-    effects["fund_return_rate_1pp"] = year_with_change - base_year
-
-    return effects
 
 
 @router.post("/shap", response_model=ShapResult)
-async def get_shap_analysis(params: SimulationParams):
+async def get_shap_analysis(
+    params: SimulationParams,
+    surrogate: bool = Query(False, description="오차 상한이 tolerance 이하인 시나리오는 대리 모델 예측으로 응답"),
+    tolerance: float = Query(DEFAULT_TOLERANCE, gt=0, le=50, description="대리 모델 허용 오차 상한 (년)"),
+):
     """
     SHAP 기반 변수 중요도 분석
 
     - feature_importance: 모델 학습 기반 전체 변수 중요도
     - feature_effects: 현재 설정에서 각 변수 단위 변화의 효과 (년)
+    - marginal_effects: 같은 단위 변화의 연속 고갈 시점 미분 기반 효과 (년)
+    - surrogate=true: 고갈 연도를 대리 모델로 예측하고 상한을 넘는 시나리오만 시뮬레이션 (surrogate에 사용 내역)
     """
     model = load_model()
-    feature_names = ["contribution_rate", "replacement_rate", "pension_age", "fund_return_rate"]
 
     # 변수 중요도
-    importance = compute_feature_importance(model, feature_names)
+    importance = compute_feature_importance(model, FEATURE_NAMES)
 
-    # 변수별 효과 (현재 설정 기준)
-    effects = compute_feature_effects(params)
-
-    # 현재 설정의 고갈 연도
-    current_depletion = run_simulation_simple(
-        contribution_rate=params.contribution_rate,
-        replacement_rate=params.replacement_rate,
-        pension_age=params.pension_age,
-        fund_return_rate=params.fund_return_rate,
-    )
-
-    # 기본 설정 (현행 유지)의 고갈 연도
-    base_depletion = run_simulation_simple()
+    # 현재 설정, 변수별 단위 변화, 기본 설정의 고갈 연도
+    # 동시에 들어온 요청들과 함께 한 번의 배치 시뮬레이션으로 계산
+    years, usage = await scenario_depletion_years(shap_scenarios(params), surrogate, tolerance)
 
     return ShapResult(
         feature_importance=importance,
-        feature_effects=effects,
-        base_depletion_year=base_depletion,
-        current_depletion_year=current_depletion,
+        feature_effects=feature_effects_from_years(years),
+        base_depletion_year=years[-1],
+        current_depletion_year=years[0],
+        marginal_effects=marginal_feature_effects(params),
+        surrogate=usage,
     )
 
 
 @router.get("/shap/summary")
-async def get_shap_summary():
+async def get_shap_summary(
+    surrogate: bool = Query(False, description="대리 모델 모드 (/shap과 같음)"),
+    tolerance: float = Query(DEFAULT_TOLERANCE, gt=0, le=50),
+):
     """
     SHAP 분석 요약 (기본 설정 기준)
     """
     default_params = SimulationParams()
-    return await get_shap_analysis(default_params)
+    return await get_shap_analysis(default_params, surrogate, tolerance)
+
+
+@router.post("/surrogate/predict", response_model=SurrogatePrediction)
+async def predict_depletion(
+    params: SimulationParams,
+    tolerance: float = Query(DEFAULT_TOLERANCE, gt=0, le=50, description="허용 오차 상한 (년)"),
+):
+    """
+    대리 모델 고갈 연도 예측과 오차 상한
+
+    - error_bound: 파라미터 영역별 보류 시나리오 오차의 95% conformal 상한
+    - 상한이 tolerance를 넘거나 대리 모델 대상이 아니면 (정책 일정, 기본값이 아닌 기간 / 인구 가정,
+      학습 범위 밖) 정확한 배치 시뮬레이션 값으로 응답 (source=simulation)
+    """
+    version = model_version()
+    (estimate,) = surrogate_estimates(load_model(), version, [params])
+    if estimate.within(tolerance):
+        year, source = surrogate_year(params, estimate), "surrogate"
+    else:
+        (year,), source = await DEPLETION_BATCHER.submit([params]), "simulation"
+    return SurrogatePrediction(
+        depletion_year=year,
+        predicted_year=round(estimate.predicted, 3) if estimate.predicted is not None else None,
+        error_bound=round(estimate.error_bound, 3) if np.isfinite(estimate.error_bound) else None,
+        source=source,
+        version=version,
+    )
+
+
+@router.get("/surrogate/report")
+async def get_surrogate_report():
+    """
+    현재 모델 버전의 보류 시나리오 검증 리포트 (전체 / 영역별 오차, 없으면 계산 후 저장)
+    버전별 이력은 python -m core.surrogate history
+    """
+    return json_safe(error_profile(load_model(), model_version()).report)
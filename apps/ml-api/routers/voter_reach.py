@@ -2,19 +2,36 @@
 Voter Reach API Endpoints
 Subway station ridership + voter turnout analysis for campaign optimization
 """
-import json
-from pathlib import Path
-from typing import Optional
+from datetime import date
+from typing import Annotated, Literal, Optional
 
-from fastapi import APIRouter, Query
-from pydantic import BaseModel, Field
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, Field, ValidationError, model_validator
+
+from core.instrumentation import timed
+from core.partitions import DEFAULT_REGION, REGION_PATTERN, DataPartition, get_partition
+from core.serialization import LAYOUTS, negotiated_response
 
 router = APIRouter()
 
-# Data files path
-# __file__ = .../npfs/apps/ml-api/routers/voter_reach.py
-# For deployment, data is in apps/ml-api/data/
-DATA_DIR = Path(__file__).parent.parent / "data"
+# Data files path: apps/ml-api/data/ for Seoul, apps/ml-api/data/regions/<region>/
+# for other regions and operators (core.partitions), loaded on first access
+
+# Per-gu / per-dong centroid, bounds, area, perimeter (scripts/extract_seoul_gu.py)
+GEOMETRY_INDEX_FILE = "seoul_geometry_index.json"
+
+# Registered population by dong with voting-age segment counts (scripts/parse_voter_data.py)
+POPULATION_FILE = "population_by_dong_age.json"
+
+# Voting-age segments (core.catchment.AGE_SEGMENTS)
+AgeSegment = Literal["18-29", "30-39", "40-49", "50-59", "60+"]
+
+# Multi-level TopoJSON boundaries (scripts/extract_seoul_gu.py)
+BOUNDARY_FILES = {
+    "gu": "seoul_gu_topology.json",
+    "dong": "seoul_dong_topology.json",
+}
 
 
 # =============================================================================
@@ -49,12 +66,38 @@ class ElectionData(BaseModel):
     turnout_rate: float
 
 
-class OptimizeRequest(BaseModel):
+class DaySelection(BaseModel):
+    """Day filter over the daily ridership cube (all unset = 2024 hourly averages)"""
+    day_of_week: Optional[list[Annotated[int, Field(ge=0, le=6)]]] = Field(
+        default=None, description="Days of week to average over (Monday=0 ... Sunday=6)"
+    )
+    month: Optional[list[Annotated[int, Field(ge=1, le=12)]]] = Field(
+        default=None, description="Months to average over (1-12)"
+    )
+    start_date: Optional[date] = Field(default=None, description="First day to include (YYYY-MM-DD)")
+    end_date: Optional[date] = Field(default=None, description="Last day to include (YYYY-MM-DD)")
+
+    @model_validator(mode="after")
+    def check_range(self):
+        if self.start_date and self.end_date and self.start_date > self.end_date:
+            raise ValueError("start_date must not be after end_date")
+        return self
+
+    @property
+    def is_set(self) -> bool:
+        return bool(self.day_of_week or self.month or self.start_date or self.end_date)
+
+
+class OptimizeRequest(DaySelection):
     """Request body for optimization endpoint"""
     target_hour: int = Field(..., ge=0, le=23, description="Target hour (0-23)")
     top_n: int = Field(default=10, ge=1, le=100, description="Number of top stations to return")
     gu: Optional[str] = Field(default=None, description="Filter by administrative district (gu)")
     electoral_district: Optional[str] = Field(default=None, description="Filter by electoral district")
+    region: str = Field(default=DEFAULT_REGION, pattern=REGION_PATTERN, description="Data region (partition)")
+    age_segments: Optional[list[AgeSegment]] = Field(
+        default=None, min_length=1, description="Count only riders in these voter age segments"
+    )
 
 
 class DistrictInfo(BaseModel):
@@ -63,6 +106,8 @@ class DistrictInfo(BaseModel):
     electoral_districts: list[str]
     center: dict
     bounds: dict
+    area_km2: Optional[float] = None
+    perimeter_km: Optional[float] = None
 
 
 class StationRecommendation(BaseModel):
@@ -77,11 +122,18 @@ class StationRecommendation(BaseModel):
     reason: str
     gu: Optional[str] = None
     turnout_rate: Optional[float] = None
+    catchment_voters: Optional[int] = None
+    segment_share: Optional[float] = None
 
 
 class OptimizeResponse(BaseModel):
     """Response for optimization endpoint"""
     recommendations: list[StationRecommendation]
+    # Geographic level of the catchment rates (None on the gu-turnout fallback):
+    # voter share is "dong" when dong voting-age counts are loaded, otherwise "gu";
+    # turnout is always "gu" (or "electoral_district" when one is selected)
+    voter_share_level: Optional[str] = None
+    turnout_level: Optional[str] = None
 
 
 class HeatmapPoint(BaseModel):
@@ -95,13 +147,203 @@ class HeatmapPoint(BaseModel):
 # Helper Functions
 # =============================================================================
 
-def load_json_file(filename: str) -> list | dict | None:
-    """Load JSON file, return None if not found"""
-    filepath = DATA_DIR / filename
-    if not filepath.exists():
+def load_json_file(filename: str, region: str = DEFAULT_REGION) -> list | dict | None:
+    """
+    Load a region's JSON file, return None if not found (or the region is unknown).
+    Parsed once per process; callers must treat the result as read-only.
+    Seoul files are served from the startup snapshot when one is present.
+    """
+    partition = get_partition(region)
+    if partition is None:
+        return None
+    return partition.json(filename)
+
+
+def region_partition(region: str) -> DataPartition:
+    """The region's data partition, 404 for unknown regions."""
+    partition = get_partition(region)
+    if partition is None:
+        raise HTTPException(status_code=404, detail=f"Unknown region: {region}")
+    return partition
+
+
+def region_data(filename: str, region: str, mock=None) -> list | dict:
+    """
+    A region's data file for the list endpoints. Missing files fall back to
+    mock data for the default region only, and to an empty list elsewhere.
+    """
+    data = region_partition(region).json(filename)
+    if data is None:
+        return mock() if mock is not None and region == DEFAULT_REGION else []
+    return data
+
+
+def district_rows(region: str = DEFAULT_REGION) -> list[dict] | None:
+    """
+    Districts merged with the geometry index by gu name.
+    Built once per region; returns None when the districts file is missing.
+    """
+    def build():
+        districts = load_json_file("seoul_districts.json", region)
+        if districts is None:
+            return None
+        index = (load_json_file(GEOMETRY_INDEX_FILE, region) or {}).get("gu", {})
+        rows = []
+        for district in districts:
+            metrics = index.get(district["gu"])
+            if metrics is None:
+                rows.append(district)
+                continue
+            rows.append({
+                **district,
+                "center": metrics["center"],
+                "bounds": metrics["bounds"],
+                "area_km2": metrics["area_km2"],
+                "perimeter_km": metrics["perimeter_km"],
+            })
+        return rows
+
+    return region_partition(region).cached("district_rows", build)
+
+
+def gu_turnout_rates(region: str = DEFAULT_REGION) -> dict[str, float]:
+    """
+    Turnout (0-1) by gu: seoul_turnout_by_gu.json, falling back to the
+    mean of each gu's electoral districts.
+    """
+    turnout_by_gu = load_json_file("seoul_turnout_by_gu.json", region)
+    if turnout_by_gu:
+        return {row["gu_name"]: row["turnout_rate"] / 100 for row in turnout_by_gu}
+
+    election_map = {e["district"]: e["turnout_rate"] for e in load_json_file("election_by_district.json", region) or []}
+    rates = {}
+    for district in load_json_file("seoul_districts.json", region) or []:
+        district_rates = [election_map[ed] for ed in district.get("electoral_districts", []) if ed in election_map]
+        if district_rates:
+            rates[district["gu"]] = sum(district_rates) / len(district_rates)
+    return rates
+
+
+@timed()
+def build_region_catchment_model(region: str):
+    stations = load_json_file("stations.json", region)
+    ridership = load_json_file("ridership_hourly.json", region)
+    geometry_index = load_json_file(GEOMETRY_INDEX_FILE, region)
+    gu_voters = load_json_file("seoul_election_2024.json", region)
+    if not (stations and ridership and geometry_index and gu_voters):
         return None
-    with open(filepath, "r", encoding="utf-8") as f:
-        return json.load(f)
+
+    from core.catchment import build_catchment_model
+    return build_catchment_model(
+        stations, ridership, geometry_index, gu_voters, gu_turnout_rates(region), load_json_file(POPULATION_FILE, region)
+    )
+
+
+def catchment_model(region: str = DEFAULT_REGION):
+    """
+    Dong-level station catchments (core.catchment), built once per region.
+    None when the station, geometry index or voter data files are missing.
+    """
+    return region_partition(region).cached("catchment_model", lambda: build_region_catchment_model(region))
+
+
+def day_selection(
+    day_of_week: Optional[list[Annotated[int, Field(ge=0, le=6)]]] = Query(
+        None, description="Days of week to average over (Monday=0 ... Sunday=6), repeatable"
+    ),
+    month: Optional[list[Annotated[int, Field(ge=1, le=12)]]] = Query(
+        None, description="Months to average over (1-12), repeatable"
+    ),
+    start_date: Optional[date] = Query(None, description="First day to include (YYYY-MM-DD)"),
+    end_date: Optional[date] = Query(None, description="Last day to include (YYYY-MM-DD)"),
+) -> DaySelection:
+    """Query-string DaySelection for the GET endpoints."""
+    try:
+        return DaySelection(day_of_week=day_of_week, month=month, start_date=start_date, end_date=end_date)
+    except ValidationError as e:
+        raise RequestValidationError(e.errors()) from e
+
+
+def ridership_cube(region: str = DEFAULT_REGION):
+    """
+    Memory-mapped daily ridership cube (core.ridership_cube), None when
+    ridership_daily.npy has not been generated for the region. The prefix
+    sums are memory-mapped too when ridership_daily_prefix.npy is at least
+    as new as the cube.
+    """
+    partition = region_partition(region)
+
+    def load():
+        from core.ridership_cube import CUBE_FILE, INDEX_FILE, PREFIX_FILE, RidershipCube, prefix_current
+        cube, index = partition.array(CUBE_FILE), partition.json(INDEX_FILE)
+        if cube is None or index is None:
+            return None
+        current = prefix_current(partition.path(CUBE_FILE), partition.path(PREFIX_FILE))
+        prefix = partition.array(PREFIX_FILE) if current else None
+        return RidershipCube(
+            cube, index["station_ids"], index["station_names"], index["dates"], index["hours"], prefix=prefix
+        )
+
+    return partition.cached("ridership_cube", load)
+
+
+def daily_ridership(selection: DaySelection, hour: Optional[int] = None, region: str = DEFAULT_REGION):
+    """
+    Average daily boarding/alighting for the selected days from the cube:
+    (cube, averages, n_days), averages shaped (stations, hours, 2), or
+    (stations, 2) for a single hour. 503 when the cube is missing.
+    """
+    cube = ridership_cube(region)
+    if cube is None:
+        raise HTTPException(status_code=503, detail="Day filters require the daily ridership cube (ridership_daily.npy)")
+
+    from core.ridership_cube import DayFilter
+    day_filter = DayFilter(
+        days_of_week=tuple(selection.day_of_week) if selection.day_of_week else None,
+        months=tuple(selection.month) if selection.month else None,
+        start=selection.start_date,
+        end=selection.end_date,
+    )
+    averages, n_days = cube.averages(day_filter, hour)
+    return cube, averages, n_days
+
+
+def daily_ridership_rows(
+    selection: DaySelection,
+    hour: Optional[int] = None,
+    station_id: Optional[str] = None,
+    region: str = DEFAULT_REGION,
+) -> list[dict]:
+    """Cube averages as ridership_hourly.json rows (with total)."""
+    cube, averages, _ = daily_ridership(selection, hour, region)
+    if hour is not None:
+        averages = averages[:, None, :]
+    hours = [hour] if hour is not None else cube.hours
+    stations = [cube.station_index[station_id]] if station_id in cube.station_index else []
+    if station_id is None:
+        stations = range(len(cube.station_ids))
+
+    rows = []
+    for i in stations:
+        for j, h in enumerate(hours):
+            boarding, alighting = round(float(averages[i, j, 0])), round(float(averages[i, j, 1]))
+            rows.append({
+                "station_id": cube.station_ids[i],
+                "station_name": cube.station_names[i],
+                "hour": h,
+                "avg_boarding": boarding,
+                "avg_alighting": alighting,
+                "total": boarding + alighting,
+            })
+    return rows
+
+
+def recommendation_reason(total_ridership: float) -> str:
+    if total_ridership > 8000:
+        return "High traffic station during target hour"
+    if total_ridership > 5000:
+        return "Moderate-high traffic with good voter engagement potential"
+    return "Strategic location for targeted outreach"
 
 
 def get_mock_stations() -> list[dict]:
@@ -160,19 +402,43 @@ def get_mock_election() -> list[dict]:
 # =============================================================================
 # Endpoints
 # =============================================================================
+#
+# List endpoints return pre-serialized responses built from trusted data files
+# (no response_model re-validation). Send `Accept: application/msgpack` for
+# msgpack, and `layout=columnar` for one array per field instead of row objects.
+
+LAYOUT_QUERY = Query("rows", pattern=f"^({'|'.join(LAYOUTS)})$", description="rows or columnar (arrays per field)")
+REGION_QUERY = Query(DEFAULT_REGION, pattern=REGION_PATTERN, description="Data region (see /regions)")
+
+
+@router.get("/regions")
+async def get_regions():
+    """
+    List the data regions (partitions) available on this server.
+    Listing does not load any region's data.
+    """
+    from core.partitions import available_regions, region_directory
+    return [
+        {"region": region, "files": sorted(p.name for p in region_directory(region).glob("*") if p.is_file())}
+        for region in available_regions()
+    ]
+
 
 @router.get("/districts", response_model=list[DistrictInfo])
-async def get_districts():
+async def get_districts(request: Request, region: str = REGION_QUERY):
     """
-    Return all Seoul administrative districts (gu) with their electoral districts.
+    Return all administrative districts (gu) of the region with their electoral districts.
 
     Returns:
-        List of districts with gu name, electoral districts, center, and bounds
+        List of districts with gu name, electoral districts, center
+        (area-weighted centroid), bounds, area and perimeter
     """
-    data = load_json_file("seoul_districts.json")
-    if data is None:
+    data = district_rows(region)
+    if data is None and region != DEFAULT_REGION:
+        data = []
+    elif data is None:
         # Mock data fallback
-        return [
+        data = [
             {
                 "gu": "강남구",
                 "electoral_districts": ["강남구갑", "강남구을", "강남구병"],
@@ -180,27 +446,67 @@ async def get_districts():
                 "bounds": {"north": 37.5350, "south": 37.4640, "east": 127.0900, "west": 127.0100}
             },
         ]
-    return data
+    return negotiated_response(request, data)
+
+
+def select_boundary_level(levels: list[dict], zoom: float) -> dict:
+    """Most detailed level whose min_zoom is at or below the map zoom."""
+    eligible = [level for level in levels if level["min_zoom"] <= zoom]
+    if not eligible:
+        return min(levels, key=lambda level: level["min_zoom"])
+    return max(eligible, key=lambda level: level["min_zoom"])
+
+
+@router.get("/boundaries")
+async def get_boundaries(
+    request: Request,
+    zoom: float = Query(11, ge=0, le=22, description="Map zoom level"),
+    layer: str = Query("gu", pattern=f"^({'|'.join(BOUNDARY_FILES)})$", description="gu outlines, or dong borders with gu outlines"),
+    level: Optional[str] = Query(None, description="Explicit simplification level (overrides zoom)"),
+    region: str = REGION_QUERY,
+):
+    """
+    Return gu (or dong) boundaries as quantized TopoJSON.
+
+    The simplification level is picked from the map zoom: coarser
+    outlines for city-wide views, full resolution when zoomed in.
+    Borders shared between districts are stored once as arcs.
+    """
+    data = region_partition(region).json(BOUNDARY_FILES[layer])
+    if data is None:
+        raise HTTPException(status_code=404, detail=f"Boundary data not available for layer: {layer}")
+
+    if level is None:
+        level = select_boundary_level(data["levels"], zoom)["name"]
+    elif level not in data["topologies"]:
+        raise HTTPException(status_code=400, detail=f"Unknown level: {level}. Available: {list(data['topologies'])}")
+
+    response = negotiated_response(request, data["topologies"][level])
+    response.headers["X-Boundary-Level"] = level
+    response.headers["Cache-Control"] = "public, max-age=86400"
+    return response
 
 
 @router.get("/stations", response_model=list[Station])
-async def get_stations():
+async def get_stations(request: Request, region: str = REGION_QUERY, layout: str = LAYOUT_QUERY):
     """
     Return all subway stations with coordinates.
 
     Returns:
         List of stations with id, name, line, lat, lng
     """
-    data = load_json_file("stations.json")
-    if data is None:
-        return get_mock_stations()
-    return data
+    data = region_data("stations.json", region, get_mock_stations)
+    return negotiated_response(request, data, layout, Station.model_fields)
 
 
 @router.get("/ridership", response_model=list[RidershipData])
 async def get_ridership(
+    request: Request,
     hour: Optional[int] = Query(None, ge=0, le=23, description="Filter by hour (0-23)"),
     station_id: Optional[str] = Query(None, description="Filter by station ID"),
+    days: DaySelection = Depends(day_selection),
+    region: str = REGION_QUERY,
+    layout: str = LAYOUT_QUERY,
 ):
     """
     Return ridership data, optionally filtered by hour and station.
@@ -208,13 +514,17 @@ async def get_ridership(
     Args:
         hour: Optional hour filter (0-23)
         station_id: Optional station ID filter
+        days: Optional day_of_week / month / start_date / end_date filters;
+            averages are then taken over the matching days of the daily cube
 
     Returns:
         List of ridership data with station_id, station_name, hour, avg_boarding, avg_alighting, total
     """
-    data = load_json_file("ridership_hourly.json")
-    if data is None:
-        data = get_mock_ridership()
+    if days.is_set:
+        data = daily_ridership_rows(days, hour, station_id, region)
+        return negotiated_response(request, data, layout, RidershipData.model_fields)
+
+    data = region_data("ridership_hourly.json", region, get_mock_ridership)
 
     # Apply filters
     if hour is not None:
@@ -222,17 +532,22 @@ async def get_ridership(
     if station_id is not None:
         data = [d for d in data if d.get("station_id") == station_id]
 
-    # Compute total if not present
-    for d in data:
-        if d.get("total") is None:
-            d["total"] = d.get("avg_boarding", 0) + d.get("avg_alighting", 0)
+    # Compute total if not present (copy rows; cached data is shared)
+    data = [
+        d if d.get("total") is not None
+        else {**d, "total": d.get("avg_boarding", 0) + d.get("avg_alighting", 0)}
+        for d in data
+    ]
 
-    return data
+    return negotiated_response(request, data, layout, RidershipData.model_fields)
 
 
 @router.get("/election", response_model=list[ElectionData])
 async def get_election(
+    request: Request,
     district: Optional[str] = Query(None, description="Filter by district name"),
+    region: str = REGION_QUERY,
+    layout: str = LAYOUT_QUERY,
 ):
     """
     Return election/voter data by district.
@@ -243,15 +558,84 @@ async def get_election(
     Returns:
         List of election data with district, total_voters, total_votes, turnout_rate
     """
-    data = load_json_file("election_by_district.json")
-    if data is None:
-        data = get_mock_election()
+    data = region_data("election_by_district.json", region, get_mock_election)
 
     # Apply filter
     if district is not None:
         data = [d for d in data if district.lower() in d.get("district", "").lower()]
 
-    return data
+    return negotiated_response(request, data, layout, ElectionData.model_fields)
+
+
+def optimize_with_catchments(model, request: OptimizeRequest) -> OptimizeResponse:
+    """
+    Catchment scoring: one (stations × dongs) @ (dongs,) product for the
+    voter rate, then an element-wise product with the hour's ridership.
+    Selecting an electoral district targets only the voters of its gu,
+    at that district's turnout. Age segments scale the score by the share of
+    the hour's riders expected in those segments (precomputed rider age mix).
+    """
+    import numpy as np
+
+    dong_turnout = None
+    if request.electoral_district:
+        election_map = {
+            e["district"]: e["turnout_rate"] for e in load_json_file("election_by_district.json", request.region) or []
+        }
+        district_gu = {
+            ed: d["gu"]
+            for d in load_json_file("seoul_districts.json", request.region) or []
+            for ed in d.get("electoral_districts", [])
+        }
+        target_gu = district_gu.get(request.electoral_district)
+        if request.electoral_district in election_map and target_gu:
+            in_gu = np.array([gu == target_gu for gu in model.dong_gu])
+            dong_turnout = np.where(in_gu, election_map[request.electoral_district], 0.0)
+
+    voter_rate = model.voter_rate(dong_turnout)
+    turnout = model.catchment_turnout(dong_turnout)
+    hourly = model.ridership[request.target_hour]
+    observed = model.observed[request.target_hour]
+    if request.is_set:
+        cube, averages, _ = daily_ridership(request, request.target_hour, request.region)
+        cube_rows = np.array([cube.station_index.get(station_id, -1) for station_id in model.station_ids])
+        observed = cube_rows >= 0
+        hourly = np.where(observed, averages[cube_rows].sum(axis=1), 0.0)
+    segment_share = model.segment_share(request.target_hour, request.age_segments)
+    scores = hourly * voter_rate * segment_share
+
+    candidates = observed.copy()
+    if request.gu:
+        candidates &= np.array([s.get("gu") == request.gu for s in model.stations])
+    if dong_turnout is not None:
+        candidates &= voter_rate > 0
+
+    indices = np.flatnonzero(candidates)
+    top = indices[np.argsort(-scores[indices], kind="stable")[:request.top_n]]
+
+    recommendations = []
+    for i in top:
+        station = model.stations[i]
+        total_ridership = float(hourly[i])
+        recommendations.append({
+            "station_id": model.station_ids[i],
+            "station_name": model.station_names[i],
+            "lat": station.get("lat", 0),
+            "lng": station.get("lng", 0),
+            "hour": request.target_hour,
+            "score": round(float(scores[i]), 2),
+            "ridership": round(total_ridership, 2),
+            "reason": recommendation_reason(total_ridership),
+            "gu": station.get("gu"),
+            "turnout_rate": round(float(turnout[i]), 4),
+            "catchment_voters": int(round(model.catchment_voters[i])),
+            "segment_share": round(float(segment_share[i]), 4) if request.age_segments else None,
+        })
+    return OptimizeResponse(
+        recommendations=recommendations,
+        voter_share_level=model.voter_share_level,
+        turnout_level="gu" if dong_turnout is None else "electoral_district",
+    )
 
 
 @router.post("/optimize", response_model=OptimizeResponse)
@@ -259,28 +643,38 @@ async def optimize_stations(request: OptimizeRequest):
     """
     Calculate and return top N stations with highest voter-reach score.
 
-    Score formula: (avg_boarding + avg_alighting) * turnout_rate
+    Score formula: (avg_boarding + avg_alighting) * catchment voter rate, where
+    the catchment voter rate is the registered-voter share times turnout of
+    the dongs nearest to the station (population weighted). Falls back to
+    (avg_boarding + avg_alighting) * gu turnout when catchment data is missing.
+    With age_segments, the score only counts the share of riders expected in
+    those segments for the station's catchment and hour. Day filters
+    (day_of_week, month, start_date, end_date) replace the 2024 hourly
+    averages with averages over the matching days of the daily cube.
 
     Args:
-        request: OptimizeRequest with target_hour, top_n, and optional gu/electoral_district filters
+        request: OptimizeRequest with target_hour, top_n, optional gu/electoral_district
+            filters and optional age_segments
 
     Returns:
         OptimizeResponse with recommendations list
     """
-    # Load data
-    stations_data = load_json_file("stations.json")
-    if stations_data is None:
-        stations_data = get_mock_stations()
-
-    ridership_data = load_json_file("ridership_hourly.json")
-    if ridership_data is None:
-        ridership_data = get_mock_ridership()
+    model = catchment_model(request.region)
+    # Without a dong or gu age table every station gets the same default age
+    # mix, so age segments could not change the ranking on either path
+    if request.age_segments and (model is None or model.age_data == "default"):
+        raise HTTPException(
+            status_code=503,
+            detail=f"Age-segment targeting requires the catchment data files and a dong or gu age table ({POPULATION_FILE})",
+        )
+    if model is not None:
+        return optimize_with_catchments(model, request)
 
-    election_data = load_json_file("election_by_district.json")
-    if election_data is None:
-        election_data = get_mock_election()
-
-    districts_data = load_json_file("seoul_districts.json")
+    # Load data
+    stations_data = region_data("stations.json", request.region, get_mock_stations)
+    ridership_data = region_data("ridership_hourly.json", request.region, get_mock_ridership)
+    election_data = region_data("election_by_district.json", request.region, get_mock_election)
+    districts_data = load_json_file("seoul_districts.json", request.region)
 
     # Create lookup maps
     station_map = {s["id"]: s for s in stations_data}
@@ -307,6 +701,8 @@ async def optimize_stations(request: OptimizeRequest):
 
     # Filter ridership by target hour
     hourly_ridership = [r for r in ridership_data if r.get("hour") == request.target_hour]
+    if request.is_set:
+        hourly_ridership = daily_ridership_rows(request, request.target_hour, region=request.region)
 
     # Calculate scores
     scored_stations = []
@@ -339,13 +735,7 @@ async def optimize_stations(request: OptimizeRequest):
         # Score formula: ridership * turnout_rate
         score = total_ridership * turnout_rate
 
-        # Determine reason based on characteristics
-        if total_ridership > 8000:
-            reason = "High traffic station during target hour"
-        elif total_ridership > 5000:
-            reason = "Moderate-high traffic with good voter engagement potential"
-        else:
-            reason = "Strategic location for targeted outreach"
+        reason = recommendation_reason(total_ridership)
 
         scored_stations.append({
             "station_id": station_id,
@@ -369,31 +759,33 @@ async def optimize_stations(request: OptimizeRequest):
 
 @router.get("/heatmap", response_model=list[HeatmapPoint])
 async def get_heatmap(
+    request: Request,
     hour: int = Query(..., ge=0, le=23, description="Hour for heatmap data (0-23)"),
+    days: DaySelection = Depends(day_selection),
+    region: str = REGION_QUERY,
+    layout: str = LAYOUT_QUERY,
 ):
     """
     Return data formatted for map heatmap visualization.
 
     Args:
         hour: Hour to generate heatmap for (0-23)
+        days: Optional day_of_week / month / start_date / end_date filters
 
     Returns:
         List of heatmap points with lat, lng, weight
     """
     # Load data
-    stations_data = load_json_file("stations.json")
-    if stations_data is None:
-        stations_data = get_mock_stations()
-
-    ridership_data = load_json_file("ridership_hourly.json")
-    if ridership_data is None:
-        ridership_data = get_mock_ridership()
+    stations_data = region_data("stations.json", region, get_mock_stations)
+    ridership_data = region_data("ridership_hourly.json", region, get_mock_ridership)
 
     # Create station lookup
     station_map = {s["id"]: s for s in stations_data}
 
     # Filter ridership by hour
     hourly_ridership = [r for r in ridership_data if r.get("hour") == hour]
+    if days.is_set:
+        hourly_ridership = daily_ridership_rows(days, hour, region=region)
 
     # Find max ridership for normalization
     max_ridership = max(
@@ -420,4 +812,4 @@ async def get_heatmap(
             "weight": round(weight, 4),
         })
 
-    return heatmap_points
+    return negotiated_response(request, heatmap_points, layout, HeatmapPoint.model_fields)
@@ -2,16 +2,52 @@
 """
 Extract Seoul gu-level boundaries from admdongkor GeoJSON
 and update station mapping with accurate Point-in-Polygon
+
+Outputs:
+- seoul_gu_boundaries.geojson: dissolved gu outlines (compact, full resolution)
+- seoul_gu_topology.json / seoul_dong_topology.json: quantized TopoJSON with
+  shared arcs, one topology per simplification level (served by
+  /api/voter-reach/boundaries by map zoom)
+- seoul_geometry_index.json: area-weighted centroid, bounds, area and
+  perimeter per gu (keyed by name) and dong (used by /api/voter-reach/districts)
 """
 import json
 from pathlib import Path
 from collections import defaultdict
 
+from seoul_geometry import (
+    build_topology,
+    dissolve,
+    geometry_metrics,
+    geometry_polygons,
+    polygons_geometry,
+    to_topojson,
+)
+
 # Paths
+BASE_DIR = Path(__file__).parent.parent
 INPUT_FILE = Path("/tmp/hangjeongdong.geojson")
-OUTPUT_GU_FILE = Path(__file__).parent.parent / "data" / "processed" / "seoul_gu_boundaries.geojson"
-STATIONS_FILE = Path(__file__).parent.parent / "data" / "processed" / "stations.json"
-DISTRICTS_FILE = Path(__file__).parent.parent / "data" / "processed" / "seoul_districts.json"
+OUTPUT_GU_FILE = BASE_DIR / "data" / "processed" / "seoul_gu_boundaries.geojson"
+OUTPUT_GU_TOPOLOGY_FILE = BASE_DIR / "data" / "processed" / "seoul_gu_topology.json"
+OUTPUT_DONG_TOPOLOGY_FILE = BASE_DIR / "data" / "processed" / "seoul_dong_topology.json"
+OUTPUT_INDEX_FILE = BASE_DIR / "data" / "processed" / "seoul_geometry_index.json"
+STATIONS_FILE = BASE_DIR / "data" / "processed" / "stations.json"
+DISTRICTS_FILE = BASE_DIR / "data" / "processed" / "seoul_districts.json"
+
+# Copies served by the ML API / web map
+API_DATA_DIR = BASE_DIR / "apps" / "ml-api" / "data"
+WEB_DATA_DIR = BASE_DIR / "apps" / "web" / "public" / "data"
+
+# Simplification levels: (name, Douglas–Peucker tolerance in degrees, min map zoom)
+# 0.001° ≈ 90 m, 0.0002° ≈ 18 m, 0.00005° ≈ 4.5 m at Seoul's latitude
+SIMPLIFICATION_LEVELS = [
+    ("low", 0.001, 0),
+    ("medium", 0.0002, 11),
+    ("high", 0.00005, 13),
+    ("full", 0.0, 15),
+]
+SIMPLIFICATION_METHOD = "douglas_peucker"  # or "visvalingam"
+QUANTIZATION = 100_000
 
 # Seoul administrative code prefix
 SEOUL_CODE_PREFIX = "11"
@@ -103,21 +139,122 @@ def point_in_multipolygon(point: tuple[float, float], geometry: dict) -> bool:
 
 def merge_polygons(features: list) -> dict:
     """
-    Merge multiple polygon features into a MultiPolygon.
-    Simple approach: collect all polygons into a MultiPolygon.
+    Dissolve dong polygon features into a single gu outline.
+    Borders shared between dongs cancel out, so only the gu boundary
+    (plus holes / islands) remains.
     """
-    all_coords = []
-
+    polygons = []
     for feature in features:
-        geom = feature["geometry"]
-        if geom["type"] == "Polygon":
-            all_coords.append(geom["coordinates"])
-        elif geom["type"] == "MultiPolygon":
-            all_coords.extend(geom["coordinates"])
+        polygons.extend(geometry_polygons(feature["geometry"]))
+    return polygons_geometry(dissolve(polygons))
+
+
+def build_boundary_levels(layers: dict) -> dict:
+    """
+    Shared-arc topology of the given layers, simplified once per level.
+    Returns {"levels": [...], "topologies": {level_name: TopoJSON}}
+    """
+    topology = build_topology(layers)
+    levels, topologies = [], {}
+    for name, tolerance, min_zoom in SIMPLIFICATION_LEVELS:
+        simplified = topology.simplified(tolerance, SIMPLIFICATION_METHOD)
+        topologies[name] = to_topojson(simplified, QUANTIZATION)
+        levels.append({
+            "name": name,
+            "tolerance": tolerance,
+            "min_zoom": min_zoom,
+            "arc_points": sum(len(arc) for arc in simplified.arcs),
+        })
+    return {"method": SIMPLIFICATION_METHOD, "levels": levels, "topologies": topologies}
+
+
+def write_boundary_outputs(gu_boundaries: list, dong_features: list) -> None:
+    """Write the compact gu GeoJSON and the per-level TopoJSON files."""
+    gu_layer = [(f["properties"], geometry_polygons(f["geometry"])) for f in gu_boundaries]
+    dong_layer = [(f["properties"], geometry_polygons(f["geometry"])) for f in dong_features]
+
+    # 6 decimals ≈ 0.1 m
+    gu_geojson = [
+        {**feature, "geometry": polygons_geometry([
+            [[(round(x, 6), round(y, 6)) for x, y in ring] for ring in polygon]
+            for polygon in geometry_polygons(feature["geometry"])
+        ])}
+        for feature in gu_boundaries
+    ]
+
+    outputs = {
+        OUTPUT_GU_FILE: {"type": "FeatureCollection", "features": gu_geojson},
+        OUTPUT_GU_TOPOLOGY_FILE: build_boundary_levels({"gu": gu_layer}),
+        OUTPUT_DONG_TOPOLOGY_FILE: build_boundary_levels({"gu": gu_layer, "dong": dong_layer}),
+    }
+    copies = {
+        OUTPUT_GU_FILE: [WEB_DATA_DIR],
+        OUTPUT_GU_TOPOLOGY_FILE: [API_DATA_DIR],
+        OUTPUT_DONG_TOPOLOGY_FILE: [API_DATA_DIR],
+    }
+
+    for path, content in outputs.items():
+        text = json.dumps(content, ensure_ascii=False, separators=(",", ":"))
+        for target in [path] + [directory / path.name for directory in copies[path]]:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_text(text, encoding="utf-8")
+        print(f"Saved {path.name}: {len(text.encode()) / 1024:.0f} KB")
+
+    for name, topology_file in (("gu", OUTPUT_GU_TOPOLOGY_FILE), ("dong", OUTPUT_DONG_TOPOLOGY_FILE)):
+        levels = outputs[topology_file]
+        sizes = ", ".join(
+            f"{level['name']} {len(json.dumps(levels['topologies'][level['name']], separators=(',', ':')).encode()) / 1024:.0f} KB"
+            for level in levels["levels"]
+        )
+        print(f"  {name} levels: {sizes}")
 
-    if len(all_coords) == 1:
-        return {"type": "Polygon", "coordinates": all_coords[0]}
-    return {"type": "MultiPolygon", "coordinates": all_coords}
+
+def build_geometry_index(gu_boundaries: list, dong_features: list) -> dict:
+    """
+    Geometry metrics per gu and dong (one vectorized pass per layer).
+    Gu entries are keyed by gu name for direct lookup.
+    """
+    gu_metrics = geometry_metrics([geometry_polygons(f["geometry"]) for f in gu_boundaries])
+    dong_metrics = geometry_metrics([geometry_polygons(f["geometry"]) for f in dong_features])
+
+    gu_index = {
+        feature["properties"]["gu_name"]: {
+            "gu_code": feature["properties"]["gu_code"],
+            "dong_count": feature["properties"]["dong_count"],
+            **metrics,
+        }
+        for feature, metrics in zip(gu_boundaries, gu_metrics)
+        if metrics is not None
+    }
+    dong_index = [
+        {**feature["properties"], **metrics}
+        for feature, metrics in zip(dong_features, dong_metrics)
+        if metrics is not None
+    ]
+    return {"gu": gu_index, "dong": dong_index}
+
+
+def write_geometry_index(index: dict) -> None:
+    text = json.dumps(index, ensure_ascii=False, separators=(",", ":"))
+    for target in (OUTPUT_INDEX_FILE, API_DATA_DIR / OUTPUT_INDEX_FILE.name):
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(text, encoding="utf-8")
+    print(f"Saved {OUTPUT_INDEX_FILE.name}: {len(index['gu'])} gu, {len(index['dong'])} dong")
+
+
+def update_district_geometry(districts: list, gu_index: dict) -> int:
+    """Set center (area-weighted centroid), bounds, area and perimeter by gu name."""
+    updated = 0
+    for district in districts:
+        metrics = gu_index.get(district["gu"])
+        if metrics is None:
+            continue
+        district["center"] = metrics["center"]
+        district["bounds"] = metrics["bounds"]
+        district["area_km2"] = metrics["area_km2"]
+        district["perimeter_km"] = metrics["perimeter_km"]
+        updated += 1
+    return updated
 
 
 def main():
@@ -155,18 +292,28 @@ def main():
             },
             "geometry": merged_geometry
         })
-        print(f"  {gu_name}: {len(features)} dongs merged")
-
-    # Save gu boundaries GeoJSON
-    output_geojson = {
-        "type": "FeatureCollection",
-        "features": gu_boundaries
-    }
+        print(f"  {gu_name}: {len(features)} dongs dissolved")
 
-    OUTPUT_GU_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(OUTPUT_GU_FILE, "w", encoding="utf-8") as f:
-        json.dump(output_geojson, f, ensure_ascii=False, indent=2)
-    print(f"\nSaved gu boundaries to: {OUTPUT_GU_FILE}")
+    # Save gu boundaries (GeoJSON + multi-level TopoJSON)
+    dong_features = [
+        {
+            "type": "Feature",
+            "properties": {
+                "adm_cd": feature["properties"].get("adm_cd"),
+                "adm_nm": feature["properties"].get("adm_nm"),
+                "gu_code": gu_code,
+            },
+            "geometry": feature["geometry"],
+        }
+        for gu_code, features in sorted(gu_features.items())
+        for feature in features
+    ]
+    print()
+    write_boundary_outputs(gu_boundaries, dong_features)
+
+    # Geometry metrics index (centroid, bounds, area, perimeter)
+    geometry_index = build_geometry_index(gu_boundaries, dong_features)
+    write_geometry_index(geometry_index)
 
     # Update stations with accurate gu mapping
     print("\nUpdating station mappings...")
@@ -185,6 +332,9 @@ def main():
         new_gu = None
 
         for gu_feature in gu_boundaries:
+            bounds = geometry_index["gu"][gu_feature["properties"]["gu_name"]]["bounds"]
+            if not (bounds["west"] <= lng <= bounds["east"] and bounds["south"] <= lat <= bounds["north"]):
+                continue
             if point_in_multipolygon(point, gu_feature["geometry"]):
                 new_gu = gu_feature["properties"]["gu_name"]
                 break
@@ -200,43 +350,17 @@ def main():
         json.dump(stations, f, ensure_ascii=False, indent=2)
     print(f"\nUpdated {updated_count} station mappings")
 
-    # Update seoul_districts.json with accurate bounds from GeoJSON
-    print("\nUpdating district bounds...")
+    # Update seoul_districts.json with centroid / bounds / area from the index
+    print("\nUpdating district geometry...")
     with open(DISTRICTS_FILE, "r", encoding="utf-8") as f:
         districts = json.load(f)
 
-    for district in districts:
-        gu_name = district["gu"]
-        for gu_feature in gu_boundaries:
-            if gu_feature["properties"]["gu_name"] == gu_name:
-                # Calculate bounds from geometry
-                geom = gu_feature["geometry"]
-                all_coords = []
-
-                if geom["type"] == "Polygon":
-                    all_coords = geom["coordinates"][0]
-                elif geom["type"] == "MultiPolygon":
-                    for polygon in geom["coordinates"]:
-                        all_coords.extend(polygon[0])
-
-                if all_coords:
-                    lngs = [c[0] for c in all_coords]
-                    lats = [c[1] for c in all_coords]
-                    district["bounds"] = {
-                        "north": round(max(lats), 6),
-                        "south": round(min(lats), 6),
-                        "east": round(max(lngs), 6),
-                        "west": round(min(lngs), 6)
-                    }
-                    district["center"] = {
-                        "lat": round(sum(lats) / len(lats), 6),
-                        "lng": round(sum(lngs) / len(lngs), 6)
-                    }
-                break
+    updated = update_district_geometry(districts, geometry_index["gu"])
+    print(f"  {updated}/{len(districts)} districts matched by gu name")
 
     with open(DISTRICTS_FILE, "w", encoding="utf-8") as f:
         json.dump(districts, f, ensure_ascii=False, indent=2)
-    print("Updated district bounds from GeoJSON")
+    print("Updated district geometry from the metrics index")
 
     print("\nDone!")
 
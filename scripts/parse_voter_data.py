@@ -3,6 +3,14 @@
 Data Parser for Voter-Reach Project
 Converts raw CSV files to processed JSON format.
 
+Each region (operator / city) is its own data partition:
+- seoul: data/raw/ -> data/processed/ (and apps/ml-api/data/)
+- others: data/raw/regions/<region>/ -> data/processed/regions/<region>/
+  (and apps/ml-api/data/regions/<region>/), see REGIONS
+
+    python scripts/parse_voter_data.py                    # Seoul lines 1-8
+    python scripts/parse_voter_data.py --region busan --publish
+
 Input files (in data/raw/):
 - Station coordinates (EUC-KR encoding)
 - Ridership data by hour (EUC-KR encoding)
@@ -13,10 +21,17 @@ Output files (in data/processed/):
 - stations.json
 - ridership_hourly.json
 - election_by_district.json
+- ridership_daily.npy + ridership_daily_index.json + ridership_daily_prefix.npy (also copied to apps/ml-api/data/)
+- population_by_dong_age.json (also copied to apps/ml-api/data/)
 """
 
+import argparse
 import json
 import os
+import re
+import shutil
+import sys
+import numpy as np
 import pandas as pd
 from pathlib import Path
 
@@ -32,10 +47,100 @@ RIDERSHIP_FILE = "서울교통공사_역별 시간대별 승하차인원(24.1~24
 ELECTION_FILE = "중앙선거관리위원회_국회의원선거 개표결과_20240410.csv"
 POPULATION_FILE = "등록인구(연령별_동별)_20260105164119.csv"
 
+# Hour columns in the ridership CSV (column name -> hour)
+HOUR_COLUMNS = {
+    '06시 이전': 5,  # Before 6am, represented as 5
+    '06시-07시': 6,
+    '07시-08시': 7,
+    '08시-09시': 8,
+    '09시-10시': 9,
+    '10시-11시': 10,
+    '11시-12시': 11,
+    '12시-13시': 12,
+    '13시-14시': 13,
+    '14시-15시': 14,
+    '15시-16시': 15,
+    '16시-17시': 16,
+    '17시-18시': 17,
+    '18시-19시': 18,
+    '19시-20시': 19,
+    '20시-21시': 20,
+    '21시-22시': 21,
+    '22시-23시': 22,
+    '23시-24시': 23,
+    '24시 이후': 24  # After midnight, represented as 24
+}
+
+# Data partitions: source files per region (None = not available yet, step skipped).
+# The election CSV is national; sido_name selects the region's rows.
+DEFAULT_REGION = "seoul"
+REGIONS = {
+    "seoul": {
+        "sido_name": "서울특별시",
+        "station_file": STATION_FILE,
+        "ridership_file": RIDERSHIP_FILE,
+        "election_file": ELECTION_FILE,
+        "population_file": POPULATION_FILE,
+    },
+    "incheon": {"sido_name": "인천광역시"},
+    "gyeonggi": {"sido_name": "경기도"},
+    "busan": {"sido_name": "부산광역시"},
+}
+SIDO_NAME = REGIONS[DEFAULT_REGION]["sido_name"]
+
+# Date column of the daily-detail ridership CSV (first one present)
+DATE_COLUMNS = ['수송일자', '날짜', '일자', '사용일자']
+
+# The ML API reads its data files from here
+API_DATA_DIR = BASE_DIR / "apps" / "ml-api" / "data"
+
+# Voting-age segments used by the optimizer: (name, first age, last age or None)
+AGE_SEGMENTS = [
+    ("18-29", 18, 29),
+    ("30-39", 30, 39),
+    ("40-49", 40, 49),
+    ("50-59", 50, 59),
+    ("60+", 60, None),
+]
+
+# Labels for total / subtotal rows and columns in KOSIS exports
+TOTAL_LABELS = {"합계", "계", "소계", "총계", "서울특별시"}
+
+
+def configure_region(region):
+    """
+    Point the input files and output directories at a region's partition.
+    Returns the list of steps that have source files configured.
+    """
+    global RAW_DIR, PROCESSED_DIR, API_DATA_DIR, SIDO_NAME
+    global STATION_FILE, RIDERSHIP_FILE, ELECTION_FILE, POPULATION_FILE
+
+    sources = REGIONS[region]
+    if region != DEFAULT_REGION:
+        RAW_DIR = BASE_DIR / "data" / "raw" / "regions" / region
+        PROCESSED_DIR = BASE_DIR / "data" / "processed" / "regions" / region
+        API_DATA_DIR = BASE_DIR / "apps" / "ml-api" / "data" / "regions" / region
+    SIDO_NAME = sources["sido_name"]
+    STATION_FILE = sources.get("station_file")
+    RIDERSHIP_FILE = sources.get("ridership_file")
+    ELECTION_FILE = sources.get("election_file")
+    POPULATION_FILE = sources.get("population_file")
+    TOTAL_LABELS.add(SIDO_NAME)
+
+    return [
+        name for name, configured in (
+            ("stations", STATION_FILE and RIDERSHIP_FILE),
+            ("ridership", RIDERSHIP_FILE),
+            ("election", ELECTION_FILE),
+            ("population", POPULATION_FILE),
+        ) if configured
+    ]
+
 
 def ensure_output_directory():
-    """Create the processed directory if it doesn't exist."""
+    """Create the processed (and API partition) directories if they don't exist."""
     PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
+    API_DATA_DIR.mkdir(parents=True, exist_ok=True)
     print(f"Output directory ready: {PROCESSED_DIR}")
 
 
@@ -50,7 +155,7 @@ def parse_stations():
         ...
     ]
     """
-    print("\n[1/3] Parsing station coordinates...")
+    print("\n[1/5] Parsing station coordinates...")
 
     # Load coordinates file
     filepath = RAW_DIR / STATION_FILE
@@ -111,34 +216,11 @@ def parse_ridership(stations_df=None):
         ...
     ]
     """
-    print("\n[2/3] Parsing ridership data...")
+    print("\n[2/5] Parsing ridership data...")
 
     filepath = RAW_DIR / RIDERSHIP_FILE
     df = pd.read_csv(filepath, encoding='cp949')
 
-    # Hour columns mapping (column name -> hour)
-    hour_columns = {
-        '06시 이전': 5,  # Before 6am, represented as 5
-        '06시-07시': 6,
-        '07시-08시': 7,
-        '08시-09시': 8,
-        '09시-10시': 9,
-        '10시-11시': 10,
-        '11시-12시': 11,
-        '12시-13시': 12,
-        '13시-14시': 13,
-        '14시-15시': 14,
-        '15시-16시': 15,
-        '16시-17시': 16,
-        '17시-18시': 17,
-        '18시-19시': 18,
-        '19시-20시': 19,
-        '20시-21시': 20,
-        '21시-22시': 21,
-        '22시-23시': 22,
-        '23시-24시': 23,
-        '24시 이후': 24  # After midnight, represented as 24
-    }
 
     # Separate boarding (승차) and alighting (하차) data
     boarding_df = df[df['구분'] == '승차'].copy()
@@ -158,7 +240,7 @@ def parse_ridership(stations_df=None):
 
         station_name = station_boarding['역명'].iloc[0]
 
-        for col_name, hour in hour_columns.items():
+        for col_name, hour in HOUR_COLUMNS.items():
             # Calculate average across all days
             avg_boarding = station_boarding[col_name].mean()
             avg_alighting = station_alighting[col_name].mean() if len(station_alighting) > 0 else 0
@@ -181,15 +263,82 @@ def parse_ridership(stations_df=None):
         json.dump(ridership_data, f, ensure_ascii=False, indent=2)
 
     unique_stations = len(station_ids)
-    print(f"   - Parsed data for {unique_stations} stations across {len(hour_columns)} hours")
+    print(f"   - Parsed data for {unique_stations} stations across {len(HOUR_COLUMNS)} hours")
     print(f"   - Total records: {len(ridership_data)}")
     print(f"   - Output: {output_path}")
 
 
+def parse_ridership_daily():
+    """
+    Build the daily ridership cube from the daily-detail ridership CSV:
+    an int32 array shaped (stations, days, hours, 2) with boarding at [..., 0]
+    and alighting at [..., 1], saved as .npy so the API can memory-map it.
+    Days without a row for a station stay 0.
+
+    Output:
+    - ridership_daily.npy
+    - ridership_daily_index.json: { "station_ids": [...], "station_names": [...],
+      "dates": ["2024-01-01", ...], "hours": [5, ..., 24] }
+    - ridership_daily_prefix.npy: (day-of-week, date)-ordered prefix sums the API
+      memory-maps for day filters (core.ridership_cube.build_prefix_file)
+    """
+    sys.path.insert(0, str(BASE_DIR / "apps" / "ml-api"))
+    from core.ridership_cube import PREFIX_FILE, build_prefix_file
+
+    print("\n[3/5] Building daily ridership cube...")
+
+    filepath = RAW_DIR / RIDERSHIP_FILE
+    df = pd.read_csv(filepath, encoding='cp949')
+
+    date_column = next((c for c in DATE_COLUMNS if c in df.columns), None)
+    if date_column is None:
+        print(f"   - Skipped: no date column ({', '.join(DATE_COLUMNS)}) in {filepath.name}")
+        return None
+
+    df['date'] = pd.to_datetime(df[date_column].astype(str), format='mixed').dt.normalize()
+    df['역번호'] = df['역번호'].astype(str)
+
+    station_ids = sorted(df['역번호'].unique())
+    station_names = df.drop_duplicates(subset=['역번호']).set_index('역번호')['역명'].to_dict()
+    dates = pd.date_range(df['date'].min(), df['date'].max(), freq='D')
+    hours = list(HOUR_COLUMNS.values())
+
+    station_pos = pd.Index(station_ids).get_indexer(df['역번호'])
+    date_pos = dates.get_indexer(df['date'])
+    kind_pos = df['구분'].map({'승차': 0, '하차': 1})
+    valid = kind_pos.notna().to_numpy()
+
+    values = df[list(HOUR_COLUMNS)].fillna(0).to_numpy(dtype=np.int64)
+    cube = np.zeros((len(station_ids), len(dates), len(hours), 2), dtype=np.int32)
+    # Duplicate rows (e.g. transfer stations listed per line) are summed
+    np.add.at(
+        cube,
+        (station_pos[valid], date_pos[valid], slice(None), kind_pos[valid].astype(int).to_numpy()),
+        values[valid],
+    )
+
+    index = {
+        "station_ids": station_ids,
+        "station_names": [station_names[s] for s in station_ids],
+        "dates": [d.strftime('%Y-%m-%d') for d in dates],
+        "hours": hours,
+    }
+    for target_dir in (PROCESSED_DIR, API_DATA_DIR):
+        np.save(target_dir / "ridership_daily.npy", cube)
+        with open(target_dir / "ridership_daily_index.json", 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False)
+        build_prefix_file(cube, index["dates"], target_dir / PREFIX_FILE)
+        print(f"   - Output: {target_dir / 'ridership_daily.npy'}")
+
+    print(f"   - Cube: {len(station_ids)} stations x {len(dates)} days x {len(hours)} hours "
+          f"({cube.nbytes / 1024 / 1024:.1f} MB)")
+    return cube
+
+
 def parse_election():
     """
     Parse election results CSV and aggregate by district (선거구).
-    Extract Seoul data only.
+    Extract the current region's rows only (SIDO_NAME).
 
     Output format:
     [
@@ -197,13 +346,13 @@ def parse_election():
         ...
     ]
     """
-    print("\n[3/3] Parsing election results...")
+    print("\n[4/5] Parsing election results...")
 
     filepath = RAW_DIR / ELECTION_FILE
     df = pd.read_csv(filepath, encoding='cp949')
 
     # Filter for Seoul only
-    seoul_df = df[df['시도명'] == '서울특별시'].copy()
+    seoul_df = df[df['시도명'] == SIDO_NAME].copy()
 
     # Get unique districts
     districts = seoul_df['선거구명'].unique()
@@ -240,23 +389,192 @@ def parse_election():
     with open(output_path, 'w', encoding='utf-8') as f:
         json.dump(election_data, f, ensure_ascii=False, indent=2)
 
-    print(f"   - Parsed {len(election_data)} Seoul districts")
+    print(f"   - Parsed {len(election_data)} {SIDO_NAME} districts")
     print(f"   - Output: {output_path}")
 
 
+def parse_age_label(label):
+    """
+    Parse a KOSIS age column label.
+    '20~24세' -> (20, 24), '7세' -> (7, 7), '100세 이상' -> (100, None), anything else -> None
+    """
+    label = str(label).strip()
+    match = re.match(r"^(\d+)\s*~\s*(\d+)\s*세", label)
+    if match:
+        return int(match.group(1)), int(match.group(2))
+    match = re.match(r"^(\d+)\s*세\s*이상", label)
+    if match:
+        return int(match.group(1)), None
+    match = re.match(r"^(\d+)\s*세$", label)
+    if match:
+        return int(match.group(1)), int(match.group(1))
+    return None
+
+
+def segment_fractions(low, high):
+    """
+    Fraction of an age bucket that falls into each voting-age segment,
+    assuming ages are spread evenly within the bucket (so 2/5 of '15~19세'
+    counts as 18-29). Open-ended buckets ('100세 이상') count as their first age.
+    """
+    high = low if high is None else high
+    span = high - low + 1
+    fractions = []
+    for _, seg_low, seg_high in AGE_SEGMENTS:
+        seg_high = max(high, seg_low) if seg_high is None else seg_high
+        overlap = min(high, seg_high) - max(low, seg_low) + 1
+        fractions.append(max(overlap, 0) / span)
+    return fractions
+
+
+def parse_population():
+    """
+    Parse the registered population by age and dong (KOSIS export) into
+    voting-age segment counts per dong, plus per-gu totals.
+
+    The export has one or more header rows (period, sex, age) above the data;
+    the row holding the age labels is detected, and when columns are split by
+    sex or period, the last total ('계') group is used. Rows carry the
+    gu / dong names in their leading label columns.
+
+    Output format:
+    {
+        "segments": ["18-29", "30-39", "40-49", "50-59", "60+"],
+        "gu": { "종로구": { "population": 139508, "age": [21000, ...] }, ... },
+        "dong": { "종로구 사직동": { "population": 9000, "age": [1400, ...] }, ... }
+    }
+    """
+    print("\n[5/5] Parsing population by age and dong...")
+
+    filepath = RAW_DIR / POPULATION_FILE if POPULATION_FILE else None
+    if filepath is None or not filepath.exists():
+        print(f"   - Skipped: {filepath.name if filepath else 'no population file'} not found")
+        return None
+
+    raw = pd.read_csv(filepath, encoding='utf-8-sig', header=None, dtype=str).fillna("")
+
+    # Header row = first row with several age labels
+    header_row = next(
+        i for i in range(min(len(raw), 10))
+        if sum(parse_age_label(cell) is not None for cell in raw.iloc[i]) >= 3
+    )
+    header = [str(cell).strip() for cell in raw.iloc[header_row]]
+    upper = [tuple(str(raw.iat[r, c]).strip() for r in range(header_row)) for c in range(raw.shape[1])]
+
+    value_columns = [c for c, label in enumerate(header) if parse_age_label(label) is not None or label in TOTAL_LABELS]
+    label_columns = list(range(min(value_columns)))
+
+    # Columns split by sex / period above the age row: keep the last group labelled as a total
+    groups = list(dict.fromkeys(upper[c] for c in value_columns))
+    total_groups = [g for g in groups if any(cell in TOTAL_LABELS for cell in g)] or groups
+    age_columns = [
+        (c, parse_age_label(header[c])) for c in value_columns
+        if upper[c] == total_groups[-1] and parse_age_label(header[c]) is not None
+    ]
+    total_column = next(
+        (c for c in value_columns if upper[c] == total_groups[-1] and header[c] in TOTAL_LABELS), None
+    )
+
+    # A sex column in the row labels ('성별') -> keep the '계' rows
+    sex_columns = [c for c in label_columns if "성별" in header[c]]
+    geo_columns = [c for c in label_columns if c not in sex_columns and "항목" not in header[c]]
+
+    def number(cell):
+        cell = str(cell).replace(",", "").strip()
+        try:
+            return float(cell)
+        except ValueError:
+            return 0.0
+
+    fractions = [(c, segment_fractions(*bucket)) for c, bucket in age_columns]
+
+    gu_rows = {}
+    dong_rows = {}
+    subtotal_gu = set()
+    for _, row in raw.iloc[header_row + 1:].iterrows():
+        if any(str(row[c]).strip() not in TOTAL_LABELS for c in sex_columns):
+            continue
+        names = [str(row[c]).strip() for c in geo_columns if str(row[c]).strip()]
+        if len(names) < 2 or names[-2] in TOTAL_LABELS:
+            continue
+        gu, dong = names[-2], names[-1]
+
+        segments = [0.0] * len(AGE_SEGMENTS)
+        for c, parts in fractions:
+            count = number(row[c])
+            for k, part in enumerate(parts):
+                segments[k] += count * part
+        population = number(row[total_column]) if total_column is not None else sum(number(row[c]) for c, _ in age_columns)
+        entry = {"population": int(round(population)), "age": [int(round(v)) for v in segments]}
+
+        if dong in TOTAL_LABELS:
+            gu_rows[gu] = entry
+            subtotal_gu.add(gu)
+        else:
+            dong_rows[f"{gu} {dong}"] = entry
+
+    # Gu totals from the dongs when the export has no subtotal rows
+    for key, entry in dong_rows.items():
+        gu = key.split(" ", 1)[0]
+        if gu in subtotal_gu:
+            continue
+        total = gu_rows.setdefault(gu, {"population": 0, "age": [0] * len(AGE_SEGMENTS)})
+        total["population"] += entry["population"]
+        total["age"] = [a + b for a, b in zip(total["age"], entry["age"])]
+
+    population = {
+        "segments": [name for name, _, _ in AGE_SEGMENTS],
+        "gu": dict(sorted(gu_rows.items())),
+        "dong": dict(sorted(dong_rows.items())),
+    }
+
+    for target_dir in (PROCESSED_DIR, API_DATA_DIR):
+        output_path = target_dir / "population_by_dong_age.json"
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(population, f, ensure_ascii=False, indent=2)
+        print(f"   - Output: {output_path}")
+
+    print(f"   - Parsed {len(dong_rows)} dongs in {len(gu_rows)} gu")
+    return population
+
+
+def publish_partition():
+    """Copy the processed JSON files into the ML API's partition directory."""
+    for path in sorted(PROCESSED_DIR.glob("*.json")):
+        shutil.copy2(path, API_DATA_DIR / path.name)
+        print(f"   - Published: {API_DATA_DIR / path.name}")
+
+
 def main():
     """Main entry point for the data parser."""
+    parser = argparse.ArgumentParser(description="Parse raw voter-reach data into a region partition")
+    parser.add_argument("--region", default=DEFAULT_REGION, choices=sorted(REGIONS))
+    parser.add_argument("--publish", action="store_true", help="copy processed JSON into apps/ml-api/data")
+    args = parser.parse_args()
+
     print("=" * 60)
-    print("Voter-Reach Data Parser")
+    print(f"Voter-Reach Data Parser ({args.region})")
     print("=" * 60)
 
+    steps = configure_region(args.region)
+    if not steps:
+        print(f"No source files configured for region '{args.region}' (see REGIONS)")
+        return
+
     # Ensure output directory exists
     ensure_output_directory()
 
     # Parse each data source
-    stations_df = parse_stations()
-    parse_ridership(stations_df)
-    parse_election()
+    stations_df = parse_stations() if "stations" in steps else None
+    if "ridership" in steps:
+        parse_ridership(stations_df)
+        parse_ridership_daily()
+    if "election" in steps:
+        parse_election()
+    if "population" in steps:
+        parse_population()
+    if args.publish:
+        publish_partition()
 
     print("\n" + "=" * 60)
     print("Data parsing complete!")
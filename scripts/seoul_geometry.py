@@ -0,0 +1,512 @@
+"""
+Polygon geometry helpers for the Seoul boundary pipeline.
+
+- dissolve(): union of adjacent polygons by shared-edge cancellation
+- douglas_peucker() / visvalingam(): line simplification
+- build_topology(): shared-arc topology (TopoJSON style), simplified per level
+- to_topojson(): quantized, delta-encoded TopoJSON
+- topology_to_geojson(): decode a topology object back to GeoJSON features
+- geometry_metrics(): area-weighted centroid, bounds, area and perimeter
+
+Coordinates are (lng, lat) tuples. Rings are closed (first == last).
+"""
+import heapq
+from collections import defaultdict
+
+import numpy as np
+
+Point = tuple[float, float]
+Ring = list[Point]
+Polygon = list[Ring]  # [exterior, *holes]
+
+
+def geometry_polygons(geometry: dict) -> list[Polygon]:
+    """Polygon / MultiPolygon geometry as a list of polygons of point tuples."""
+    if geometry["type"] == "Polygon":
+        polygons = [geometry["coordinates"]]
+    elif geometry["type"] == "MultiPolygon":
+        polygons = geometry["coordinates"]
+    else:
+        return []
+    return [[[tuple(point) for point in ring] for ring in polygon] for polygon in polygons]
+
+
+def polygons_geometry(polygons: list[Polygon]) -> dict:
+    """List of polygons as a Polygon or MultiPolygon geometry."""
+    coordinates = [[[list(point) for point in ring] for ring in polygon] for polygon in polygons]
+    if len(coordinates) == 1:
+        return {"type": "Polygon", "coordinates": coordinates[0]}
+    return {"type": "MultiPolygon", "coordinates": coordinates}
+
+
+def signed_area(ring: Ring) -> float:
+    """Shoelace area, positive for counter-clockwise rings."""
+    xy = np.asarray(ring, dtype=float)
+    x, y = xy[:-1, 0], xy[:-1, 1]
+    x1, y1 = xy[1:, 0], xy[1:, 1]
+    return float(np.sum(x * y1 - x1 * y) / 2)
+
+
+def point_in_ring(point: Point, ring: Ring) -> bool:
+    """Vectorized ray casting."""
+    xy = np.asarray(ring, dtype=float)
+    x, y = point
+    xi, yi = xy[:-1, 0], xy[:-1, 1]
+    xj, yj = xy[1:, 0], xy[1:, 1]
+    crosses = (yi > y) != (yj > y)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x_cross = (xj - xi) * (y - yi) / (yj - yi) + xi
+    return bool(np.count_nonzero(crosses & (x < x_cross)) % 2)
+
+
+# ---------------------------------------------------------------------------
+# Metrics
+# ---------------------------------------------------------------------------
+
+EARTH_RADIUS_M = 6_371_008.8
+
+
+def geometry_metrics(features: list[list[Polygon]]) -> list[dict]:
+    """
+    Area-weighted centroid, bounds, area (km²) and perimeter (km) of each
+    feature (a list of polygons), computed over all rings at once.
+
+    All rings are concatenated into one coordinate array; per-edge shoelace
+    and length terms are summed per ring with bincount, and rings are summed
+    per feature. Exteriors count positive and holes negative regardless of
+    their winding. Lengths use a local equirectangular projection around the
+    mean latitude (well under 0.1% error at city scale).
+    """
+    rings, ring_feature, ring_exterior = [], [], []
+    for feature_index, polygons in enumerate(features):
+        for polygon in polygons:
+            for ring_index, ring in enumerate(polygon):
+                rings.append(np.asarray(ring, dtype=float))
+                ring_feature.append(feature_index)
+                ring_exterior.append(ring_index == 0)
+    if not rings:
+        return [None] * len(features)
+
+    lengths = np.array([len(ring) for ring in rings])
+    ring_ids = np.repeat(np.arange(len(rings)), lengths)
+    xy = np.concatenate(rings)
+    ring_feature = np.array(ring_feature)
+    ring_exterior = np.array(ring_exterior)
+
+    # Local metric projection (metres)
+    lat0 = np.radians(xy[:, 1].mean())
+    metres = np.radians(xy) * EARTH_RADIUS_M
+    metres[:, 0] *= np.cos(lat0)
+
+    # Edges i -> i+1 within each ring (the closing point ends each ring)
+    within = ring_ids[:-1] == ring_ids[1:]
+    a, b = metres[:-1][within], metres[1:][within]
+    edge_ring = ring_ids[:-1][within]
+    cross = a[:, 0] * b[:, 1] - b[:, 0] * a[:, 1]
+
+    n_rings = len(rings)
+    signed = np.bincount(edge_ring, cross, n_rings) / 2
+    cx = np.bincount(edge_ring, (a[:, 0] + b[:, 0]) * cross, n_rings) / 6
+    cy = np.bincount(edge_ring, (a[:, 1] + b[:, 1]) * cross, n_rings) / 6
+    perimeter = np.bincount(edge_ring, np.hypot(*(b - a).T), n_rings)
+
+    # Orient every ring: exteriors +, holes -
+    sign = np.sign(signed) * np.where(ring_exterior, 1.0, -1.0)
+    area = np.abs(signed) * np.where(ring_exterior, 1.0, -1.0)
+
+    n_features = len(features)
+    feature_area = np.bincount(ring_feature, area, n_features)
+    feature_cx = np.bincount(ring_feature, cx * sign, n_features)
+    feature_cy = np.bincount(ring_feature, cy * sign, n_features)
+    feature_perimeter = np.bincount(ring_feature, perimeter, n_features)
+
+    # Bounds from exterior rings
+    starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    ring_min = np.minimum.reduceat(xy, starts)
+    ring_max = np.maximum.reduceat(xy, starts)
+    feature_min = np.full((n_features, 2), np.inf)
+    feature_max = np.full((n_features, 2), -np.inf)
+    np.minimum.at(feature_min, ring_feature[ring_exterior], ring_min[ring_exterior])
+    np.maximum.at(feature_max, ring_feature[ring_exterior], ring_max[ring_exterior])
+
+    metrics = []
+    for i in range(n_features):
+        if feature_area[i] <= 0:
+            metrics.append(None)
+            continue
+        # Back from metres to degrees
+        lng = np.degrees(feature_cx[i] / feature_area[i] / EARTH_RADIUS_M / np.cos(lat0))
+        lat = np.degrees(feature_cy[i] / feature_area[i] / EARTH_RADIUS_M)
+        metrics.append({
+            "center": {"lat": round(float(lat), 6), "lng": round(float(lng), 6)},
+            "bounds": {
+                "north": round(float(feature_max[i, 1]), 6),
+                "south": round(float(feature_min[i, 1]), 6),
+                "east": round(float(feature_max[i, 0]), 6),
+                "west": round(float(feature_min[i, 0]), 6),
+            },
+            "area_km2": round(float(feature_area[i]) / 1e6, 4),
+            "perimeter_km": round(float(feature_perimeter[i]) / 1e3, 3),
+        })
+    return metrics
+
+
+# ---------------------------------------------------------------------------
+# Dissolve
+# ---------------------------------------------------------------------------
+
+def _extract_rings(edges: dict[Point, list[Point]]) -> list[Ring]:
+    """
+    Link directed edges (start -> [ends]) into closed rings.
+    Revisiting a vertex on the current path closes a sub-ring there,
+    so pinch points yield separate simple rings.
+    """
+    rings = []
+    for start in list(edges):
+        while edges.get(start):
+            path = [start]
+            position = {start: 0}
+            current = start
+            while True:
+                nxt = edges[current].pop()
+                if nxt in position:
+                    cut = position[nxt]
+                    ring = path[cut:] + [nxt]
+                    rings.append(ring)
+                    for point in path[cut + 1:]:
+                        del position[point]
+                    path = path[:cut + 1]
+                    if nxt == start and cut == 0:
+                        break
+                    current = nxt
+                    continue
+                position[nxt] = len(path)
+                path.append(nxt)
+                current = nxt
+    return [ring for ring in rings if len(ring) >= 4]
+
+
+def dissolve(polygons: list[Polygon]) -> list[Polygon]:
+    """
+    Union of polygons that share edges (e.g. all dongs of a gu).
+
+    Every ring edge is added as a directed edge; an edge and its reverse
+    (a border shared by two neighbouring polygons) cancel out. The remaining
+    edges are linked into rings. Rings keep the orientation of the input
+    exteriors; rings with the opposite orientation are holes and are
+    assigned to the exterior that contains them.
+    """
+    exterior_sign = 0.0
+    counts: dict[tuple[Point, Point], int] = defaultdict(int)
+    for polygon in polygons:
+        for index, ring in enumerate(polygon):
+            if index == 0 and exterior_sign == 0.0:
+                exterior_sign = np.sign(signed_area(ring))
+            for a, b in zip(ring, ring[1:]):
+                if a == b:
+                    continue
+                if counts.get((b, a), 0) > 0:
+                    counts[(b, a)] -= 1
+                else:
+                    counts[(a, b)] += 1
+
+    edges: dict[Point, list[Point]] = defaultdict(list)
+    for (a, b), count in counts.items():
+        edges[a].extend([b] * count)
+
+    exteriors, holes = [], []
+    for ring in _extract_rings(edges):
+        area = signed_area(ring)
+        if area == 0:
+            continue
+        (exteriors if np.sign(area) == exterior_sign else holes).append(ring)
+
+    # Smallest exterior first so holes go to the tightest container
+    exteriors.sort(key=lambda ring: abs(signed_area(ring)))
+    result = [[ring] for ring in exteriors]
+    for hole in holes:
+        for polygon in result:
+            if point_in_ring(hole[0], polygon[0]) or point_in_ring(_ring_interior_point(hole), polygon[0]):
+                polygon.append(hole)
+                break
+    result.reverse()
+    return result
+
+
+def _ring_interior_point(ring: Ring) -> Point:
+    """Midpoint of the first edge, nudged off the shared vertex."""
+    (x0, y0), (x1, y1) = ring[0], ring[1]
+    return ((x0 + x1) / 2, (y0 + y1) / 2)
+
+
+# ---------------------------------------------------------------------------
+# Simplification
+# ---------------------------------------------------------------------------
+
+def _segment_distances(points: np.ndarray, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Distance from each point to segment a-b."""
+    ab = b - a
+    length_sq = float(ab @ ab)
+    if length_sq == 0:
+        return np.hypot(*(points - a).T)
+    t = np.clip((points - a) @ ab / length_sq, 0, 1)
+    projection = a + t[:, np.newaxis] * ab
+    return np.hypot(*(points - projection).T)
+
+
+def douglas_peucker(points: list[Point], tolerance: float) -> list[Point]:
+    """Douglas–Peucker simplification of an open line; endpoints are kept."""
+    if tolerance <= 0 or len(points) <= 2:
+        return list(points)
+    xy = np.asarray(points, dtype=float)
+    keep = np.zeros(len(xy), dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(xy) - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        distances = _segment_distances(xy[start + 1:end], xy[start], xy[end])
+        index = int(np.argmax(distances))
+        if distances[index] > tolerance:
+            split = start + 1 + index
+            keep[split] = True
+            stack.append((start, split))
+            stack.append((split, end))
+    return [point for point, kept in zip(points, keep) if kept]
+
+
+def visvalingam(points: list[Point], min_area: float) -> list[Point]:
+    """
+    Visvalingam–Whyatt simplification of an open line; endpoints are kept.
+    Repeatedly removes the vertex forming the smallest triangle until every
+    remaining triangle has at least min_area (in squared coordinate units).
+    """
+    if min_area <= 0 or len(points) <= 2:
+        return list(points)
+    xy = np.asarray(points, dtype=float)
+    n = len(xy)
+    prev = list(range(-1, n - 1))
+    nxt = list(range(1, n + 1))
+    removed = [False] * n
+
+    def triangle(i: int) -> float:
+        (ax, ay), (bx, by), (cx, cy) = xy[prev[i]], xy[i], xy[nxt[i]]
+        return abs((bx - ax) * (cy - ay) - (cx - ax) * (by - ay)) / 2
+
+    heap = [(triangle(i), i) for i in range(1, n - 1)]
+    heapq.heapify(heap)
+    current = {i: area for area, i in heap}
+    while heap:
+        area, i = heapq.heappop(heap)
+        if removed[i] or current.get(i) != area:
+            continue
+        if area >= min_area:
+            break
+        removed[i] = True
+        p, q = prev[i], nxt[i]
+        nxt[p], prev[q] = q, p
+        for j in (p, q):
+            if 0 < j < n - 1:
+                # Effective area never drops below the removed vertex's area
+                current[j] = max(triangle(j), area)
+                heapq.heappush(heap, (current[j], j))
+    return [point for point, gone in zip(points, removed) if not gone]
+
+
+# Both take a distance tolerance; Visvalingam uses the area of a triangle
+# with that height on a base of the same length
+SIMPLIFIERS = {
+    "douglas_peucker": douglas_peucker,
+    "visvalingam": lambda points, tolerance: visvalingam(points, tolerance ** 2 / 2),
+}
+
+
+def simplify_arc(points: list[Point], tolerance: float, method: str = "douglas_peucker") -> list[Point]:
+    """
+    Simplify one topology arc with its endpoints fixed.
+    Closed arcs are split at the vertex farthest from the start so that
+    at least a triangle survives.
+    """
+    simplify = SIMPLIFIERS[method]
+    if tolerance <= 0 or len(points) <= 3:
+        return list(points)
+    if points[0] != points[-1]:
+        return simplify(points, tolerance)
+    xy = np.asarray(points, dtype=float)
+    far = int(np.argmax(np.hypot(*(xy - xy[0]).T)))
+    first = simplify(points[:far + 1], tolerance)
+    second = simplify(points[far:], tolerance)
+    ring = first + second[1:]
+    if len(ring) < 4:
+        # Keep the vertex farthest from the chord as the third corner
+        distances = _segment_distances(xy, xy[0], xy[far])
+        third = int(np.argmax(distances))
+        corners = sorted({0, far, third})
+        ring = [points[i] for i in corners] + [points[0]]
+    return ring
+
+
+# ---------------------------------------------------------------------------
+# Topology
+# ---------------------------------------------------------------------------
+
+class Topology:
+    """
+    Shared-arc topology for one or more layers of polygon features.
+
+    objects: layer name -> list of (properties, [polygon arc refs]) where a
+    polygon is a list of rings and a ring is a list of arc indices
+    (~i = arc i reversed, as in TopoJSON).
+    """
+
+    def __init__(self, arcs: list[list[Point]], objects: dict):
+        self.arcs = arcs
+        self.objects = objects
+
+    def simplified(self, tolerance: float, method: str = "douglas_peucker") -> "Topology":
+        """Copy with every arc simplified once, so shared borders stay shared."""
+        arcs = [simplify_arc(arc, tolerance, method) for arc in self.arcs]
+        return Topology(arcs, self.objects)
+
+    def ring_points(self, ring_refs: list[int]) -> Ring:
+        points: Ring = []
+        for ref in ring_refs:
+            arc = self.arcs[ref] if ref >= 0 else self.arcs[~ref][::-1]
+            points.extend(arc if not points else arc[1:])
+        return points
+
+
+def _ring_junctions(rings: list[Ring]) -> set[Point]:
+    """
+    Points where rings meet or diverge: a point is a junction when it is
+    visited with different neighbour pairs by different rings (or twice by
+    the same ring).
+    """
+    neighbours: dict[Point, frozenset] = {}
+    junctions: set[Point] = set()
+    for ring in rings:
+        points = ring[:-1]
+        n = len(points)
+        for i, point in enumerate(points):
+            pair = frozenset((points[i - 1], points[(i + 1) % n]))
+            seen = neighbours.setdefault(point, pair)
+            if seen != pair:
+                junctions.add(point)
+    return junctions
+
+
+def _cut_ring(ring: Ring, junctions: set[Point]) -> list[list[Point]]:
+    """Split a closed ring into arcs between consecutive junctions."""
+    points = ring[:-1]
+    cuts = [i for i, point in enumerate(points) if point in junctions]
+    if not cuts:
+        # Closed arc without junctions: rotate to a canonical start so
+        # identical rings in different layers produce the same arc
+        start = min(range(len(points)), key=lambda i: points[i])
+        rotated = points[start:] + points[:start]
+        return [rotated + [rotated[0]]]
+    rotated = points[cuts[0]:] + points[:cuts[0]]
+    offsets = [i - cuts[0] for i in cuts] + [len(points)]
+    rotated.append(rotated[0])
+    return [rotated[a:b + 1] for a, b in zip(offsets, offsets[1:])]
+
+
+def build_topology(layers: dict[str, list[tuple[dict, list[Polygon]]]]) -> Topology:
+    """
+    Build a shared-arc topology from layers of (properties, polygons).
+    Borders shared between features (and between layers, e.g. gu outlines
+    and the dong borders they are made of) are stored once.
+    """
+    all_rings = [ring for features in layers.values() for _, polygons in features for polygon in polygons for ring in polygon]
+    junctions = _ring_junctions(all_rings)
+
+    arcs: list[list[Point]] = []
+    index: dict[tuple, int] = {}
+
+    def arc_ref(arc: list[Point]) -> int:
+        key = tuple(arc)
+        if key in index:
+            return index[key]
+        reverse = key[::-1]
+        if reverse in index:
+            return ~index[reverse]
+        index[key] = len(arcs)
+        arcs.append(arc)
+        return index[key]
+
+    objects = {}
+    for name, features in layers.items():
+        objects[name] = [
+            (properties, [[[arc_ref(arc) for arc in _cut_ring(ring, junctions)] for ring in polygon] for polygon in polygons])
+            for properties, polygons in features
+        ]
+    return Topology(arcs, objects)
+
+
+def _ring_valid(points: Ring) -> bool:
+    return len(set(points)) >= 3 and signed_area(points) != 0
+
+
+def to_topojson(topology: Topology, quantization: int = 100_000) -> dict:
+    """
+    Quantized, delta-encoded TopoJSON. Rings that collapse to zero area at
+    this level are dropped; features without rings get a null geometry.
+    """
+    xy = np.concatenate([np.asarray(arc, dtype=float) for arc in topology.arcs])
+    x0, y0 = xy.min(axis=0)
+    x1, y1 = xy.max(axis=0)
+    kx = (x1 - x0) / (quantization - 1) or 1.0
+    ky = (y1 - y0) / (quantization - 1) or 1.0
+
+    quantized_arcs = []
+    for arc in topology.arcs:
+        q = np.rint((np.asarray(arc, dtype=float) - (x0, y0)) / (kx, ky)).astype(np.int64)
+        keep = np.ones(len(q), dtype=bool)
+        keep[1:] = np.any(q[1:] != q[:-1], axis=1)
+        q = q[keep]
+        if len(q) < 2:
+            q = np.vstack([q, q])
+        deltas = np.vstack([q[:1], np.diff(q, axis=0)])
+        quantized_arcs.append(deltas.tolist())
+
+    objects = {}
+    for name, features in topology.objects.items():
+        geometries = []
+        for properties, polygons in features:
+            kept = []
+            for polygon in polygons:
+                rings = [ring for ring in polygon if _ring_valid(topology.ring_points(ring))]
+                if rings and rings[0] is polygon[0]:
+                    kept.append(rings)
+            if not kept:
+                geometries.append({"type": None, "properties": properties})
+            elif len(kept) == 1:
+                geometries.append({"type": "Polygon", "arcs": kept[0], "properties": properties})
+            else:
+                geometries.append({"type": "MultiPolygon", "arcs": kept, "properties": properties})
+        objects[name] = {"type": "GeometryCollection", "geometries": geometries}
+
+    return {
+        "type": "Topology",
+        "bbox": [round(float(v), 7) for v in (x0, y0, x1, y1)],
+        "transform": {"scale": [kx, ky], "translate": [float(x0), float(y0)]},
+        "objects": objects,
+        "arcs": quantized_arcs,
+    }
+
+
+def topology_to_geojson(topology: Topology, layer: str, precision: int = 6) -> dict:
+    """Decode one topology layer to a GeoJSON FeatureCollection."""
+    features = []
+    for properties, polygons in topology.objects[layer]:
+        decoded = []
+        for polygon in polygons:
+            rings = [topology.ring_points(ring) for ring in polygon]
+            rings = [[(round(x, precision), round(y, precision)) for x, y in ring] for ring in rings]
+            rings = [ring for ring in rings if _ring_valid(ring)]
+            if rings:
+                decoded.append(rings)
+        if decoded:
+            features.append({"type": "Feature", "properties": properties, "geometry": polygons_geometry(decoded)})
+    return {"type": "FeatureCollection", "features": features}